@@ -1,8 +1,8 @@
 """Application configuration via environment variables."""
 import logging
 from pathlib import Path
-from typing import Optional
 
+from pydantic import BaseModel, ConfigDict
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -12,6 +12,20 @@ class Settings(BaseSettings):
     # TMDB
     tmdb_api_key: str = ""
     tmdb_base_url: str = "https://api.themoviedb.org/3"
+    tmdb_memory_cache_bytes: int = 32 * 1024 * 1024
+    tmdb_rate_limit: float = 40.0  # requests/second, shared by all TMDB calls
+    tmdb_rate_burst: int = 40
+    # Negotiate HTTP/2 with TMDB (needs the optional "h2" package; falls back to HTTP/1.1)
+    tmdb_http2: bool = False
+
+    # Outbound HTTP pools (TMDB, Radarr, Sonarr): open connections per pool, idle ones kept,
+    # and seconds an idle connection stays open
+    http_max_connections: int = 20
+    http_max_keepalive_connections: int = 10
+    http_keepalive_expiry: float = 30.0
+    # Connections opened to each configured upstream at startup, and the most seconds startup waits
+    http_prewarm_connections: int = 2
+    http_prewarm_timeout: float = 5.0
 
     # Sonarr
     sonarr_url: str = "http://localhost:8989"
@@ -21,6 +35,29 @@ class Settings(BaseSettings):
     radarr_url: str = "http://localhost:7878"
     radarr_api_key: str = ""
 
+    # Seconds a Radarr/Sonarr full-library snapshot is reused (dropped early on any add)
+    arr_library_ttl: float = 120.0
+    # Seconds Radarr/Sonarr root folders and quality profiles are reused (dropped on a settings change)
+    arr_metadata_ttl: float = 600.0
+    # Seconds between background syncs of the local Radarr/Sonarr mirror
+    library_sync_interval: float = 300.0
+    # Seconds between full re-listings; syncs in between poll /history/since
+    library_full_resync_interval: float = 1800.0
+    # Watchlist processing jobs: worker pool size and jobs running at once per *arr
+    job_workers: int = 2
+    job_upstream_concurrency: int = 1
+    # Circuit breaker per upstream (TMDB, Radarr, Sonarr): opens when at least this share of the
+    # last CIRCUIT_WINDOW calls failed (timeouts, connection errors, 5xx; once CIRCUIT_MIN_CALLS
+    # were made), then refuses calls for CIRCUIT_RESET_TIMEOUT seconds before one trial call
+    circuit_failure_rate: float = 0.5
+    circuit_window: int = 20
+    circuit_min_calls: int = 5
+    circuit_reset_timeout: float = 30.0
+    # Seconds between download-queue polls while a /api/library/queue/stream client is connected
+    queue_poll_interval: float = 5.0
+    # Shared secret Radarr/Sonarr webhooks must pass as ?token= (empty: no check)
+    webhook_token: str = ""
+
     # Database
     database_path: str = "./data/movie_discovery.db"
 
@@ -38,25 +75,100 @@ class Settings(BaseSettings):
 settings = Settings()
 
 
-def get_setting(key: str) -> Optional[str]:
-    """Get a setting value, checking database first, then .env fallback."""
+class SettingsSnapshot(BaseModel):
+    """User-editable settings as of one ``version``: saved (decrypted) values over .env."""
+
+    model_config = ConfigDict(frozen=True)
+
+    version: int = 0
+    # False when the DB could not be read and only .env values are in effect
+    from_db: bool = False
+    tmdb_api_key: str | None = None
+    radarr_url: str | None = None
+    radarr_api_key: str | None = None
+    radarr_root_folder: str | None = None
+    radarr_quality_profile_id: str | None = None
+    sonarr_url: str | None = None
+    sonarr_api_key: str | None = None
+    sonarr_root_folder: str | None = None
+    sonarr_quality_profile_id: str | None = None
+    streaming_region: str | None = None
+
+    @classmethod
+    def resolve(cls, version: int, saved: dict[str, str] | None) -> "SettingsSnapshot":
+        """Merge saved values over the .env ones (empty values count as unset).
+
+        ``saved=None`` means the DB was unavailable: the snapshot is .env-only.
+        """
+        values = {}
+        for key in cls.model_fields:
+            if key not in _SNAPSHOT_META:
+                values[key] = (saved or {}).get(key) or getattr(settings, key, None) or None
+        return cls(version=version, from_db=saved is not None, **values)
+
+
+# SettingsSnapshot fields that describe the snapshot rather than hold a setting.
+_SNAPSHOT_META = ("version", "from_db")
+
+
+# Current snapshot, loaded on first use and dropped by invalidate_settings().
+_snapshot: SettingsSnapshot | None = None
+# Bumped on every settings change so callers can detect one with an int compare.
+_settings_version = 0
+
+
+def settings_version() -> int:
+    """Current settings version; changes whenever the saved settings do."""
+    return _settings_version
+
+
+def invalidate_settings() -> None:
+    """Drop the cached snapshot (called after a settings save)."""
+    global _snapshot, _settings_version
+    _snapshot = None
+    _settings_version += 1
+
+
+def _load_db_settings() -> dict[str, str] | None:
+    """Read and decrypt every saved setting in one query; None if the DB is unavailable."""
+    from sqlalchemy.exc import SQLAlchemyError
+
     from app.database import SessionLocal
     from app.modules.settings.service import SettingsService
-    from sqlalchemy.exc import SQLAlchemyError
-    from cryptography.fernet import InvalidToken
 
     db = SessionLocal()
     try:
-        value = SettingsService(db).get_raw_value(key)
-        if value:
-            return value
-    except (SQLAlchemyError, InvalidToken) as exc:
-        logging.getLogger(__name__).warning(
-            "get_setting(%s) DB lookup failed: %s", key, exc
-        )
+        return SettingsService(db).get_raw_values()
+    except SQLAlchemyError as exc:
+        logging.getLogger(__name__).warning("Settings DB lookup failed: %s", exc)
+        return None
     finally:
         db.close()
 
-    # Fallback to .env
+
+def get_settings_snapshot() -> SettingsSnapshot:
+    """The process-wide settings snapshot (also a FastAPI dependency).
+
+    Loaded in one query and decrypted once per ``settings_version``; a failed DB
+    read yields an .env-only snapshot that is not cached, so the next call retries.
+    """
+    global _snapshot
+    snapshot = _snapshot
+    if snapshot is not None:
+        return snapshot
+    version = _settings_version
+    saved = _load_db_settings()
+    snapshot = SettingsSnapshot.resolve(version, saved)
+    # Keep it only if no save happened while loading (sync routes run in threads).
+    if saved is not None and version == _settings_version:
+        _snapshot = snapshot
+    return snapshot
+
+
+def get_setting(key: str) -> str | None:
+    """Get a setting value, checking database first, then .env fallback."""
+    snapshot = get_settings_snapshot()
+    if key not in _SNAPSHOT_META and key in SettingsSnapshot.model_fields:
+        return getattr(snapshot, key)
     env_value = getattr(settings, key, None)
     return env_value if env_value else None
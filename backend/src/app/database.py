@@ -1,5 +1,8 @@
 """Database connection and session management."""
-from sqlalchemy import create_engine, inspect, text
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from sqlalchemy import create_engine, event, inspect, text
 from sqlalchemy.orm import sessionmaker, DeclarativeBase
 
 from app.config import settings
@@ -27,6 +30,30 @@ def get_db():
         db.close()
 
 
+class QueryCount:
+    """SQL statements seen by ``count_queries`` so far."""
+
+    def __init__(self):
+        self.count = 0
+        self.statements: list[str] = []
+
+
+@contextmanager
+def count_queries(bind=engine) -> Iterator[QueryCount]:
+    """Count the SQL statements executed on ``bind`` (any session or connection) inside the block."""
+    counter = QueryCount()
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        counter.count += 1
+        counter.statements.append(statement)
+
+    event.listen(bind, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield counter
+    finally:
+        event.remove(bind, "before_cursor_execute", before_cursor_execute)
+
+
 def _migrate_watchlist_columns(bind=engine) -> None:
     """Add columns introduced after the table already exists (SQLite ALTER ADD COLUMN). Idempotent."""
     inspector = inspect(bind)
@@ -42,6 +69,125 @@ def _migrate_watchlist_columns(bind=engine) -> None:
         stmts.append("ALTER TABLE watchlist ADD COLUMN priority INTEGER NOT NULL DEFAULT 0")
     if "tags" not in existing:
         stmts.append("ALTER TABLE watchlist ADD COLUMN tags TEXT")
+    for name, ddl in _WATCHLIST_METADATA_COLUMNS.items():
+        if name not in existing:
+            stmts.append(f"ALTER TABLE watchlist ADD COLUMN {name} {ddl}")
+    if stmts:
+        with bind.begin() as conn:
+            for s in stmts:
+                conn.execute(text(s))
+    _backfill_watchlist_metadata(bind)
+    # create_all skips indexes on tables that already exist.
+    for index in Base.metadata.tables["watchlist"].indexes:
+        index.create(bind, checkfirst=True)
+
+
+_WATCHLIST_METADATA_COLUMNS = {
+    "title": "VARCHAR(255)",
+    "overview": "TEXT",
+    "poster_path": "VARCHAR(255)",
+    "release_date": "VARCHAR(10)",
+    "vote_average": "FLOAT",
+    "total_seasons": "INTEGER",
+    "metadata_updated_at": "DATETIME",
+}
+
+
+def _backfill_watchlist_metadata(bind=engine) -> None:
+    """Fill never-enriched watchlist rows from cached TMDB detail payloads in one UPDATE.
+
+    Rows without a cached ``/movie/{id}`` or ``/tv/{id}`` response stay NULL and are
+    picked up by the background metadata refresher instead.
+    """
+    if "media_cache" not in inspect(bind).get_table_names():
+        return
+    with bind.begin() as conn:
+        conn.execute(text(
+            "UPDATE watchlist SET "
+            "title = COALESCE(json_extract(mc.payload, '$.title'), json_extract(mc.payload, '$.name')), "
+            "overview = json_extract(mc.payload, '$.overview'), "
+            "poster_path = json_extract(mc.payload, '$.poster_path'), "
+            "release_date = COALESCE(json_extract(mc.payload, '$.release_date'), "
+            "json_extract(mc.payload, '$.first_air_date')), "
+            "vote_average = json_extract(mc.payload, '$.vote_average'), "
+            "total_seasons = CASE WHEN watchlist.media_type IN ('show', 'tv') "
+            "THEN json_extract(mc.payload, '$.number_of_seasons') END, "
+            "metadata_updated_at = mc.cached_at "
+            "FROM media_cache AS mc "
+            "WHERE watchlist.metadata_updated_at IS NULL "
+            "AND mc.cache_key = (CASE WHEN watchlist.media_type IN ('show', 'tv') THEN '/tv/' ELSE '/movie/' END) "
+            "|| watchlist.tmdb_id"
+        ))
+
+
+def _migrate_watchlist_tags(bind=engine) -> None:
+    """Move legacy JSON ``watchlist.tags`` into ``watchlist_tags``, then null the column. Idempotent.
+
+    Non-array / malformed JSON and blank tags are dropped, matching how the API always
+    rendered them (as no tags).
+    """
+    inspector = inspect(bind)
+    tables = inspector.get_table_names()
+    if "watchlist" not in tables or "watchlist_tags" not in tables:
+        return
+    if "tags" not in {c["name"] for c in inspector.get_columns("watchlist")}:
+        return
+    with bind.begin() as conn:
+        conn.execute(text(
+            "INSERT OR IGNORE INTO watchlist_tags (watchlist_id, tag, position) "
+            "SELECT w.id, trim(j.value), j.key "
+            "FROM watchlist AS w, "
+            "json_each(CASE WHEN json_valid(w.tags) THEN w.tags ELSE '[]' END) AS j "
+            "WHERE (CASE WHEN json_valid(w.tags) THEN json_type(w.tags) END) = 'array' "
+            "AND j.type = 'text' AND trim(j.value) != ''"
+        ))
+        conn.execute(text("UPDATE watchlist SET tags = NULL WHERE tags IS NOT NULL"))
+
+
+def _migrate_media_cache(bind=engine) -> None:
+    """Drop the legacy per-title media_cache table so create_all rebuilds it keyed. Idempotent.
+
+    The legacy shape (one row per tmdb_id) was never written to, so nothing is lost.
+    """
+    inspector = inspect(bind)
+    if "media_cache" not in inspector.get_table_names():
+        return
+    existing = {c["name"] for c in inspector.get_columns("media_cache")}
+    if "cache_key" not in existing:
+        with bind.begin() as conn:
+            conn.execute(text("DROP TABLE media_cache"))
+
+
+def _migrate_library_status(bind=engine) -> None:
+    """Drop the legacy library_status table so create_all rebuilds it as the *arr mirror. Idempotent.
+
+    The legacy shape was never written to, so nothing is lost.
+    """
+    inspector = inspect(bind)
+    if "library_status" not in inspector.get_table_names():
+        return
+    existing = {c["name"] for c in inspector.get_columns("library_status")}
+    if "arr_id" not in existing:
+        with bind.begin() as conn:
+            conn.execute(text("DROP TABLE library_status"))
+
+
+def _migrate_library_sync_columns(bind=engine) -> None:
+    """Add incremental-sync columns to an existing library_sync_state table. Idempotent."""
+    inspector = inspect(bind)
+    if "library_sync_state" not in inspector.get_table_names():
+        return
+    existing = {c["name"] for c in inspector.get_columns("library_sync_state")}
+    columns = {
+        "last_full_sync_at": "DATETIME",
+        "watermark": "DATETIME",
+        "instance_url": "VARCHAR(255)",
+    }
+    stmts = [
+        f"ALTER TABLE library_sync_state ADD COLUMN {name} {sql_type}"
+        for name, sql_type in columns.items()
+        if name not in existing
+    ]
     if stmts:
         with bind.begin() as conn:
             for s in stmts:
@@ -50,5 +196,9 @@ def _migrate_watchlist_columns(bind=engine) -> None:
 
 def init_db():
     """Create all tables, then apply lightweight additive migrations."""
+    _migrate_media_cache()
+    _migrate_library_status()
     Base.metadata.create_all(bind=engine)
     _migrate_watchlist_columns()
+    _migrate_watchlist_tags()
+    _migrate_library_sync_columns()
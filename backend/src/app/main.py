@@ -1,6 +1,7 @@
 """FastAPI application entry point."""
+import asyncio
 import os
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
 
 import httpx
 from fastapi import FastAPI, Request
@@ -16,7 +17,12 @@ from app.modules.settings.router import router as settings_router
 from app.modules.library import router as library_router
 from app.modules.calendar import router as calendar_router
 from app.modules.recommendations import router as recommendations_router
-from app.modules.clients import close_all_clients
+from app.modules.hooks import router as hooks_router
+from app.modules.clients import close_all_clients, prewarm_clients, tmdb_client
+from app.modules.library.queue_stream import queue_broadcaster
+from app.modules.library_mirror import run_library_sync
+from app.modules.watchlist.jobs import run_job_workers
+from app.modules.watchlist.metadata import run_metadata_refresher
 
 
 @asynccontextmanager
@@ -25,7 +31,20 @@ async def lifespan(app: FastAPI):
     # Ensure data directory exists
     os.makedirs("data", exist_ok=True)
     init_db()
+    tmdb_client.cache.purge_expired()
+    await prewarm_clients()
+    workers = [
+        asyncio.create_task(run_metadata_refresher()),
+        asyncio.create_task(run_library_sync()),
+        asyncio.create_task(run_job_workers()),
+    ]
     yield
+    for worker in workers:
+        worker.cancel()
+    for worker in workers:
+        with suppress(asyncio.CancelledError):
+            await worker
+    await queue_broadcaster.close()
     await close_all_clients()
 
 
@@ -85,6 +104,7 @@ app.include_router(settings_router)
 app.include_router(library_router)
 app.include_router(calendar_router)
 app.include_router(recommendations_router)
+app.include_router(hooks_router)
 
 
 @app.get("/health")
@@ -1,7 +1,9 @@
 """SQLAlchemy database models."""
 from datetime import datetime, timezone
-from sqlalchemy import String, Integer, Float, DateTime, Text, Boolean
-from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import (
+    BigInteger, Boolean, DateTime, Float, ForeignKey, Index, Integer, String, Text, UniqueConstraint, text,
+)
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
 
@@ -22,19 +24,20 @@ class Settings(Base):
 
 
 class MediaCache(Base):
-    """Cached metadata from TMDB."""
+    """Cached TMDB API responses (persistent read-through cache under ``TMDBClient._get``)."""
 
     __tablename__ = "media_cache"
 
     id: Mapped[int] = mapped_column(primary_key=True)
-    tmdb_id: Mapped[int] = mapped_column(Integer, unique=True, index=True)
-    media_type: Mapped[str] = mapped_column(String(10))  # 'movie' or 'show'
-    title: Mapped[str] = mapped_column(String(255))
-    overview: Mapped[str | None] = mapped_column(Text, nullable=True)
-    poster_path: Mapped[str | None] = mapped_column(String(255), nullable=True)
-    release_date: Mapped[str | None] = mapped_column(String(10), nullable=True)
-    vote_average: Mapped[float | None] = mapped_column(Float, nullable=True)
+    cache_key: Mapped[str] = mapped_column(String(512), unique=True, index=True)
+    # Endpoint + sorted params with api_key stripped, e.g. "/movie/603"
+    endpoint_class: Mapped[str] = mapped_column(String(20))
+    # details, credits, trending, genres or providers (selects the TTL)
+    payload: Mapped[str] = mapped_column(Text)
+    # Raw JSON response body
     cached_at: Mapped[datetime] = mapped_column(DateTime, default=_utcnow)
+    expires_at: Mapped[datetime] = mapped_column(DateTime, index=True)
+    # Naive UTC
 
 
 class Watchlist(Base):
@@ -55,24 +58,133 @@ class Watchlist(Base):
     priority: Mapped[int] = mapped_column(Integer, default=0)
     # 1=High, 0=Normal (default), -1=Low
     tags: Mapped[str | None] = mapped_column(Text, nullable=True)
-    # JSON array of strings, or null
+    # Legacy JSON array of strings; moved into watchlist_tags by init_db and left null
+    tag_links: Mapped[list["WatchlistTag"]] = relationship(
+        back_populates="item", cascade="all, delete-orphan", order_by="WatchlistTag.position"
+    )
+    # Denormalized TMDB metadata, written on add and kept current by the background refresher
+    title: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    overview: Mapped[str | None] = mapped_column(Text, nullable=True)
+    poster_path: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    release_date: Mapped[str | None] = mapped_column(String(10), nullable=True)
+    vote_average: Mapped[float | None] = mapped_column(Float, nullable=True)
+    total_seasons: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    metadata_updated_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    # Naive UTC; null means never fetched (the row still needs TMDB enrichment)
 
     __table_args__ = (
+        # Keyset pagination / filter indexes for GET /api/watchlist (id is the tiebreaker).
+        Index("ix_watchlist_added_at_id", "added_at", "id"),
+        Index("ix_watchlist_title_id", text("title COLLATE NOCASE"), "id"),
+        Index("ix_watchlist_vote_average_id", "vote_average", "id"),
+        Index("ix_watchlist_release_date_id", "release_date", "id"),
+        Index("ix_watchlist_priority_id", "priority", "id"),
+        Index("ix_watchlist_status", "status"),
+        Index("ix_watchlist_media_type", "media_type"),
         {"sqlite_autoincrement": True},
     )
 
+    @property
+    def tag_list(self) -> list[str]:
+        """Tags in the order the user entered them."""
+        return [link.tag for link in self.tag_links]
+
+
+class WatchlistTag(Base):
+    """One tag on one watchlist item (normalized from the legacy ``Watchlist.tags`` JSON)."""
+
+    __tablename__ = "watchlist_tags"
+
+    watchlist_id: Mapped[int] = mapped_column(ForeignKey("watchlist.id", ondelete="CASCADE"), primary_key=True)
+    tag: Mapped[str] = mapped_column(String(100), primary_key=True)
+    position: Mapped[int] = mapped_column(Integer, default=0)
+    item: Mapped[Watchlist] = relationship(back_populates="tag_links")
+
+    __table_args__ = (
+        # Tag filter and facet counts; the primary key already covers per-item lookups.
+        Index("ix_watchlist_tags_tag_watchlist_id", "tag", "watchlist_id"),
+    )
+
 
 class LibraryStatus(Base):
-    """Track items added to Sonarr/Radarr."""
+    """Local mirror of one Radarr movie or Sonarr series, kept current by the library sync worker."""
 
     __tablename__ = "library_status"
 
     id: Mapped[int] = mapped_column(primary_key=True)
-    tmdb_id: Mapped[int] = mapped_column(Integer, index=True)
-    media_type: Mapped[str] = mapped_column(String(10))
-    status: Mapped[str] = mapped_column(String(20))  # 'added', 'downloading', 'available'
+    media_type: Mapped[str] = mapped_column(String(10))  # 'movie' (Radarr) or 'show' (Sonarr)
+    arr_id: Mapped[int] = mapped_column(Integer)
+    # Radarr/Sonarr's own record id
+    tmdb_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    # Null for Sonarr series that were never matched to TMDB
+    tvdb_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    title: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    status: Mapped[str] = mapped_column(String(20))  # 'added' or 'available'
+    has_file: Mapped[bool] = mapped_column(Boolean, default=False)
+    percent_of_episodes: Mapped[float | None] = mapped_column(Float, nullable=True)
+    added: Mapped[str | None] = mapped_column(String(32), nullable=True)
+    # ISO-8601 timestamp as reported by the *arr (sorts lexically)
+    size_on_disk: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    poster_url: Mapped[str | None] = mapped_column(String(512), nullable=True)
+    fingerprint: Mapped[str] = mapped_column(String(40))
+    # Hash of the mirrored fields; a sync only writes rows whose fingerprint changed
     checked_at: Mapped[datetime] = mapped_column(DateTime, default=_utcnow)
 
     __table_args__ = (
+        UniqueConstraint("media_type", "arr_id", name="uq_library_status_media_type_arr_id"),
+        Index("ix_library_status_media_type_tmdb_id", "media_type", "tmdb_id"),
+        Index("ix_library_status_media_type_added", "media_type", "added"),
         {"sqlite_autoincrement": True},
     )
+
+
+class LibrarySyncState(Base):
+    """Progress of the library sync worker for one *arr ('radarr' or 'sonarr')."""
+
+    __tablename__ = "library_sync_state"
+
+    source: Mapped[str] = mapped_column(String(10), primary_key=True)
+    last_synced_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    # Naive UTC of the last successful sync; null until the mirror is first populated
+    last_full_sync_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    watermark: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    # Naive UTC; incremental syncs poll /history/since from here
+    last_attempt_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    item_count: Mapped[int] = mapped_column(Integer, default=0)
+    instance_url: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    # *arr base URL the mirrored rows came from; a different URL forces a full resync
+
+
+class ProcessJob(Base):
+    """A queued watchlist batch for Radarr/Sonarr, worked in the background by the job workers."""
+
+    __tablename__ = "process_jobs"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    media_type: Mapped[str] = mapped_column(String(10))  # 'movie' (Radarr) or 'show' (Sonarr)
+    status: Mapped[str] = mapped_column(String(20), default="queued")  # queued, running, done
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=_utcnow)
+    started_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    items: Mapped[list["ProcessJobItem"]] = relationship(
+        back_populates="job", cascade="all, delete-orphan", order_by="ProcessJobItem.position"
+    )
+
+    __table_args__ = (
+        Index("ix_process_jobs_status_id", "status", "id"),
+        {"sqlite_autoincrement": True},
+    )
+
+
+class ProcessJobItem(Base):
+    """One title in a ``ProcessJob`` and its outcome."""
+
+    __tablename__ = "process_job_items"
+
+    job_id: Mapped[int] = mapped_column(ForeignKey("process_jobs.id", ondelete="CASCADE"), primary_key=True)
+    tmdb_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    position: Mapped[int] = mapped_column(Integer, default=0)
+    status: Mapped[str] = mapped_column(String(20), default="pending")  # pending, added, failed
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    job: Mapped[ProcessJob] = relationship(back_populates="items")
@@ -1,51 +1,331 @@
 """Shared base client for *arr APIs (Radarr, Sonarr)."""
+import asyncio
+import time
+from datetime import datetime
+
 import httpx
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
 from typing import Any
 
+from app.modules.circuit import CircuitBreaker
+from app.modules.http_transport import build_client
+
+# Seconds a full-library snapshot (``/movie`` or ``/series``) is reused.
+LIBRARY_TTL = 120.0
+# Seconds root folders and quality profiles are reused.
+METADATA_TTL = 600.0
+# Bulk adds (/movie/import, /series/import): lookups in flight and records per POST.
+IMPORT_LOOKUP_CONCURRENCY = 8
+IMPORT_CHUNK_SIZE = 50
+# /queue paging: records per page and pages fetched at once after the first.
+QUEUE_PAGE_SIZE = 100
+QUEUE_CONCURRENCY = 4
+
 
 class BaseArrClient:
-    """Base HTTP client for Radarr/Sonarr with persistent connection reuse."""
+    """Base HTTP client for Radarr/Sonarr with persistent connection reuse.
+
+    The full library listing (``library_endpoint``) is multi-megabyte on large
+    libraries, so ``get_library`` serves it from a per-instance snapshot that is
+    reused for ``library_ttl`` seconds, shared by concurrent callers, and dropped
+    after any write (``_post``/``_put``) so an add shows up on the next read.
+
+    Configuration listings every add needs (root folders, quality profiles)
+    are cached the same way for ``metadata_ttl`` seconds; adds do not change them,
+    so they are only dropped by ``invalidate_metadata`` (on a settings change).
 
-    def __init__(self, url: str, api_key: str):
+    With a ``breaker``, a host that keeps timing out or returning 5xx is not
+    contacted while its circuit is open: calls raise ``CircuitOpenError`` at once
+    instead of waiting out the 30s timeout.
+
+    ``X-Api-Key`` is sent with each request, so ``api_key`` can be rotated in
+    place without dropping the pool. Requests are counted while they hold the
+    pool, so a client the factory has replaced (``retire``, after a URL change)
+    closes its pool only once the last of them finishes.
+    """
+
+    service_name: str = ""
+    library_endpoint: str = ""
+    # Field on a /history record naming the library item it touched (movieId / seriesId).
+    history_item_field: str = ""
+    # /queue flags that embed the full movie/series/episode records (dropped by ``slim``).
+    queue_embeds: tuple[str, ...] = ()
+
+    def __init__(
+        self,
+        url: str,
+        api_key: str,
+        library_ttl: float = LIBRARY_TTL,
+        metadata_ttl: float = METADATA_TTL,
+        clock=time.monotonic,
+        breaker: CircuitBreaker | None = None,
+    ):
         self.url = url.rstrip("/")
         self.api_key = api_key
         self._client: httpx.AsyncClient | None = None
+        self.library_ttl = library_ttl
+        self._clock = clock
+        self._library: list[dict] | None = None
+        self._library_expires = 0.0
+        self._library_fetch: asyncio.Task | None = None
+        self._library_generation = 0
+        self.metadata_ttl = metadata_ttl
+        self._metadata: dict[str, tuple[float, Any]] = {}
+        self._metadata_fetches: dict[str, asyncio.Task] = {}
+        self._metadata_generation = 0
+        self._in_flight = 0
+        self._retired = False
+        self.breaker = breaker
 
     async def _get_client(self) -> httpx.AsyncClient:
         if self._client is None or self._client.is_closed:
-            self._client = httpx.AsyncClient(
-                timeout=httpx.Timeout(30.0),
-                headers={"X-Api-Key": self.api_key},
-            )
+            self._client = build_client(httpx.Timeout(30.0))
         return self._client
 
+    def _auth_headers(self) -> dict[str, str]:
+        # Sent per request (not baked into the pool) so a rotated key keeps the connections.
+        return {"X-Api-Key": self.api_key}
+
+    @asynccontextmanager
+    async def _pool(self) -> AsyncIterator[httpx.AsyncClient]:
+        """The pool for one request, counted so ``retire`` never closes it mid-request."""
+        self._in_flight += 1
+        try:
+            yield await self._get_client()
+        finally:
+            self._in_flight -= 1
+            if self._retired and self._in_flight == 0:
+                await self.close()
+
+    async def _send(self, method: str, endpoint: str, **kwargs) -> httpx.Response:
+        """One request through the breaker: transport errors and 5xx count as failures."""
+        token = self.breaker.before_call() if self.breaker is not None else None
+        try:
+            async with self._pool() as client:
+                response = await client.request(
+                    method, f"{self.url}/api/v3{endpoint}", headers=self._auth_headers(), **kwargs
+                )
+        except httpx.TransportError:
+            if self.breaker is not None:
+                self.breaker.record_failure(token)
+            raise
+        except BaseException:
+            if self.breaker is not None:
+                self.breaker.release(token)
+            raise
+        if self.breaker is not None:
+            if response.status_code >= 500:
+                self.breaker.record_failure(token)
+            else:
+                self.breaker.record_success(token)
+        return response
+
     async def _get(self, endpoint: str, params: dict | None = None) -> Any:
-        client = await self._get_client()
-        response = await client.get(
-            f"{self.url}/api/v3{endpoint}",
-            params=params,
-        )
+        response = await self._send("GET", endpoint, params=params)
         response.raise_for_status()
         return response.json()
 
-    async def _post(self, endpoint: str, data: dict) -> Any:
-        client = await self._get_client()
-        response = await client.post(
-            f"{self.url}/api/v3{endpoint}",
-            json=data,
-        )
+    async def _post(self, endpoint: str, data: dict | list) -> Any:
+        try:
+            response = await self._send("POST", endpoint, json=data)
+        finally:
+            self.invalidate_library()
         response.raise_for_status()
         return response.json()
 
     async def _put(self, endpoint: str, data: dict) -> Any:
-        client = await self._get_client()
-        response = await client.put(
-            f"{self.url}/api/v3{endpoint}",
-            json=data,
-        )
+        try:
+            response = await self._send("PUT", endpoint, json=data)
+        finally:
+            self.invalidate_library()
         response.raise_for_status()
         return response.json()
 
+    async def get_library(self) -> list[dict]:
+        """Full library listing from the TTL snapshot. Treat the result as read-only."""
+        if self._library is not None and self._clock() < self._library_expires:
+            return self._library
+
+        fetch = self._library_fetch
+        if fetch is None or fetch.done() or fetch.get_loop() is not asyncio.get_running_loop():
+            fetch = self._library_fetch = asyncio.ensure_future(
+                self._fetch_library(self._library_generation)
+            )
+            # Mark the error retrieved if every waiter was cancelled before it landed.
+            fetch.add_done_callback(lambda t: t.cancelled() or t.exception())
+        return await asyncio.shield(fetch)
+
+    async def _fetch_library(self, generation: int) -> list[dict]:
+        try:
+            library = await self._get(self.library_endpoint)
+        finally:
+            if self._library_generation == generation:
+                self._library_fetch = None
+        # A write landed mid-fetch: hand this result to the waiters but do not keep it.
+        if self._library_generation == generation:
+            self._library = library
+            self._library_expires = self._clock() + self.library_ttl
+        return library
+
+    async def _get_metadata(self, endpoint: str) -> Any:
+        """A configuration listing from the TTL cache, shared by concurrent callers (read-only)."""
+        cached = self._metadata.get(endpoint)
+        if cached is not None and self._clock() < cached[0]:
+            return cached[1]
+
+        fetch = self._metadata_fetches.get(endpoint)
+        if fetch is None or fetch.done() or fetch.get_loop() is not asyncio.get_running_loop():
+            fetch = self._metadata_fetches[endpoint] = asyncio.ensure_future(
+                self._fetch_metadata(endpoint, self._metadata_generation)
+            )
+            fetch.add_done_callback(lambda t: t.cancelled() or t.exception())
+        return await asyncio.shield(fetch)
+
+    async def _fetch_metadata(self, endpoint: str, generation: int) -> Any:
+        try:
+            value = await self._get(endpoint)
+        finally:
+            if self._metadata_generation == generation:
+                self._metadata_fetches.pop(endpoint, None)
+        if self._metadata_generation == generation:
+            self._metadata[endpoint] = (self._clock() + self.metadata_ttl, value)
+        return value
+
+    def invalidate_metadata(self) -> None:
+        """Drop cached root folders/profiles so the next add refetches them."""
+        self._metadata.clear()
+        self._metadata_fetches.clear()
+        self._metadata_generation += 1
+
+    async def get_root_folders(self) -> list[dict]:
+        """Configured root folders (cached)."""
+        return await self._get_metadata("/rootfolder")
+
+    async def get_quality_profiles(self) -> list[dict]:
+        """Available quality profiles (cached)."""
+        return await self._get_metadata("/qualityprofile")
+
+    async def _add_defaults(
+        self, quality_profile_id: int | None, root_folder_path: str | None
+    ) -> tuple[int, str]:
+        """Fill in the first root folder / quality profile when settings do not pick one."""
+        if not root_folder_path:
+            folders = await self.get_root_folders()
+            if not folders:
+                raise ValueError(f"No root folders configured in {self.service_name}")
+            root_folder_path = folders[0]["path"]
+
+        if not quality_profile_id:
+            profiles = await self.get_quality_profiles()
+            if not profiles:
+                raise ValueError(f"No quality profiles configured in {self.service_name}")
+            quality_profile_id = profiles[0]["id"]
+        return quality_profile_id, root_folder_path
+
+    async def _lookup_many(
+        self, lookup: Callable[[int], Awaitable[dict | None]], tmdb_ids: list[int]
+    ) -> dict[int, dict | None | Exception]:
+        """Run ``lookup`` for every id, at most ``IMPORT_LOOKUP_CONCURRENCY`` at once."""
+        semaphore = asyncio.Semaphore(IMPORT_LOOKUP_CONCURRENCY)
+
+        async def one(tmdb_id: int) -> dict | None:
+            async with semaphore:
+                return await lookup(tmdb_id)
+
+        results = await asyncio.gather(*[one(tid) for tid in tmdb_ids], return_exceptions=True)
+        return dict(zip(tmdb_ids, results))
+
+    async def _import(
+        self, import_endpoint: str, add_endpoint: str, prepared: list[tuple[int, dict]]
+    ) -> tuple[list[int], dict[int, str]]:
+        """POST prepared records to a bulk ``/import`` endpoint in ``IMPORT_CHUNK_SIZE`` chunks.
+
+        Chunks are sent one after another. The *arr validates a chunk as a whole, so a
+        chunk it rejects (4xx) is retried title by title through ``add_endpoint`` to
+        pin the error on the offending titles; any other failure fails the chunk.
+        """
+        added: list[int] = []
+        failed: dict[int, str] = {}
+        for start in range(0, len(prepared), IMPORT_CHUNK_SIZE):
+            chunk = prepared[start:start + IMPORT_CHUNK_SIZE]
+            try:
+                await self._post(import_endpoint, [record for _, record in chunk])
+            except httpx.HTTPStatusError as exc:
+                if not 400 <= exc.response.status_code < 500:
+                    failed.update({tmdb_id: f"{self.service_name} import failed: {exc}" for tmdb_id, _ in chunk})
+                    continue
+                for tmdb_id, record in chunk:
+                    try:
+                        await self._post(add_endpoint, record)
+                    except httpx.HTTPError as item_exc:
+                        failed[tmdb_id] = f"{self.service_name} add failed: {item_exc}"
+                    else:
+                        added.append(tmdb_id)
+            except httpx.HTTPError as exc:
+                failed.update({tmdb_id: f"{self.service_name} import failed: {exc}" for tmdb_id, _ in chunk})
+            else:
+                added.extend(tmdb_id for tmdb_id, _ in chunk)
+        return added, failed
+
+    async def get_library_item(self, arr_id: int) -> dict | None:
+        """One library record by the *arr's own id, or None if it no longer exists."""
+        try:
+            return await self._get(f"{self.library_endpoint}/{arr_id}")
+        except httpx.HTTPStatusError as exc:
+            if exc.response.status_code == 404:
+                return None
+            raise
+
+    async def get_history_since(self, since: datetime) -> list[dict]:
+        """History events (grabs, imports, deletes, renames...) at or after naive-UTC ``since``."""
+        return await self._get("/history/since", {"date": since.strftime("%Y-%m-%dT%H:%M:%SZ")})
+
+    async def get_queue(self, slim: bool = False) -> dict:
+        """The whole download queue: ``{"records", "totalRecords"}`` with every page merged.
+
+        The first page reports ``totalRecords``; the remaining pages are fetched
+        concurrently (at most ``QUEUE_CONCURRENCY`` at once). ``slim`` asks the *arr
+        not to embed the movie/series/episode records, which dominate the payload
+        when a season pack floods the queue.
+        """
+        params = {"pageSize": QUEUE_PAGE_SIZE}
+        if not slim:
+            params.update({flag: True for flag in self.queue_embeds})
+        first = await self._get("/queue", {**params, "page": 1})
+        total = first.get("totalRecords", 0)
+        pages = -(-total // QUEUE_PAGE_SIZE)
+
+        semaphore = asyncio.Semaphore(QUEUE_CONCURRENCY)
+
+        async def fetch(page: int) -> list[dict]:
+            async with semaphore:
+                return (await self._get("/queue", {**params, "page": page})).get("records", [])
+
+        rest = await asyncio.gather(*[fetch(page) for page in range(2, pages + 1)])
+        # Items finishing between page requests shift later pages; drop the repeats.
+        records: dict[int, dict] = {}
+        for page_records in [first.get("records", []), *rest]:
+            for record in page_records:
+                records.setdefault(record.get("id"), record)
+        return {"totalRecords": total, "records": list(records.values())}
+
+    async def prewarm(self, connections: int = 1) -> None:
+        """Open ``connections`` pooled connections with cheap status calls (startup)."""
+        await asyncio.gather(*[self._get("/system/status") for _ in range(connections)])
+
+    def invalidate_library(self) -> None:
+        """Drop the snapshot (and detach any in-flight fetch) so the next read refetches."""
+        self._library = None
+        self._library_fetch = None
+        self._library_generation += 1
+
+    async def retire(self) -> None:
+        """Close the pool as soon as no request is using it (this client was replaced)."""
+        self._retired = True
+        if self._in_flight == 0:
+            await self.close()
+
     async def close(self) -> None:
         if self._client is not None and not self._client.is_closed:
             await self._client.aclose()
@@ -49,21 +49,26 @@ async def get_calendar(
         sonarr_records = []
         degraded.append("sonarr")
 
-    # Resolve watchlist movies not yet available via TMDB.
+    # Watchlist movies not yet in the library: stored metadata first, TMDB only for rows
+    # never enriched.
     watchlist_movies = []
     for item in wl.get_all():
         if item.media_type == "movie" and item.status not in ("added", "downloading"):
-            try:
-                details = await tmdb.get_details(item.tmdb_id, "movie")
-                watchlist_movies.append(
-                    {
-                        "tmdb_id": item.tmdb_id,
-                        "title": details.get("title") or f"TMDB:{item.tmdb_id}",
-                        "release_date": details.get("release_date"),
-                    }
-                )
-            except Exception:
-                continue
+            if item.metadata_updated_at is not None:
+                title, release_date = item.title, item.release_date
+            else:
+                try:
+                    details = await tmdb.get_details(item.tmdb_id, "movie")
+                except Exception:
+                    continue
+                title, release_date = details.get("title"), details.get("release_date")
+            watchlist_movies.append(
+                {
+                    "tmdb_id": item.tmdb_id,
+                    "title": title or f"TMDB:{item.tmdb_id}",
+                    "release_date": release_date,
+                }
+            )
 
     items = service.build_agenda(
         service.normalize_sonarr(sonarr_records),
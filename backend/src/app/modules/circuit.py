@@ -0,0 +1,110 @@
+"""Per-upstream circuit breaker so a dead Radarr/Sonarr/TMDB fails fast."""
+import time
+from collections import deque
+
+import httpx
+
+
+class CircuitOpenError(httpx.RequestError):
+    """Raised instead of contacting an upstream whose circuit is open.
+
+    A ``RequestError`` so it takes the same paths as an unreachable upstream:
+    aggregate routes mark the source degraded and the app-wide handler maps it
+    to 503.
+    """
+
+
+class CircuitBreaker:
+    """Closed / open / half-open breaker over the failure rate of recent calls.
+
+    Closed: calls go through and their outcomes fill a sliding window of the last
+    ``window`` calls. Once it holds at least ``min_calls`` outcomes and the share
+    of failures reaches ``failure_rate``, the circuit opens. Open: ``before_call``
+    raises ``CircuitOpenError`` immediately. After ``reset_timeout`` seconds it is
+    half-open: a single trial call is let through; success closes the circuit
+    (with a fresh window), failure opens it for another ``reset_timeout``.
+
+    ``before_call`` returns a token that the caller passes back to ``record_*`` /
+    ``release``. Every state change starts a new generation, and outcomes of calls
+    from an older one are ignored: a slow call started while closed cannot close a
+    half-open circuit in place of the trial, nor re-open an open one and push its
+    reset time back.
+
+    Single-threaded (one event loop), so no lock is needed.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_rate: float = 0.5,
+        window: int = 20,
+        min_calls: int = 5,
+        reset_timeout: float = 30.0,
+        clock=time.monotonic,
+    ):
+        self.name = name
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._outcomes: deque[bool] = deque(maxlen=window)
+        self._state = "closed"
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._generation = 0
+
+    @property
+    def state(self) -> str:
+        if self._state == "open" and self._clock() - self._opened_at >= self.reset_timeout:
+            self._enter("half_open")
+        return self._state
+
+    @property
+    def is_open(self) -> bool:
+        """True while calls would be refused (open, or half-open with the trial taken)."""
+        state = self.state
+        return state == "open" or (state == "half_open" and self._trial_in_flight)
+
+    def before_call(self) -> int:
+        """Let a call through and return its token, or raise ``CircuitOpenError``."""
+        state = self.state
+        if state == "closed":
+            return self._generation
+        if state == "half_open" and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return self._generation
+        raise CircuitOpenError(f"{self.name} circuit open; not calling upstream")
+
+    def record_success(self, token: int) -> None:
+        if token != self._generation:
+            return
+        if self._state == "half_open":
+            self._enter("closed")
+            return
+        self._outcomes.append(True)
+
+    def record_failure(self, token: int) -> None:
+        if token != self._generation:
+            return
+        if self._state == "half_open":
+            self._open()
+            return
+        self._outcomes.append(False)
+        failures = self._outcomes.count(False)
+        if len(self._outcomes) >= self.min_calls and failures / len(self._outcomes) >= self.failure_rate:
+            self._open()
+
+    def release(self, token: int) -> None:
+        """Forget a call that ended without an outcome (e.g. cancelled)."""
+        if token == self._generation and self._state == "half_open":
+            self._trial_in_flight = False
+
+    def _open(self) -> None:
+        self._enter("open")
+        self._opened_at = self._clock()
+
+    def _enter(self, state: str) -> None:
+        self._state = state
+        self._generation += 1
+        self._outcomes.clear()
+        self._trial_in_flight = False
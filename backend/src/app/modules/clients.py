@@ -2,15 +2,34 @@
 
 Holds the process-wide singletons/caches for the outbound HTTP clients (TMDB,
 Radarr, Sonarr) so their httpx connection pools are reused across requests.
-Credentials are resolved DB-first (via ``get_setting``) with ``.env`` fallback,
-so a settings change takes effect without a restart:
+Credentials are resolved DB-first (via ``get_settings_snapshot``) with ``.env`` fallback,
+so a settings change takes effect without a restart. Each factory remembers the
+``settings_version()`` it last resolved at, so the per-request cost is one int
+compare until a settings save bumps the version:
 
 - ``TMDBClient`` reads ``self.api_key`` at call time, so the singleton's key is
-  simply refreshed in place and the pool is kept.
-- ``BaseArrClient`` bakes ``X-Api-Key`` into the pool headers, so a credential
-  change requires building a new client and closing the previous pool.
-
-All clients are closed once at application shutdown via ``close_all_clients``.
+  simply refreshed in place and the pool is kept. The singleton reads through a
+  byte-capped in-process LRU and then the persistent ``media_cache`` table
+  (``discovery.cache``), so cached responses survive restarts. All TMDB traffic
+  shares one token bucket (``TMDB_RATE_LIMIT``/``TMDB_RATE_BURST``) so fan-outs
+  queue instead of tripping TMDB's 429s.
+- ``BaseArrClient`` sends ``X-Api-Key`` per request, so a rotated key is set
+  in place and the pool is kept; only a URL change builds a new client. The
+  swap happens under a per-service lock, so concurrent requests after a change
+  build exactly one new client, and the replaced client is retired: its pool
+  closes once its in-flight requests finish rather than under them. Each instance keeps a TTL snapshot of its full
+  library (``ARR_LIBRARY_TTL``) and of its root folders/profiles/tags
+  (``ARR_METADATA_TTL``), which a rebuild naturally discards; a settings save
+  also drops the latter via ``invalidate_arr_metadata``.
+
+Every client gets its own ``CircuitBreaker`` (``CIRCUIT_*`` settings), so an
+upstream that keeps failing is refused at once instead of costing each request
+a full timeout; a rebuilt *arr client starts with a closed circuit.
+
+Pools are built through ``http_transport.build_client`` (shared limits, optional
+HTTP/2 for TMDB), opened at startup by ``prewarm_clients`` so the first request
+after a deploy skips the DNS/TCP/TLS setup, and closed once at application
+shutdown via ``close_all_clients``.
 
 The ``TMDBClient`` import + singleton and the ``RadarrClient``/``SonarrClient``
 imports are all deferred to the bottom of the module (after the factory
@@ -22,51 +41,168 @@ those names before the deferred imports run.
 """
 from __future__ import annotations
 
-from app.config import get_setting, settings
+import asyncio
+import logging
+
+from app.config import get_settings_snapshot, settings, settings_version
+from app.modules.circuit import CircuitBreaker
+from app.modules.ratelimit import TokenBucket
+
+logger = logging.getLogger(__name__)
 
 # Cached *arr clients; rebuilt only when their resolved credentials change.
 _radarr_client: RadarrClient | None = None
 _sonarr_client: SonarrClient | None = None
+# settings_version() each cached client / the TMDB key was last resolved at.
+_radarr_version = -1
+_sonarr_version = -1
+_tmdb_version = -1
+# Per-service (event loop, lock) serializing client swaps.
+_factory_locks: dict[str, tuple[asyncio.AbstractEventLoop, asyncio.Lock]] = {}
+
+
+def _factory_lock(service: str) -> asyncio.Lock:
+    """Lock for rebuilding one service's client, recreated if the event loop changed."""
+    loop = asyncio.get_running_loop()
+    entry = _factory_locks.get(service)
+    if entry is None or entry[0] is not loop:
+        entry = _factory_locks[service] = (loop, asyncio.Lock())
+    return entry[1]
+
+
+def circuit_breaker(name: str) -> CircuitBreaker:
+    """A breaker for one upstream, tuned by the ``CIRCUIT_*`` settings."""
+    return CircuitBreaker(
+        name,
+        failure_rate=settings.circuit_failure_rate,
+        window=settings.circuit_window,
+        min_calls=settings.circuit_min_calls,
+        reset_timeout=settings.circuit_reset_timeout,
+    )
 
 
 def get_tmdb_client() -> TMDBClient:
-    """Return the shared TMDB client, refreshing its api_key from settings (DB-first)."""
-    tmdb_client.api_key = get_setting("tmdb_api_key") or ""
+    """Return the shared TMDB client, refreshing its api_key from settings (DB-first) after a change."""
+    global _tmdb_version
+    version = settings_version()
+    if _tmdb_version != version:
+        snapshot = get_settings_snapshot()
+        tmdb_client.api_key = snapshot.tmdb_api_key or ""
+        # An .env-only snapshot (DB read failed) is not remembered: retry on the next call.
+        _tmdb_version = snapshot.version if snapshot.from_db else -1
     return tmdb_client
 
 
 async def get_radarr_client() -> RadarrClient:
-    """Return a Radarr client built from DB-first credentials, reusing the pool when unchanged."""
-    global _radarr_client
-    url = get_setting("radarr_url") or settings.radarr_url
-    api_key = get_setting("radarr_api_key") or ""
-
+    """Return a Radarr client built from DB-first credentials, reusing the pool while the URL is unchanged."""
+    global _radarr_client, _radarr_version
     cached = _radarr_client
-    if cached is not None and cached.url == url.rstrip("/") and cached.api_key == api_key:
+    if cached is not None and _radarr_version == settings_version():
         return cached
 
-    if cached is not None:
-        await cached.close()
-
-    _radarr_client = RadarrClient(url=url, api_key=api_key)
-    return _radarr_client
+    async with _factory_lock("radarr"):
+        cached = _radarr_client
+        if cached is not None and _radarr_version == settings_version():
+            return cached
+        snapshot = get_settings_snapshot()
+        url = snapshot.radarr_url or settings.radarr_url
+        api_key = snapshot.radarr_api_key or ""
+        if cached is None or cached.url != url.rstrip("/"):
+            _radarr_client = RadarrClient(
+                url=url,
+                api_key=api_key,
+                library_ttl=settings.arr_library_ttl,
+                metadata_ttl=settings.arr_metadata_ttl,
+                breaker=circuit_breaker("Radarr"),
+            )
+        else:
+            # The key is sent per request: rotating it keeps the pool.
+            cached.api_key = api_key
+        # An .env-only snapshot (DB read failed) is not remembered: retry on the next call.
+        _radarr_version = snapshot.version if snapshot.from_db else -1
+        client = _radarr_client
+
+    if cached is not None and cached is not client:
+        await cached.retire()
+    return client
 
 
 async def get_sonarr_client() -> SonarrClient:
-    """Return a Sonarr client built from DB-first credentials, reusing the pool when unchanged."""
-    global _sonarr_client
-    url = get_setting("sonarr_url") or settings.sonarr_url
-    api_key = get_setting("sonarr_api_key") or ""
-
+    """Return a Sonarr client built from DB-first credentials, reusing the pool while the URL is unchanged."""
+    global _sonarr_client, _sonarr_version
     cached = _sonarr_client
-    if cached is not None and cached.url == url.rstrip("/") and cached.api_key == api_key:
+    if cached is not None and _sonarr_version == settings_version():
         return cached
 
-    if cached is not None:
-        await cached.close()
-
-    _sonarr_client = SonarrClient(url=url, api_key=api_key)
-    return _sonarr_client
+    async with _factory_lock("sonarr"):
+        cached = _sonarr_client
+        if cached is not None and _sonarr_version == settings_version():
+            return cached
+        snapshot = get_settings_snapshot()
+        url = snapshot.sonarr_url or settings.sonarr_url
+        api_key = snapshot.sonarr_api_key or ""
+        if cached is None or cached.url != url.rstrip("/"):
+            _sonarr_client = SonarrClient(
+                url=url,
+                api_key=api_key,
+                library_ttl=settings.arr_library_ttl,
+                metadata_ttl=settings.arr_metadata_ttl,
+                breaker=circuit_breaker("Sonarr"),
+            )
+        else:
+            # The key is sent per request: rotating it keeps the pool.
+            cached.api_key = api_key
+        # An .env-only snapshot (DB read failed) is not remembered: retry on the next call.
+        _sonarr_version = snapshot.version if snapshot.from_db else -1
+        client = _sonarr_client
+
+    if cached is not None and cached is not client:
+        await cached.retire()
+    return client
+
+
+def invalidate_arr_metadata() -> None:
+    """Drop the cached *arr root folders/profiles/tags (called after a settings change)."""
+    for client in (_radarr_client, _sonarr_client):
+        if client is not None:
+            client.invalidate_metadata()
+
+
+async def prewarm_clients(
+    connections: int | None = None, timeout: float | None = None
+) -> None:
+    """Open connections to every configured upstream before the first request needs them.
+
+    Called from the app lifespan; waits at most ``timeout`` seconds, and a failing or
+    unconfigured upstream is skipped (it will simply connect on first use).
+    """
+    connections = settings.http_prewarm_connections if connections is None else connections
+    timeout = settings.http_prewarm_timeout if timeout is None else timeout
+    if connections <= 0:
+        return
+    snapshot = get_settings_snapshot()
+    targets = {}
+    if snapshot.tmdb_api_key:
+        targets["TMDB"] = get_tmdb_client()
+    if snapshot.radarr_api_key:
+        targets["Radarr"] = await get_radarr_client()
+    if snapshot.sonarr_api_key:
+        targets["Sonarr"] = await get_sonarr_client()
+    if not targets:
+        return
+    try:
+        results = await asyncio.wait_for(
+            asyncio.gather(
+                *[client.prewarm(connections) for client in targets.values()], return_exceptions=True
+            ),
+            timeout,
+        )
+    except TimeoutError:
+        logger.info("Connection prewarm did not finish within %.1fs", timeout)
+        return
+    for name, result in zip(targets, results):
+        if isinstance(result, Exception):
+            logger.info("%s connection prewarm failed: %s", name, result)
 
 
 async def close_all_clients() -> None:
@@ -82,9 +218,17 @@ async def close_all_clients() -> None:
 
 
 # Deferred to break the clients <-> router import cycle (see module docstring).
-from app.modules.discovery.tmdb_client import TMDBClient  # noqa: E402
-from app.modules.radarr.client import RadarrClient  # noqa: E402
-from app.modules.sonarr.client import SonarrClient  # noqa: E402
+from app.modules.discovery.cache import MemoryResponseCache, PersistentResponseCache
+from app.modules.discovery.tmdb_client import TMDBClient
+from app.modules.radarr.client import RadarrClient
+from app.modules.sonarr.client import SonarrClient
 
 # Process-wide singleton: api_key is refreshed in place; the pool persists.
-tmdb_client: TMDBClient = TMDBClient(api_key="")
+tmdb_client: TMDBClient = TMDBClient(
+    api_key="",
+    cache=PersistentResponseCache(),
+    memory_cache=MemoryResponseCache(max_bytes=settings.tmdb_memory_cache_bytes),
+    rate_limiter=TokenBucket(rate=settings.tmdb_rate_limit, burst=settings.tmdb_rate_burst),
+    http2=settings.tmdb_http2,
+    breaker=circuit_breaker("TMDB"),
+)
@@ -0,0 +1,231 @@
+"""Read-through response caches for the TMDB client.
+
+Responses are classified by endpoint into a TTL class. Two layers sit in front of
+the network, checked in order:
+
+- ``MemoryResponseCache``: in-process LRU bounded by total payload bytes (detail
+  payloads with ``append_to_response`` vary by orders of magnitude in size, so an
+  entry-count bound would be meaningless). Also holds short-lived ``browse``
+  results (search/discover/similar/recommendations).
+- ``PersistentResponseCache``: the ``media_cache`` table, so a warm deployment
+  survives restarts without refetching watchlist/calendar details. ``browse``
+  results are never persisted.
+"""
+import json
+import logging
+import re
+import time
+from collections import OrderedDict
+from datetime import UTC, datetime, timedelta
+from typing import Any
+from urllib.parse import urlencode
+
+from sqlalchemy import delete
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.database import SessionLocal
+from app.models import MediaCache
+
+logger = logging.getLogger(__name__)
+
+# Seconds each endpoint class stays fresh.
+CACHE_TTLS: dict[str, int] = {
+    "trending": 3600,
+    "providers": 12 * 3600,
+    "details": 24 * 3600,
+    "credits": 72 * 3600,
+    "genres": 7 * 24 * 3600,
+}
+
+# In-process TTLs are shorter: entries promoted from the persistent layer may already be aged.
+MEMORY_TTLS: dict[str, int] = {
+    "browse": 300,
+    "trending": 600,
+    "providers": 3600,
+    "details": 3600,
+    "credits": 3600,
+    "genres": 24 * 3600,
+}
+
+# append_to_response part -> the class whose TTL it imposes on the combined payload.
+_APPEND_CLASSES = {
+    "credits": "credits",
+    "combined_credits": "credits",
+    "watch/providers": "providers",
+}
+
+_DETAIL_RE = re.compile(r"^/(movie|tv|person|collection)/\d+$")
+_BROWSE_RE = re.compile(r"^/(search|discover)/|/(similar|recommendations)$")
+
+
+def classify_endpoint(endpoint: str, params: dict | None = None) -> str | None:
+    """Return the TTL class for a TMDB endpoint, or None if it must not be cached.
+
+    ``browse`` is memory-only (see ``MEMORY_TTLS``). A detail request that appends
+    sub-resources takes the shortest TTL among its parts, e.g.
+    ``/movie/603?append_to_response=credits,watch/providers`` is a providers entry.
+    """
+    if endpoint.startswith("/trending/"):
+        return "trending"
+    if endpoint.startswith("/genre/"):
+        return "genres"
+    if endpoint.endswith("/watch/providers"):
+        return "providers"
+    if endpoint.endswith("/credits"):
+        return "credits"
+    if _DETAIL_RE.match(endpoint):
+        appended = str((params or {}).get("append_to_response") or "")
+        classes = ["details"] + [
+            _APPEND_CLASSES.get(part.strip(), "details") for part in appended.split(",") if part.strip()
+        ]
+        return min(classes, key=CACHE_TTLS.__getitem__)
+    if _BROWSE_RE.search(endpoint):
+        return "browse"
+    return None
+
+
+def cache_key(endpoint: str, params: dict | None = None) -> str:
+    """Normalize endpoint + params (sorted, api_key stripped) into a stable cache key."""
+    items = sorted((k, str(v)) for k, v in (params or {}).items() if k != "api_key")
+    return f"{endpoint}?{urlencode(items)}" if items else endpoint
+
+
+def _utcnow_naive() -> datetime:
+    """SQLite DateTime columns round-trip naive, so compare in naive UTC."""
+    return datetime.now(UTC).replace(tzinfo=None)
+
+
+class MemoryResponseCache:
+    """In-process LRU + TTL cache evicting by total serialized payload bytes.
+
+    Payloads are stored as compact JSON and decoded on every hit, so callers may
+    mutate what they get back (the detail routes do) without corrupting the cache.
+    """
+
+    def __init__(self, max_bytes: int, ttls: dict[str, int] | None = None, clock=time.monotonic):
+        self.max_bytes = max_bytes
+        self.ttls = ttls or MEMORY_TTLS
+        self._clock = clock
+        self._entries: OrderedDict[str, tuple[bytes, float]] = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: str) -> Any | None:
+        """Return a fresh copy of the cached payload, or None on miss/expiry."""
+        entry = self._entries.get(key)
+        if entry is not None and entry[1] <= self._clock():
+            self._discard(key)
+            self.expirations += 1
+            entry = None
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return json.loads(entry[0])
+
+    def set(self, key: str, endpoint_class: str, payload: Any) -> None:
+        """Store ``payload``, evicting least-recently-used entries to fit ``max_bytes``."""
+        ttl = self.ttls.get(endpoint_class)
+        if ttl is None:
+            return
+        body = json.dumps(payload, separators=(",", ":")).encode()
+        if len(body) > self.max_bytes:
+            return
+        self._discard(key)
+        self._entries[key] = (body, self._clock() + ttl)
+        self._bytes += len(body)
+        while self._bytes > self.max_bytes:
+            _, (evicted, _) = self._entries.popitem(last=False)
+            self._bytes -= len(evicted)
+            self.evictions += 1
+
+    def _discard(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= len(entry[0])
+
+    def clear(self) -> None:
+        """Drop every entry (counters are kept)."""
+        self._entries.clear()
+        self._bytes = 0
+
+    def stats(self) -> dict[str, int]:
+        """Counters and current size, for sizing ``max_bytes``."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+        }
+
+
+class PersistentResponseCache:
+    """TMDB response store backed by the ``media_cache`` table.
+
+    Every method is best-effort: a database error is logged and treated as a miss,
+    so a broken cache degrades to plain upstream calls rather than failing requests.
+    """
+
+    def __init__(self, session_factory=None):
+        self._session_factory = session_factory or SessionLocal
+
+    def get(self, key: str) -> Any | None:
+        """Return the cached payload for ``key`` if present and unexpired."""
+        db = self._session_factory()
+        try:
+            row = db.query(MediaCache).filter(MediaCache.cache_key == key).first()
+            if row is None or row.expires_at <= _utcnow_naive():
+                return None
+            return json.loads(row.payload)
+        except (SQLAlchemyError, ValueError) as exc:
+            logger.warning("TMDB cache read failed for %s: %s", key, exc)
+            return None
+        finally:
+            db.close()
+
+    def set(self, key: str, endpoint_class: str, payload: Any) -> None:
+        """Upsert ``payload`` under ``key`` with the TTL of ``endpoint_class``."""
+        now = _utcnow_naive()
+        values = {
+            "cache_key": key,
+            "endpoint_class": endpoint_class,
+            "payload": json.dumps(payload),
+            "cached_at": now,
+            "expires_at": now + timedelta(seconds=CACHE_TTLS[endpoint_class]),
+        }
+        stmt = insert(MediaCache).values(**values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[MediaCache.cache_key],
+            set_={k: stmt.excluded[k] for k in ("endpoint_class", "payload", "cached_at", "expires_at")},
+        )
+        db = self._session_factory()
+        try:
+            db.execute(stmt)
+            db.commit()
+        except SQLAlchemyError as exc:
+            db.rollback()
+            logger.warning("TMDB cache write failed for %s: %s", key, exc)
+        finally:
+            db.close()
+
+    def purge_expired(self) -> int:
+        """Delete expired rows. Returns the number removed."""
+        db = self._session_factory()
+        try:
+            result = db.execute(delete(MediaCache).where(MediaCache.expires_at <= _utcnow_naive()))
+            db.commit()
+            return result.rowcount or 0
+        except SQLAlchemyError as exc:
+            db.rollback()
+            logger.warning("TMDB cache purge failed: %s", exc)
+            return 0
+        finally:
+            db.close()
@@ -1,7 +1,7 @@
 """Discovery API routes."""
 from fastapi import APIRouter, Depends, HTTPException, Query
 
-from app.config import get_setting
+from app.config import SettingsSnapshot, get_settings_snapshot
 from app.schemas import MediaList, MediaResponse
 from .tmdb_client import TMDBClient
 from .schemas import DiscoveryFilters
@@ -172,6 +172,14 @@ async def get_similar(tmdb_id: int, media_type: str = Query(...), tmdb: TMDBClie
     )
 
 
+@router.get("/cache/stats")
+async def get_cache_stats(tmdb: TMDBClient = Depends(get_tmdb_client)):
+    """In-process TMDB cache counters (hits/misses/evictions/bytes) for sizing."""
+    if tmdb.memory_cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **tmdb.memory_cache.stats()}
+
+
 # Genre endpoints
 @genres_router.get("/movies")
 async def get_movie_genres(tmdb: TMDBClient = Depends(get_tmdb_client)):
@@ -196,24 +204,32 @@ async def get_person(person_id: int, tmdb: TMDBClient = Depends(get_tmdb_client)
 
 
 @router.get("/movies/{movie_id}")
-async def get_movie_detail(movie_id: int, tmdb: TMDBClient = Depends(get_tmdb_client)):
+async def get_movie_detail(
+    movie_id: int,
+    tmdb: TMDBClient = Depends(get_tmdb_client),
+    app_settings: SettingsSnapshot = Depends(get_settings_snapshot),
+):
     """Get movie details with cast, videos, and recommendations."""
     data = await tmdb.get_movie_detail(movie_id)
     if not data:
         raise HTTPException(status_code=404, detail="Movie not found")
-    region = get_setting("streaming_region") or DEFAULT_REGION
+    region = app_settings.streaming_region or DEFAULT_REGION
     data["watch_providers"] = _extract_watch_providers(data, region)
     data.pop("watch/providers", None)
     return data
 
 
 @router.get("/shows/{show_id}")
-async def get_show_detail(show_id: int, tmdb: TMDBClient = Depends(get_tmdb_client)):
+async def get_show_detail(
+    show_id: int,
+    tmdb: TMDBClient = Depends(get_tmdb_client),
+    app_settings: SettingsSnapshot = Depends(get_settings_snapshot),
+):
     """Get TV show details with cast, videos, and recommendations."""
     data = await tmdb.get_show_detail(show_id)
     if not data:
         raise HTTPException(status_code=404, detail="Show not found")
-    region = get_setting("streaming_region") or DEFAULT_REGION
+    region = app_settings.streaming_region or DEFAULT_REGION
     data["watch_providers"] = _extract_watch_providers(data, region)
     data.pop("watch/providers", None)
     return data
@@ -1,8 +1,23 @@
 """TMDB API client."""
-import httpx
+import asyncio
+import copy
+from collections.abc import AsyncIterator
 from typing import Any, Literal
 
+import httpx
+
 from app.config import settings
+from app.modules.circuit import CircuitBreaker, CircuitOpenError
+from app.modules.http_transport import build_client
+from app.modules.ratelimit import TokenBucket, backoff_delay, retry_after_seconds
+
+from .cache import (
+    CACHE_TTLS,
+    MemoryResponseCache,
+    PersistentResponseCache,
+    cache_key,
+    classify_endpoint,
+)
 
 
 class TMDBClientError(Exception):
@@ -26,6 +41,26 @@ class TMDBAPIError(TMDBClientError):
 
 
 MediaType = Literal["movie", "tv"]
+DetailKey = tuple[int, str]  # (tmdb_id, "movie" | "tv")
+
+# Longest single wait on a 429; a longer Retry-After fails the request instead of holding it.
+MAX_RETRY_DELAY = 30.0
+
+
+class _Flight:
+    """One in-flight upstream request shared by every concurrent caller of its key."""
+
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+def _retrieve_exception(task: asyncio.Task) -> None:
+    """Mark a flight's exception as retrieved if every waiter was cancelled before it finished."""
+    if not task.cancelled():
+        task.exception()
 
 
 class TMDBClient:
@@ -36,18 +71,43 @@ class TMDBClient:
         api_key: str,
         base_url: str | None = None,
         timeout: float = 10.0,
+        cache: PersistentResponseCache | None = None,
+        memory_cache: MemoryResponseCache | None = None,
+        rate_limiter: TokenBucket | None = None,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        http2: bool = False,
+        breaker: CircuitBreaker | None = None,
     ):
         self.api_key = api_key
         self.base_url = base_url or settings.tmdb_base_url
         self.timeout = timeout
+        self.cache = cache
+        self.memory_cache = memory_cache
+        self.rate_limiter = rate_limiter
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.http2 = http2
+        self.breaker = breaker
         self._client: httpx.AsyncClient | None = None
+        self._inflight: dict[str, _Flight] = {}
 
     async def _get_client(self) -> httpx.AsyncClient:
         """Get or create the HTTP client."""
         if self._client is None or self._client.is_closed:
-            self._client = httpx.AsyncClient(timeout=self.timeout)
+            self._client = build_client(self.timeout, http2=self.http2)
         return self._client
 
+    async def prewarm(self, connections: int = 1) -> None:
+        """Open ``connections`` pooled connections with uncached ``/configuration`` calls (startup)."""
+        client = await self._get_client()
+        url = f"{self.base_url}/configuration"
+        responses = await asyncio.gather(
+            *[client.get(url, params={"api_key": self.api_key}) for _ in range(connections)]
+        )
+        for response in responses:
+            response.raise_for_status()
+
     async def close(self) -> None:
         """Close the HTTP client."""
         if self._client is not None and not self._client.is_closed:
@@ -61,16 +121,109 @@ class TMDBClient:
         await self.close()
 
     async def _get(self, endpoint: str, params: dict | None = None) -> dict[str, Any]:
-        """Make GET request to TMDB API."""
-        params = params or {}
-        params["api_key"] = self.api_key
+        """Make GET request to TMDB API.
+
+        Reads through the memory then persistent cache; concurrent misses for the same
+        (endpoint, params) key share a single upstream request.
+        """
+        params = dict(params or {})
+        key = cache_key(endpoint, params)
+        endpoint_class = classify_endpoint(endpoint, params)
+        persist = self.cache is not None and endpoint_class in CACHE_TTLS
+
+        if self.memory_cache is not None and endpoint_class is not None:
+            cached = self.memory_cache.get(key)
+            if cached is not None:
+                return cached
+        if persist:
+            cached = self.cache.get(key)
+            if cached is not None:
+                if self.memory_cache is not None:
+                    self.memory_cache.set(key, endpoint_class, cached)
+                return cached
+
+        flight = self._inflight.get(key)
+        if flight is None:
+            task = asyncio.ensure_future(self._fetch_once(key, endpoint, params, endpoint_class, persist))
+            task.add_done_callback(_retrieve_exception)
+            flight = self._inflight[key] = _Flight(task)
+        flight.waiters += 1
+        # shield: one caller cancelling (client disconnect) must not cancel the others' fetch.
+        data = await asyncio.shield(flight.task)
+        # Callers mutate detail payloads in place, so a shared result is handed out as copies.
+        return copy.deepcopy(data) if flight.waiters > 1 else data
+
+    async def _fetch_once(
+        self, key: str, endpoint: str, params: dict, endpoint_class: str | None, persist: bool
+    ) -> dict[str, Any]:
+        """Leader side of a flight: fetch upstream, then populate the caches."""
+        try:
+            data = await self._request(endpoint, params)
+        finally:
+            # Unregister before waiters resume so the waiter count is final when they read it.
+            self._inflight.pop(key, None)
+        if persist:
+            self.cache.set(key, endpoint_class, data)
+        if self.memory_cache is not None and endpoint_class is not None:
+            self.memory_cache.set(key, endpoint_class, data)
+        return data
+
+    async def _request(self, endpoint: str, params: dict) -> dict[str, Any]:
+        """Send the GET upstream through the circuit breaker, when there is one.
+
+        While the circuit is open this raises ``TMDBNetworkError`` without a request;
+        network errors and 5xx responses count as failures, anything else as success.
+        """
+        if self.breaker is None:
+            return await self._send(endpoint, params)
+        try:
+            token = self.breaker.before_call()
+        except CircuitOpenError as e:
+            raise TMDBNetworkError(str(e)) from e
+        try:
+            data = await self._send(endpoint, params)
+        except TMDBNetworkError:
+            self.breaker.record_failure(token)
+            raise
+        except TMDBAPIError as e:
+            if e.status_code is not None and e.status_code >= 500:
+                self.breaker.record_failure(token)
+            else:
+                self.breaker.record_success(token)
+            raise
+        except BaseException:
+            self.breaker.release(token)
+            raise
+        self.breaker.record_success(token)
+        return data
+
+    async def _send(self, endpoint: str, params: dict) -> dict[str, Any]:
+        """Send the GET upstream, mapping httpx failures onto TMDBClientError subclasses.
+
+        Every attempt first takes a token from the shared limiter. A 429 is retried up
+        to ``max_retries`` times, waiting ``Retry-After`` when given (else jittered
+        exponential backoff) and pushing back the limiter so concurrent callers slow too.
+        """
+        params = {**params, "api_key": self.api_key}
         url = f"{self.base_url}{endpoint}"
 
         try:
             client = await self._get_client()
-            response = await client.get(url, params=params)
-            response.raise_for_status()
-            return response.json()
+            for attempt in range(self.max_retries + 1):
+                if self.rate_limiter is not None:
+                    await self.rate_limiter.acquire()
+                response = await client.get(url, params=params)
+                if response.status_code == 429 and attempt < self.max_retries:
+                    delay = self._retry_delay(response, attempt)
+                    if delay is not None:
+                        if self.rate_limiter is not None:
+                            # The next acquire() waits out the penalty; no extra sleep.
+                            self.rate_limiter.penalize(delay)
+                        else:
+                            await asyncio.sleep(delay)
+                        continue
+                response.raise_for_status()
+                return response.json()
         except httpx.TimeoutException as e:
             raise TMDBNetworkError(f"Request timed out: {url}") from e
         except httpx.ConnectError as e:
@@ -83,6 +236,13 @@ class TMDBClient:
         except Exception as e:
             raise TMDBClientError(f"Unexpected error: {e}") from e
 
+    def _retry_delay(self, response: httpx.Response, attempt: int) -> float | None:
+        """Seconds to wait before retrying a 429, or None to give up (Retry-After too long)."""
+        retry_after = retry_after_seconds(response.headers.get("Retry-After"))
+        if retry_after is None:
+            return backoff_delay(attempt, self.backoff_base, MAX_RETRY_DELAY)
+        return retry_after if retry_after <= MAX_RETRY_DELAY else None
+
     async def _get_or_none(self, endpoint: str, params: dict | None = None) -> dict[str, Any] | None:
         """Make GET request, returning None on 404."""
         try:
@@ -125,6 +285,38 @@ class TMDBClient:
         validated_type = self._validate_media_type(media_type)
         return await self._get(f"/{validated_type}/{tmdb_id}")
 
+    async def get_details_many(
+        self, keys: list[DetailKey], concurrency: int = 8
+    ) -> AsyncIterator[tuple[DetailKey, dict[str, Any] | None, Exception | None]]:
+        """Fetch details for many (tmdb_id, media_type) keys with at most ``concurrency`` in flight.
+
+        Yields ``(key, details, error)`` in completion order, exactly one of ``details``/``error``
+        set per key, so one failed lookup never sinks the batch. Duplicate keys are fetched once.
+        """
+        unique = list(dict.fromkeys(keys))
+        if not unique:
+            return
+        pending = iter(unique)
+        results: asyncio.Queue = asyncio.Queue()
+
+        async def worker() -> None:
+            # Workers share one iterator, so each key is taken exactly once.
+            for key in pending:
+                try:
+                    details = await self.get_details(*key)
+                except Exception as e:  # noqa: BLE001 - relayed to the consumer
+                    await results.put((key, None, e))
+                else:
+                    await results.put((key, details, None))
+
+        workers = [asyncio.ensure_future(worker()) for _ in range(min(concurrency, len(unique)))]
+        try:
+            for _ in unique:
+                yield await results.get()
+        finally:
+            for task in workers:
+                task.cancel()
+
     async def get_movie_genres(self) -> dict[str, Any]:
         """Get list of movie genres from TMDB."""
         return await self._get("/genre/movie/list")
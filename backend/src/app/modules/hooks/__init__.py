@@ -0,0 +1,4 @@
+"""Radarr/Sonarr webhook ingestion module."""
+from .router import router
+
+__all__ = ["router"]
@@ -0,0 +1,42 @@
+"""Webhook receivers for Radarr/Sonarr events."""
+import secrets
+
+from fastapi import APIRouter, Body, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import get_db
+from app.modules.clients import get_radarr_client, get_sonarr_client
+from app.modules.radarr.client import RadarrClient
+from app.modules.sonarr.client import SonarrClient
+
+from .service import handle_event
+
+router = APIRouter(prefix="/api/hooks", tags=["hooks"])
+
+
+def verify_token(token: str | None = Query(None)) -> None:
+    """Require ``?token=`` to match ``WEBHOOK_TOKEN`` when one is configured."""
+    expected = settings.webhook_token
+    if expected and not secrets.compare_digest(token or "", expected):
+        raise HTTPException(status_code=401, detail="Invalid webhook token")
+
+
+@router.post("/radarr", dependencies=[Depends(verify_token)])
+async def radarr_webhook(
+    payload: dict = Body(...),
+    db: Session = Depends(get_db),
+    client: RadarrClient = Depends(get_radarr_client),
+):
+    """Receive a Radarr webhook (Grab, Download, MovieAdded, MovieDelete, ...)."""
+    return await handle_event(db, "radarr", payload, client)
+
+
+@router.post("/sonarr", dependencies=[Depends(verify_token)])
+async def sonarr_webhook(
+    payload: dict = Body(...),
+    db: Session = Depends(get_db),
+    client: SonarrClient = Depends(get_sonarr_client),
+):
+    """Receive a Sonarr webhook (Grab, Download, SeriesAdd, SeriesDelete, ...)."""
+    return await handle_event(db, "sonarr", payload, client)
@@ -0,0 +1,85 @@
+"""Apply Radarr/Sonarr webhook events to the library mirror and the watchlist.
+
+Each *arr is pointed at ``/api/hooks/{radarr,sonarr}`` (Settings > Connect >
+Webhook). An event rewrites the touched title in ``library_status`` (refetching
+its record, or deleting the row) and drops the client's library snapshot, so
+status reads are current as soon as the *arr acts instead of at the next sync
+tick. Matching watchlist rows move forward: a grab marks them ``downloading``,
+an import or add marks them ``added``. Rows are never moved back; a title
+deleted from the *arr keeps its watchlist status.
+
+Handling is best-effort: if the title cannot be refetched, the mirror worker is
+woken instead and the event is still acknowledged, so the *arr does not retry.
+"""
+import logging
+
+import httpx
+from sqlalchemy.orm import Session
+
+from app.modules.arr_base import BaseArrClient
+from app.modules.library_mirror import SOURCES, LibraryMirror, record_item, request_library_sync
+from app.modules.watchlist.service import WatchlistService
+
+logger = logging.getLogger(__name__)
+
+# source -> payload key holding the library record
+_RECORD_KEYS = {"radarr": "movie", "sonarr": "series"}
+
+# Events after which the title's library record must be refetched.
+_REFRESH_EVENTS = {
+    "Download", "MovieAdded", "MovieAdd", "SeriesAdd", "MovieFileDelete", "EpisodeFileDelete", "Rename",
+}
+_DELETE_EVENTS = {"MovieDelete", "SeriesDelete"}
+
+# eventType -> (new watchlist status, statuses it may move a row out of)
+_WATCHLIST_TRANSITIONS = {
+    "Grab": ("downloading", ("pending", "added")),
+    "Download": ("added", ("pending", "downloading")),
+    "MovieAdded": ("added", ("pending",)),
+    "MovieAdd": ("added", ("pending",)),
+    "SeriesAdd": ("added", ("pending",)),
+}
+
+
+async def handle_event(db: Session, source: str, payload: dict, client: BaseArrClient) -> dict:
+    """Apply one webhook payload; returns a summary of what changed."""
+    event = payload.get("eventType") or ""
+    media_type = SOURCES[source]
+    item = payload.get(_RECORD_KEYS[source]) or {}
+    arr_id = item.get("id")
+    tmdb_id = item.get("tmdbId") or None
+    mirrored = False
+
+    if arr_id is not None and event in _DELETE_EVENTS:
+        client.invalidate_library()
+        record_item(db, source, arr_id, None)
+        mirrored = True
+    elif arr_id is not None and event in _REFRESH_EVENTS:
+        client.invalidate_library()
+        try:
+            record = await client.get_library_item(arr_id)
+        except httpx.HTTPError as exc:
+            logger.warning("Webhook refetch of %s %s failed: %s", source, arr_id, exc)
+            request_library_sync()
+        else:
+            record_item(db, source, arr_id, record)
+            mirrored = True
+            tmdb_id = tmdb_id or (record or {}).get("tmdbId") or None
+
+    if tmdb_id is None and arr_id is not None:
+        # Sonarr v3 payloads carry only tvdbId; resolve through the mirror.
+        row = LibraryMirror(db).get_by_arr_id(media_type, arr_id)
+        tmdb_id = row.tmdb_id if row else None
+
+    watchlist_updated = 0
+    transition = _WATCHLIST_TRANSITIONS.get(event)
+    if transition is not None and tmdb_id is not None:
+        status, from_statuses = transition
+        watchlist_updated = WatchlistService(db).advance_status(tmdb_id, media_type, status, from_statuses)
+
+    return {
+        "event": event,
+        "tmdb_id": tmdb_id,
+        "mirrored": mirrored,
+        "watchlist_updated": watchlist_updated,
+    }
@@ -0,0 +1,42 @@
+"""One place for how outbound HTTP clients (TMDB, Radarr, Sonarr) are configured.
+
+Every client builds its ``httpx.AsyncClient`` through ``build_client`` so pool
+size, keepalive and HTTP/2 are tuned in one spot (``HTTP_MAX_CONNECTIONS``,
+``HTTP_MAX_KEEPALIVE_CONNECTIONS``, ``HTTP_KEEPALIVE_EXPIRY``). HTTP/2 needs the
+optional ``h2`` package (``pip install "httpx[http2]"``); when it is requested but
+missing the client falls back to HTTP/1.1 and logs it once.
+"""
+import importlib.util
+import logging
+
+import httpx
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+_http2_warned = False
+
+
+def pool_limits() -> httpx.Limits:
+    """Connection limits shared by every outbound pool."""
+    return httpx.Limits(
+        max_connections=settings.http_max_connections,
+        max_keepalive_connections=settings.http_max_keepalive_connections,
+        keepalive_expiry=settings.http_keepalive_expiry,
+    )
+
+
+def http2_available() -> bool:
+    return importlib.util.find_spec("h2") is not None
+
+
+def build_client(timeout: float | httpx.Timeout, http2: bool = False) -> httpx.AsyncClient:
+    """A pooled AsyncClient with the shared limits; ``http2`` only if ``h2`` is installed."""
+    global _http2_warned
+    if http2 and not http2_available():
+        if not _http2_warned:
+            logger.warning('HTTP/2 requested but the "h2" package is missing; using HTTP/1.1')
+            _http2_warned = True
+        http2 = False
+    return httpx.AsyncClient(timeout=timeout, limits=pool_limits(), http2=http2)
@@ -0,0 +1,172 @@
+"""Shared poller behind ``GET /api/library/queue/stream`` (Server-Sent Events).
+
+One ``QueueBroadcaster`` polls the Radarr and Sonarr download queues every
+``QUEUE_POLL_INTERVAL`` seconds while at least one client is subscribed, and
+fans the result out to every subscriber, so the upstream load is fixed no matter
+how many tabs are open. The poller starts with the first subscriber and stops
+when the last one leaves.
+
+A new subscriber first receives a ``snapshot`` event (the full combined queue,
+shaped like ``GET /api/library/queue``). After that only ``changes`` events are
+sent, carrying the records that were added or changed (progress, status, eta)
+and the ids that left the queue. A source that fails keeps its last records and
+is listed in ``degraded``. A subscriber that falls too far behind has its backlog
+replaced by a fresh snapshot instead of being disconnected.
+"""
+import asyncio
+import json
+import logging
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import suppress
+
+from app.config import settings
+from app.modules.clients import get_radarr_client, get_sonarr_client
+
+logger = logging.getLogger(__name__)
+
+# Combined-queue key -> *arr whose queue fills it
+QUEUE_SOURCES = {"movies": "radarr", "shows": "sonarr"}
+# Seconds of silence after which a keepalive comment is sent (keeps proxies from closing the stream)
+KEEPALIVE_INTERVAL = 15.0
+# Pending events per subscriber before its backlog is replaced by a snapshot
+MAX_PENDING_EVENTS = 32
+
+# Returns {"movies": records | None, "shows": records | None}; None marks a failed source.
+QueueFetcher = Callable[[], Awaitable[dict[str, list[dict] | None]]]
+
+
+async def fetch_queues() -> dict[str, list[dict] | None]:
+    """Fetch both *arr queues concurrently; a failed source comes back as None."""
+    radarr, sonarr = await get_radarr_client(), await get_sonarr_client()
+    results = await asyncio.gather(radarr.get_queue(), sonarr.get_queue(), return_exceptions=True)
+    queues: dict[str, list[dict] | None] = {}
+    for key, result in zip(QUEUE_SOURCES, results):
+        if isinstance(result, Exception):
+            logger.warning("%s queue unavailable: %s", QUEUE_SOURCES[key].capitalize(), result)
+            queues[key] = None
+        else:
+            queues[key] = result.get("records", [])
+    return queues
+
+
+def format_event(event: str, data: dict) -> str:
+    """Serialize one SSE message."""
+    return f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+
+class QueueBroadcaster:
+    """Polls the combined download queue for all subscribers and pushes only what changed."""
+
+    def __init__(self, fetch: QueueFetcher = fetch_queues, interval: float | None = None):
+        self._fetch = fetch
+        self.interval = settings.queue_poll_interval if interval is None else interval
+        self._records: dict[str, dict[int, dict]] = {key: {} for key in QUEUE_SOURCES}
+        self._degraded: list[str] = []
+        self._ready = False
+        self._subscribers: set[asyncio.Queue] = set()
+        self._task: asyncio.Task | None = None
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def snapshot(self) -> dict:
+        return {
+            **{key: list(records.values()) for key, records in self._records.items()},
+            "degraded": list(self._degraded),
+        }
+
+    async def poll_once(self) -> None:
+        """Fetch both queues once and publish the snapshot (first poll) or the changes."""
+        queues = await self._fetch()
+        changes: dict = {"upserted": {}, "removed": {}}
+        degraded = []
+        for key, records in queues.items():
+            if records is None:
+                degraded.append(QUEUE_SOURCES[key])
+                continue
+            current = {record["id"]: record for record in records if record.get("id") is not None}
+            previous = self._records[key]
+            upserted = [record for qid, record in current.items() if previous.get(qid) != record]
+            removed = [qid for qid in previous if qid not in current]
+            if upserted:
+                changes["upserted"][key] = upserted
+            if removed:
+                changes["removed"][key] = removed
+            self._records[key] = current
+
+        degraded_changed = degraded != self._degraded
+        self._degraded = degraded
+        if not self._ready:
+            self._ready = True
+            self._publish(format_event("snapshot", self.snapshot()))
+        elif changes["upserted"] or changes["removed"] or degraded_changed:
+            self._publish(format_event("changes", {**changes, "degraded": degraded}))
+
+    def _publish(self, message: str) -> None:
+        for queue in self._subscribers:
+            if queue.full():
+                # Slow reader: drop its backlog and let it resync from a snapshot.
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(format_event("snapshot", self.snapshot()))
+            else:
+                queue.put_nowait(message)
+
+    async def _run(self) -> None:
+        while self._subscribers:
+            try:
+                await self.poll_once()
+            except Exception:
+                logger.exception("Download queue poll failed")
+            await asyncio.sleep(self.interval)
+
+    def subscribe(self) -> asyncio.Queue:
+        """Register a subscriber (starting the poller if needed); returns its event queue."""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=MAX_PENDING_EVENTS)
+        if self._ready:
+            queue.put_nowait(format_event("snapshot", self.snapshot()))
+        self._subscribers.add(queue)
+        task = self._task
+        if task is None or task.done() or task.get_loop() is not asyncio.get_running_loop():
+            self._task = asyncio.create_task(self._run())
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        self._subscribers.discard(queue)
+        if not self._subscribers:
+            # Nobody is watching: stop polling and start from a fresh snapshot next time.
+            if self._task is not None:
+                self._task.cancel()
+                self._task = None
+            self._records = {key: {} for key in QUEUE_SOURCES}
+            self._degraded = []
+            self._ready = False
+
+    async def stream(self, keepalive: float = KEEPALIVE_INTERVAL) -> AsyncIterator[str]:
+        """SSE body for one client; unsubscribes when the client disconnects."""
+        queue = self.subscribe()
+        try:
+            while True:
+                try:
+                    yield await asyncio.wait_for(queue.get(), keepalive)
+                except TimeoutError:
+                    yield ": keepalive\n\n"
+        finally:
+            self.unsubscribe(queue)
+
+    async def close(self) -> None:
+        """Stop the poller (application shutdown)."""
+        self._subscribers.clear()
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
+
+
+queue_broadcaster = QueueBroadcaster()
+
+
+def get_queue_broadcaster() -> QueueBroadcaster:
+    return queue_broadcaster
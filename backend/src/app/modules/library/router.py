@@ -2,11 +2,14 @@
 import asyncio
 import logging
 from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
 
 from app.modules.radarr.router import get_radarr_client
 from app.modules.sonarr.router import get_sonarr_client
 from app.modules.radarr.client import RadarrClient
 from app.modules.sonarr.client import SonarrClient
+from app.modules.library_mirror import LibraryMirror, get_library_mirror
+from .queue_stream import QueueBroadcaster, get_queue_broadcaster
 
 
 logger = logging.getLogger(__name__)
@@ -18,13 +21,23 @@ router = APIRouter(prefix="/api/library", tags=["library"])
 async def get_library_activity(
     limit: int = Query(20, le=100),
     radarr: RadarrClient = Depends(get_radarr_client),
-    sonarr: SonarrClient = Depends(get_sonarr_client)
+    sonarr: SonarrClient = Depends(get_sonarr_client),
+    mirror: LibraryMirror = Depends(get_library_mirror),
 ):
-    """Get combined recent activity from Radarr and Sonarr."""
+    """Get combined recent activity from Radarr and Sonarr.
+
+    Each side is read from the local library mirror once it has synced, so a slow
+    or restarting *arr does not hold up the page; otherwise it is fetched live.
+    """
+    async def recent(source: str, media_type: str, client):
+        if mirror.is_ready(source):
+            return mirror.recent(media_type, limit)
+        return await client.get_recent(limit)
+
     # Run both calls in parallel for faster response
     movies, shows = await asyncio.gather(
-        radarr.get_recent(limit),
-        sonarr.get_recent(limit),
+        recent("radarr", "movie", radarr),
+        recent("sonarr", "show", sonarr),
         return_exceptions=True,
     )
 
@@ -47,14 +60,15 @@ async def get_library_activity(
 
 @router.get("/queue")
 async def get_combined_queue(
+    slim: bool = Query(False, description="Omit the embedded movie/series/episode records"),
     radarr: RadarrClient = Depends(get_radarr_client),
     sonarr: SonarrClient = Depends(get_sonarr_client)
 ):
-    """Get combined download queue from Radarr and Sonarr."""
+    """Get combined download queue from Radarr and Sonarr (every page of each)."""
     # Run both calls in parallel for faster response
     radarr_queue, sonarr_queue = await asyncio.gather(
-        radarr.get_queue(),
-        sonarr.get_queue(),
+        radarr.get_queue(slim=slim),
+        sonarr.get_queue(slim=slim),
         return_exceptions=True,
     )
 
@@ -73,3 +87,16 @@ async def get_combined_queue(
         "shows": sonarr_queue.get("records", []),
         "degraded": degraded,
     }
+
+
+@router.get("/queue/stream")
+async def stream_combined_queue(broadcaster: QueueBroadcaster = Depends(get_queue_broadcaster)):
+    """Server-Sent Events: a ``snapshot`` of the combined queue, then ``changes`` as they happen.
+
+    All connected clients share one upstream poller (see ``queue_stream``).
+    """
+    return StreamingResponse(
+        broadcaster.stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,505 @@
+"""Local SQLite mirror of the Radarr/Sonarr libraries (``library_status``).
+
+A background worker (``run_library_sync``, started from the app lifespan) keeps
+the table current. It normally polls each *arr's ``/history/since`` from a stored
+watermark and refetches only the titles those events touched; the full listing
+is pulled on a slow cadence or after a gap, and is diffed so only rows whose
+mirrored fields changed are written. Status, batch-status, recent
+activity and the For You seed builder read the indexed table through
+``LibraryMirror`` instead of the live APIs, so those pages stay fast and keep
+working while an *arr is slow or restarting.
+
+A source is served from the mirror only once it has synced successfully at least
+once (``LibraryMirror.is_ready``); until then, and whenever the mirror cannot be
+read, callers fall back to the live client. Reads are best-effort like the TMDB
+response cache: a database error is logged and reported as "not ready".
+"""
+import asyncio
+import hashlib
+import json
+import logging
+from collections.abc import Awaitable, Callable
+from contextlib import suppress
+from datetime import UTC, datetime, timedelta
+
+import httpx
+from fastapi import Depends
+from sqlalchemy import delete, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal, get_db
+from app.models import LibraryStatus, LibrarySyncState, Watchlist
+from app.modules.clients import get_radarr_client, get_sonarr_client
+
+logger = logging.getLogger(__name__)
+
+# source -> media_type stored on its rows
+SOURCES = {"radarr": "movie", "sonarr": "show"}
+
+_MIRRORED_FIELDS = (
+    "tmdb_id", "tvdb_id", "title", "status", "has_file",
+    "percent_of_episodes", "added", "size_on_disk", "poster_url",
+)
+
+# Incremental sync: polling gaps longer than this force a full resync (history may be pruned),
+# and so do more affected titles than MAX_INCREMENTAL_ITEMS (one listing is cheaper).
+MAX_INCREMENTAL_GAP = timedelta(days=3)
+MAX_INCREMENTAL_ITEMS = 100
+INCREMENTAL_CONCURRENCY = 4
+
+# Set by request_library_sync() to wake the worker before its next interval, on the worker's loop.
+_sync_requested: asyncio.Event | None = None
+_sync_loop: asyncio.AbstractEventLoop | None = None
+
+
+def _utcnow_naive() -> datetime:
+    return datetime.now(UTC).replace(tzinfo=None)
+
+
+def _poster_url(record: dict) -> str | None:
+    for image in record.get("images") or []:
+        if image.get("coverType") == "poster":
+            return image.get("remoteUrl") or image.get("url")
+    return None
+
+
+def movie_fields(movie: dict) -> dict:
+    """Map a Radarr ``/movie`` record onto the mirrored columns."""
+    has_file = bool(movie.get("hasFile"))
+    return {
+        "tmdb_id": movie.get("tmdbId") or None,
+        "tvdb_id": None,
+        "title": movie.get("title"),
+        "status": "available" if has_file else "added",
+        "has_file": has_file,
+        "percent_of_episodes": None,
+        "added": movie.get("added"),
+        "size_on_disk": movie.get("sizeOnDisk"),
+        "poster_url": _poster_url(movie),
+    }
+
+
+def series_fields(series: dict) -> dict:
+    """Map a Sonarr ``/series`` record onto the mirrored columns."""
+    stats = series.get("statistics") or {}
+    percent = stats.get("percentOfEpisodes", 0)
+    return {
+        "tmdb_id": series.get("tmdbId") or None,
+        "tvdb_id": series.get("tvdbId") or None,
+        "title": series.get("title"),
+        "status": "available" if percent == 100 else "added",
+        "has_file": stats.get("episodeFileCount", 0) > 0,
+        "percent_of_episodes": percent,
+        "added": series.get("added"),
+        "size_on_disk": stats.get("sizeOnDisk"),
+        "poster_url": _poster_url(series),
+    }
+
+
+def _fingerprint(fields: dict) -> str:
+    raw = json.dumps([fields[name] for name in _MIRRORED_FIELDS], default=str)
+    return hashlib.sha1(raw.encode()).hexdigest()
+
+
+def _write_changes(
+    db: Session, source: str, records: list[dict], removed: set[int] | None = None
+) -> dict[str, int]:
+    """Upsert ``records`` whose fingerprint changed and delete rows by *arr id.
+
+    ``removed=None`` means ``records`` is the full listing, so every mirrored row not
+    in it is deleted. Otherwise only the rows for ``records`` and ``removed`` are
+    touched. Does not commit.
+    """
+    media_type = SOURCES[source]
+    to_fields = movie_fields if source == "radarr" else series_fields
+    query = select(LibraryStatus.id, LibraryStatus.arr_id, LibraryStatus.fingerprint).where(
+        LibraryStatus.media_type == media_type
+    )
+    if removed is not None:
+        query = query.where(LibraryStatus.arr_id.in_({r.get("id") for r in records} | removed))
+    existing = {arr_id: (row_id, fingerprint) for row_id, arr_id, fingerprint in db.execute(query)}
+
+    now = _utcnow_naive()
+    counts = {"inserted": 0, "updated": 0, "deleted": 0, "unchanged": 0}
+    inserts: list[dict] = []
+    updates: list[dict] = []
+    seen: set[int] = set()
+    for record in records:
+        arr_id = record.get("id")
+        if arr_id is None or arr_id in seen:
+            continue
+        seen.add(arr_id)
+        fields = to_fields(record)
+        fingerprint = _fingerprint(fields)
+        current = existing.get(arr_id)
+        if current is None:
+            inserts.append({"media_type": media_type, "arr_id": arr_id, "fingerprint": fingerprint,
+                            "checked_at": now, **fields})
+        elif current[1] != fingerprint:
+            updates.append({"id": current[0], "fingerprint": fingerprint, "checked_at": now, **fields})
+        else:
+            counts["unchanged"] += 1
+
+    if removed is None:
+        removed = set(existing) - seen
+    removed_rows = [existing[arr_id][0] for arr_id in removed if arr_id in existing]
+    if inserts:
+        db.bulk_insert_mappings(LibraryStatus, inserts)
+    if updates:
+        db.bulk_update_mappings(LibraryStatus, updates)
+    if removed_rows:
+        db.execute(delete(LibraryStatus).where(LibraryStatus.id.in_(removed_rows)))
+    counts.update(inserted=len(inserts), updated=len(updates), deleted=len(removed_rows))
+    return counts
+
+
+def _sync_state(db: Session, source: str) -> LibrarySyncState:
+    state = db.get(LibrarySyncState, source)
+    if state is None:
+        state = LibrarySyncState(source=source)
+        db.add(state)
+    return state
+
+
+def apply_library(
+    db: Session,
+    source: str,
+    records: list[dict],
+    watermark: datetime | None = None,
+    instance_url: str | None = None,
+) -> dict[str, int]:
+    """Diff a full *arr listing against the mirror and write only the changes.
+
+    Returns ``{"inserted", "updated", "deleted", "unchanged"}`` counts and marks the
+    source fully synced from ``instance_url``; ``watermark`` (default: now) is where
+    incremental syncs resume. The caller owns the session; this commits.
+    """
+    counts = _write_changes(db, source, records)
+    now = _utcnow_naive()
+    state = _sync_state(db, source)
+    state.instance_url = instance_url
+    state.last_synced_at = state.last_full_sync_at = state.last_attempt_at = now
+    state.watermark = watermark or now
+    state.last_error = None
+    state.item_count = counts["inserted"] + counts["updated"] + counts["unchanged"]
+    db.commit()
+    return counts
+
+
+def apply_changes(
+    db: Session, source: str, records: list[dict], removed: set[int], watermark: datetime | None
+) -> dict[str, int]:
+    """Write an incremental batch (changed records + removed *arr ids) and advance the watermark."""
+    counts = _write_changes(db, source, records, removed)
+    now = _utcnow_naive()
+    state = _sync_state(db, source)
+    state.last_synced_at = state.last_attempt_at = now
+    if watermark is not None and (state.watermark is None or watermark > state.watermark):
+        state.watermark = watermark
+    state.last_error = None
+    state.item_count = (state.item_count or 0) + counts["inserted"] - counts["deleted"]
+    db.commit()
+    return counts
+
+
+def record_sync_error(db: Session, source: str, error: Exception) -> None:
+    """Note a failed sync attempt; the previously mirrored rows keep being served."""
+    state = _sync_state(db, source)
+    state.last_attempt_at = _utcnow_naive()
+    state.last_error = f"{type(error).__name__}: {error}"[:500]
+    db.commit()
+
+
+def record_item(db: Session, source: str, arr_id: int, record: dict | None) -> None:
+    """Write one title's current record right away; ``None`` removes it (best-effort)."""
+    try:
+        if record is None:
+            _write_changes(db, source, [], {arr_id})
+        else:
+            _write_changes(db, source, [record], set())
+        db.commit()
+    except SQLAlchemyError as exc:
+        db.rollback()
+        logger.warning("Library mirror write failed for %s %s: %s", source, arr_id, exc)
+
+
+def record_added(db: Session, source: str, record: dict) -> None:
+    """Mirror a record returned by a successful add right away (best-effort)."""
+    if record.get("id") is None:
+        return
+    record_item(db, source, record["id"], record)
+
+
+def _parse_event_date(value: str | None) -> datetime | None:
+    """*arr history dates are ISO-8601 UTC ("2026-01-01T12:00:00Z"); returns naive UTC."""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(UTC).replace(tzinfo=None)
+    return parsed
+
+
+def full_resync_due(
+    state: LibrarySyncState | None, now: datetime, instance_url: str | None = None
+) -> bool:
+    """Full listing needed: never synced, a different *arr URL, slow cadence elapsed, or a polling gap."""
+    if state is None or state.last_synced_at is None or state.last_full_sync_at is None:
+        return True
+    if state.watermark is None:
+        return True
+    if state.instance_url != instance_url:
+        # The *arr URL changed in settings: its history says nothing about the rows we hold.
+        return True
+    if now - state.last_full_sync_at >= timedelta(seconds=settings.library_full_resync_interval):
+        return True
+    # The worker was down (or failing) long enough that history may have been pruned.
+    return now - state.last_synced_at > MAX_INCREMENTAL_GAP
+
+
+async def _full_sync(db: Session, source: str, client) -> dict[str, int]:
+    started = _utcnow_naive()
+    client.invalidate_library()  # a full resync must not reuse a stale snapshot
+    records = await client.get_library()
+    return apply_library(db, source, records, watermark=started, instance_url=client.url)
+
+
+async def _incremental_sync(db: Session, source: str, client, state: LibrarySyncState) -> dict[str, int] | None:
+    """Refetch only the titles touched by history events since the watermark.
+
+    Returns None when a full resync is the better option (too many affected titles).
+    """
+    events = await client.get_history_since(state.watermark)
+    field = client.history_item_field
+    affected = {event[field] for event in events if event.get(field)}
+    if len(affected) > MAX_INCREMENTAL_ITEMS:
+        return None
+    dates = [d for d in (_parse_event_date(e.get("date")) for e in events) if d is not None]
+    watermark = max(dates) if dates else None
+
+    semaphore = asyncio.Semaphore(INCREMENTAL_CONCURRENCY)
+
+    async def fetch(arr_id: int) -> tuple[int, dict | None]:
+        async with semaphore:
+            return arr_id, await client.get_library_item(arr_id)
+
+    fetched = await asyncio.gather(*[fetch(arr_id) for arr_id in affected])
+    records = [record for _, record in fetched if record is not None]
+    removed = {arr_id for arr_id, record in fetched if record is None}
+    return apply_changes(db, source, records, removed, watermark)
+
+
+async def sync_source(source: str, client, session_factory=SessionLocal) -> dict[str, int] | None:
+    """Bring one *arr's mirror up to date. Returns change counts, or None on failure.
+
+    Normally polls ``/history/since`` from the stored watermark and refetches only the
+    affected titles; the full listing is pulled on first sync, every
+    ``LIBRARY_FULL_RESYNC_INTERVAL`` seconds, after a polling gap, or when too many
+    titles changed. Titles added or removed directly in the *arr (which leave no
+    history event) are picked up by the full resync.
+    """
+    db = session_factory()
+    try:
+        state = db.get(LibrarySyncState, source)
+        counts = None
+        if not full_resync_due(state, _utcnow_naive(), client.url):
+            counts = await _incremental_sync(db, source, client, state)
+        if counts is None:
+            counts = await _full_sync(db, source, client)
+        return counts
+    except SQLAlchemyError as exc:
+        db.rollback()
+        logger.warning("Library mirror write for %s failed: %s", source, exc)
+        return None
+    except (httpx.HTTPError, ValueError, KeyError, TypeError) as exc:
+        db.rollback()
+        logger.warning("Library sync from %s failed: %s", source, exc)
+        try:
+            record_sync_error(db, source, exc)
+        except SQLAlchemyError:
+            db.rollback()
+        return None
+    finally:
+        db.close()
+
+
+async def sync_all() -> None:
+    """Sync every configured *arr once."""
+    for source, get_client in (("radarr", get_radarr_client), ("sonarr", get_sonarr_client)):
+        client = await get_client()
+        if not client.api_key:
+            continue
+        counts = await sync_source(source, client)
+        if counts and (counts["inserted"] or counts["updated"] or counts["deleted"]):
+            logger.info("Library mirror %s: %s", source, counts)
+
+
+def request_library_sync() -> None:
+    """Ask the worker to sync now (e.g. after we added something) instead of at its next tick.
+
+    Safe to call from sync routes running in the threadpool.
+    """
+    event, loop = _sync_requested, _sync_loop
+    if event is None or loop is None or loop.is_closed():
+        return
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if running is loop:
+        event.set()
+    else:
+        loop.call_soon_threadsafe(event.set)
+
+
+async def run_library_sync(interval: float | None = None) -> None:
+    """Background loop started from the app lifespan; runs until cancelled at shutdown."""
+    global _sync_requested, _sync_loop
+    interval = settings.library_sync_interval if interval is None else interval
+    _sync_requested = asyncio.Event()
+    _sync_loop = asyncio.get_running_loop()
+    while True:
+        _sync_requested.clear()
+        try:
+            await sync_all()
+        except Exception:
+            logger.exception("Library sync failed")
+        with suppress(asyncio.TimeoutError):
+            await asyncio.wait_for(_sync_requested.wait(), interval)
+
+
+async def lookup_quietly(
+    lookup: Callable[[int], Awaitable[dict | None]], tmdb_id: int
+) -> dict | None:
+    """Best-effort *arr lookup for mirror-served routes: ``None`` if the *arr is unreachable.
+
+    The mirror's answer stands on its own; a lookup only adds a title or resolves a
+    series the mirror cannot match by tmdbId, so it must not turn the route into a 503.
+    """
+    try:
+        return await lookup(tmdb_id)
+    except httpx.HTTPError as exc:
+        logger.debug("Lookup for %s failed: %s", tmdb_id, exc)
+        return None
+
+
+class LibraryMirror:
+    """Read side of the mirror. Each method is a single indexed query."""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def is_ready(self, source: str) -> bool:
+        """True once ``source`` has synced successfully; False if the mirror is unreadable."""
+        try:
+            state = self.db.get(LibrarySyncState, source)
+        except SQLAlchemyError as exc:
+            self.db.rollback()
+            logger.warning("Library mirror unavailable: %s", exc)
+            return False
+        return state is not None and state.last_synced_at is not None
+
+    def record_added(self, source: str, record: dict) -> None:
+        record_added(self.db, source, record)
+        request_library_sync()
+
+    def get(self, media_type: str, tmdb_id: int) -> LibraryStatus | None:
+        return self.db.execute(
+            select(LibraryStatus)
+            .where(LibraryStatus.media_type == media_type, LibraryStatus.tmdb_id == tmdb_id)
+            .limit(1)
+        ).scalar_one_or_none()
+
+    def get_by_arr_id(self, media_type: str, arr_id: int) -> LibraryStatus | None:
+        return self.db.execute(
+            select(LibraryStatus).where(LibraryStatus.media_type == media_type, LibraryStatus.arr_id == arr_id)
+        ).scalar_one_or_none()
+
+    def get_by_tvdb_id(self, tvdb_id: int) -> LibraryStatus | None:
+        return self.db.execute(
+            select(LibraryStatus)
+            .where(LibraryStatus.media_type == "show", LibraryStatus.tvdb_id == tvdb_id)
+            .limit(1)
+        ).scalar_one_or_none()
+
+    def has_unmatched(self, media_type: str) -> bool:
+        """True if some mirrored titles lack a tmdbId (older Sonarr or unmatched series)."""
+        return self.db.execute(
+            select(LibraryStatus.id)
+            .where(LibraryStatus.media_type == media_type, LibraryStatus.tmdb_id.is_(None))
+            .limit(1)
+        ).first() is not None
+
+    def watchlist_title(self, media_type: str, tmdb_id: int) -> str | None:
+        """Title from the watchlist's stored TMDB metadata, if the title is on the watchlist."""
+        return self.db.scalars(
+            select(Watchlist.title)
+            .where(
+                Watchlist.media_type == media_type,
+                Watchlist.tmdb_id == tmdb_id,
+                Watchlist.title.is_not(None),
+            )
+            .limit(1)
+        ).first()
+
+    def statuses(self, media_type: str, tmdb_ids: list[int]) -> dict[int, str | None]:
+        """``{tmdb_id: 'available' | 'added' | None}`` for every requested id."""
+        found = dict(
+            self.db.execute(
+                select(LibraryStatus.tmdb_id, LibraryStatus.status).where(
+                    LibraryStatus.media_type == media_type, LibraryStatus.tmdb_id.in_(tmdb_ids)
+                )
+            ).all()
+        )
+        return {tmdb_id: found.get(tmdb_id) for tmdb_id in tmdb_ids}
+
+    def statuses_by_tvdb_id(self, tvdb_ids: list[int]) -> dict[int, str]:
+        """``{tvdb_id: status}`` for the mirrored series among ``tvdb_ids``."""
+        return dict(
+            self.db.execute(
+                select(LibraryStatus.tvdb_id, LibraryStatus.status).where(
+                    LibraryStatus.media_type == "show", LibraryStatus.tvdb_id.in_(tvdb_ids)
+                )
+            ).all()
+        )
+
+    def tmdb_ids(self, media_type: str) -> list[int]:
+        return list(
+            self.db.scalars(
+                select(LibraryStatus.tmdb_id).where(
+                    LibraryStatus.media_type == media_type, LibraryStatus.tmdb_id.is_not(None)
+                )
+            )
+        )
+
+    def recent(self, media_type: str, limit: int) -> list[dict]:
+        """Most recently added titles, shaped like the *arr records the UI already renders.
+
+        Movies are limited to ones with a file, matching ``RadarrClient.get_recent``.
+        """
+        query = select(LibraryStatus).where(LibraryStatus.media_type == media_type)
+        if media_type == "movie":
+            query = query.where(LibraryStatus.has_file.is_(True))
+        rows = self.db.scalars(query.order_by(LibraryStatus.added.desc()).limit(limit))
+        return [
+            {
+                "id": row.arr_id,
+                "tmdbId": row.tmdb_id,
+                "tvdbId": row.tvdb_id,
+                "title": row.title,
+                "added": row.added,
+                "hasFile": row.has_file,
+                "sizeOnDisk": row.size_on_disk,
+                "images": [{"coverType": "poster", "remoteUrl": row.poster_url}] if row.poster_url else [],
+            }
+            for row in rows
+        ]
+
+
+def get_library_mirror(db: Session = Depends(get_db)) -> LibraryMirror:
+    return LibraryMirror(db)
@@ -2,9 +2,24 @@
 from app.modules.arr_base import BaseArrClient
 
 
+def _prepare_movie(movie: dict, quality_profile_id: int, root_folder_path: str) -> dict:
+    """Turn a lookup result into an add payload (monitored, search on add)."""
+    movie["qualityProfileId"] = quality_profile_id
+    movie["rootFolderPath"] = root_folder_path
+    movie["monitored"] = True
+    movie["addOptions"] = {"searchForMovie": True}
+    movie.pop("path", None)
+    return movie
+
+
 class RadarrClient(BaseArrClient):
     """Client for Radarr API."""
 
+    service_name = "Radarr"
+    library_endpoint = "/movie"
+    history_item_field = "movieId"
+    queue_embeds = ("includeMovie",)
+
     async def get_movie_by_tmdb_id(self, tmdb_id: int) -> dict | None:
         """Get movie from library by TMDB ID."""
         movies = await self._get("/movie", {"tmdbId": tmdb_id})
@@ -15,10 +30,6 @@ class RadarrClient(BaseArrClient):
         results = await self._get("/movie/lookup", {"term": f"tmdb:{tmdb_id}"})
         return results[0] if results else None
 
-    async def get_quality_profiles(self) -> list:
-        """Get available quality profiles."""
-        return await self._get("/qualityprofile")
-
     async def add_movie(
         self,
         tmdb_id: int,
@@ -34,25 +45,44 @@ class RadarrClient(BaseArrClient):
         if not movie:
             raise ValueError(f"Movie not found: {tmdb_id}")
 
-        if not root_folder_path:
-            folders = await self._get("/rootfolder")
-            if not folders:
-                raise ValueError("No root folders configured in Radarr")
-            root_folder_path = folders[0]["path"]
-
-        if not quality_profile_id:
-            profiles = await self.get_quality_profiles()
-            if not profiles:
-                raise ValueError("No quality profiles configured in Radarr")
-            quality_profile_id = profiles[0]["id"]
+        quality_profile_id, root_folder_path = await self._add_defaults(quality_profile_id, root_folder_path)
+        return await self._post("/movie", _prepare_movie(movie, quality_profile_id, root_folder_path))
 
-        movie["qualityProfileId"] = quality_profile_id
-        movie["rootFolderPath"] = root_folder_path
-        movie["monitored"] = True
-        movie["addOptions"] = {"searchForMovie": True}
-        movie.pop("path", None)
-
-        return await self._post("/movie", movie)
+    async def add_movies(
+        self,
+        tmdb_ids: list[int],
+        quality_profile_id: int | None = None,
+        root_folder_path: str | None = None,
+    ) -> tuple[list[int], dict[int, str]]:
+        """Add many movies through ``/movie/import``. Returns (added ids, {id: error}).
+
+        Existing movies are found in one library snapshot instead of a lookup per title,
+        Radarr lookups run with bounded concurrency, and the adds go out in chunks.
+        """
+        quality_profile_id, root_folder_path = await self._add_defaults(quality_profile_id, root_folder_path)
+        self.invalidate_library()  # dedupe against a fresh listing, not one up to ARR_LIBRARY_TTL old
+        library = {m["tmdbId"]: m for m in await self.get_library() if m.get("tmdbId")}
+
+        failed: dict[int, str] = {}
+        wanted = []
+        for tmdb_id in dict.fromkeys(tmdb_ids):
+            if tmdb_id in library:
+                failed[tmdb_id] = f"Movie already in Radarr library: {library[tmdb_id].get('title', tmdb_id)}"
+            else:
+                wanted.append(tmdb_id)
+
+        prepared = []
+        for tmdb_id, movie in (await self._lookup_many(self.lookup_movie, wanted)).items():
+            if isinstance(movie, Exception):
+                failed[tmdb_id] = str(movie)
+            elif not movie:
+                failed[tmdb_id] = f"Movie not found: {tmdb_id}"
+            else:
+                prepared.append((tmdb_id, _prepare_movie(movie, quality_profile_id, root_folder_path)))
+
+        added, import_failed = await self._import("/movie/import", "/movie", prepared)
+        failed.update(import_failed)
+        return added, failed
 
     async def get_status(self, tmdb_id: int) -> str:
         """Get movie status: 'available', 'added', or 'not_found'."""
@@ -64,8 +94,8 @@ class RadarrClient(BaseArrClient):
         return "added"
 
     async def get_all_movies(self) -> list[dict]:
-        """Get all movies in library."""
-        return await self._get("/movie")
+        """Get all movies in library (TTL snapshot; do not mutate)."""
+        return await self.get_library()
 
     async def get_batch_status(self, tmdb_ids: list[int]) -> dict[int, str]:
         """Get status for multiple movies efficiently."""
@@ -82,18 +112,9 @@ class RadarrClient(BaseArrClient):
 
         return {tmdb_id: library_map.get(tmdb_id) for tmdb_id in tmdb_ids}
 
-    async def get_queue(self) -> dict:
-        """Get current download queue from Radarr."""
-        return await self._get("/queue", {
-            "page": 1,
-            "pageSize": 50,
-            "includeMovie": True,
-        })
-
     async def get_recent(self, limit: int = 20) -> list:
         """Get recently added movies from Radarr."""
-        movies = await self._get("/movie")
-        movies.sort(key=lambda m: m.get("added", ""), reverse=True)
+        movies = sorted(await self.get_library(), key=lambda m: m.get("added", ""), reverse=True)
         return [m for m in movies if m.get("hasFile")][:limit]
 
     async def get_calendar(self, start: str, end: str) -> list[dict]:
@@ -3,6 +3,7 @@ from fastapi import APIRouter, Depends, HTTPException, Path, Query
 from httpx import HTTPStatusError, TimeoutException
 
 from app.modules.clients import get_radarr_client
+from app.modules.library_mirror import LibraryMirror, get_library_mirror, lookup_quietly
 from app.schemas import AddMediaRequest, AddMediaResponse, LibraryStatusResponse, BatchStatusRequest, BatchStatusResponse
 from .client import RadarrClient
 
@@ -14,8 +15,23 @@ router = APIRouter(prefix="/api/radarr", tags=["radarr"])
 async def get_movie_status(
     tmdb_id: int = Path(gt=0, description="TMDB movie ID"),
     client: RadarrClient = Depends(get_radarr_client),
+    mirror: LibraryMirror = Depends(get_library_mirror),
 ):
-    """Check if movie is in Radarr library."""
+    """Check if movie is in Radarr library (from the local mirror once it has synced)."""
+    if mirror.is_ready("radarr"):
+        row = mirror.get("movie", tmdb_id)
+        if row is not None:
+            return LibraryStatusResponse(
+                tmdb_id=tmdb_id, media_type="movie", status=row.status, title=row.title
+            )
+        # Not in the library: the title comes from the watchlist or a Radarr lookup, as it did live.
+        title = mirror.watchlist_title("movie", tmdb_id)
+        if title is None:
+            movie = await lookup_quietly(client.lookup_movie, tmdb_id)
+            title = movie.get("title") if movie else None
+        return LibraryStatusResponse(
+            tmdb_id=tmdb_id, media_type="movie", status="not_found", title=title
+        )
     status = await client.get_status(tmdb_id)
     movie = await client.lookup_movie(tmdb_id)
     return LibraryStatusResponse(
@@ -28,7 +44,9 @@ async def get_movie_status(
 
 @router.post("/add", response_model=AddMediaResponse)
 async def add_movie(
-    data: AddMediaRequest, client: RadarrClient = Depends(get_radarr_client)
+    data: AddMediaRequest,
+    client: RadarrClient = Depends(get_radarr_client),
+    mirror: LibraryMirror = Depends(get_library_mirror),
 ):
     """Add movie to Radarr."""
     try:
@@ -36,6 +54,7 @@ async def add_movie(
             tmdb_id=data.tmdb_id,
             quality_profile_id=data.quality_profile_id,
         )
+        mirror.record_added("radarr", result)
         return AddMediaResponse(
             success=True,
             message=f"Added {result.get('title', 'movie')} to Radarr",
@@ -53,9 +72,13 @@ async def add_movie(
 
 @router.post("/status/batch", response_model=BatchStatusResponse)
 async def get_batch_status(
-    data: BatchStatusRequest, client: RadarrClient = Depends(get_radarr_client)
+    data: BatchStatusRequest,
+    client: RadarrClient = Depends(get_radarr_client),
+    mirror: LibraryMirror = Depends(get_library_mirror),
 ):
     """Get library status for multiple movies at once."""
+    if mirror.is_ready("radarr"):
+        return BatchStatusResponse(statuses=mirror.statuses("movie", data.tmdb_ids))
     try:
         statuses = await client.get_batch_status(data.tmdb_ids)
         return BatchStatusResponse(statuses=statuses)
@@ -82,15 +105,21 @@ async def get_radarr_quality_profiles(client: RadarrClient = Depends(get_radarr_
 
 
 @router.get("/queue")
-async def get_radarr_queue(client: RadarrClient = Depends(get_radarr_client)):
-    """Get current download queue from Radarr."""
-    return await client.get_queue()
+async def get_radarr_queue(
+    slim: bool = Query(False, description="Omit the embedded movie records"),
+    client: RadarrClient = Depends(get_radarr_client),
+):
+    """Get the full download queue from Radarr (all pages)."""
+    return await client.get_queue(slim=slim)
 
 
 @router.get("/recent")
 async def get_radarr_recent(
     limit: int = Query(20, le=100),
-    client: RadarrClient = Depends(get_radarr_client)
+    client: RadarrClient = Depends(get_radarr_client),
+    mirror: LibraryMirror = Depends(get_library_mirror),
 ):
     """Get recently added movies from Radarr."""
+    if mirror.is_ready("radarr"):
+        return mirror.recent("movie", limit)
     return await client.get_recent(limit)
@@ -0,0 +1,76 @@
+"""Client-side rate limiting and retry backoff for outbound API clients."""
+import asyncio
+import random
+import time
+from datetime import UTC, datetime
+from email.utils import parsedate_to_datetime
+
+
+class TokenBucket:
+    """Async token bucket shared by every caller of one upstream.
+
+    Tokens refill continuously at ``rate`` per second up to ``burst``. Each
+    ``acquire`` reserves the next token up front (the balance may go negative),
+    so waiters are served strictly FIFO without a lock and the bucket is not
+    bound to any particular event loop. ``penalize`` blocks the bucket until a
+    point in time; overlapping penalties extend to the latest one, not their sum.
+    """
+
+    def __init__(self, rate: float, burst: int | None = None, clock=time.monotonic, sleep=asyncio.sleep):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1, int(rate))
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = float(self.burst)
+        self._updated = clock()
+        self._blocked_until = 0.0
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self) -> float:
+        """Take one token and return how many seconds the caller must wait before using it."""
+        self._refill()
+        self._tokens -= 1
+        token_wait = 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+        return max(token_wait, self._blocked_until - self._updated)
+
+    async def acquire(self) -> None:
+        """Wait (queued behind earlier callers) until a request may be sent."""
+        delay = self.reserve()
+        if delay > 0:
+            await self._sleep(delay)
+
+    def penalize(self, seconds: float) -> None:
+        """Hold every acquisition until ``seconds`` from now (e.g. after an upstream 429).
+
+        Concurrent penalties do not add up: the bucket stays blocked until the
+        latest deadline any of them asked for.
+        """
+        self._blocked_until = max(self._blocked_until, self._clock() + seconds)
+
+
+def retry_after_seconds(value: str | None) -> float | None:
+    """Parse a ``Retry-After`` header (delta-seconds or HTTP-date) into seconds, or None."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=UTC)
+    return max(0.0, (when - datetime.now(UTC)).total_seconds())
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """Full-jitter exponential backoff: uniform in [0, min(cap, base * 2**attempt)]."""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
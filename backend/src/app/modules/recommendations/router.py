@@ -14,6 +14,7 @@ from app.modules.sonarr.client import SonarrClient
 from app.modules.watchlist.router import get_service
 from app.modules.watchlist.service import WatchlistService
 from app.modules.clients import get_tmdb_client
+from app.modules.library_mirror import LibraryMirror, get_library_mirror
 from . import service
 
 router = APIRouter(prefix="/api/for-you", tags=["recommendations"])
@@ -36,28 +37,35 @@ async def get_for_you(
     sonarr: SonarrClient = Depends(get_sonarr_client),
     wl: WatchlistService = Depends(get_service),
     tmdb: TMDBClient = Depends(get_tmdb_client),
+    mirror: LibraryMirror = Depends(get_library_mirror),
 ):
     """Recommend titles the user does not already own/watchlist, seeded from local data."""
     watchlist_keys = [(i.media_type, i.tmdb_id) for i in wl.get_all()]
 
     owned_keys: list[tuple[str, int]] = []
     degraded = False
-    try:
-        for m in await radarr.get_all_movies():
-            tid = m.get("tmdbId")
-            if tid:
-                owned_keys.append(("movie", tid))
-    except Exception:
-        degraded = True
-        logger.warning("Radarr library fetch failed; serving degraded recommendations")
-    try:
-        for s in await sonarr.get_all_series():
-            tid = s.get("tmdbId")
-            if tid:
-                owned_keys.append(("show", tid))
-    except Exception:
-        degraded = True
-        logger.warning("Sonarr library fetch failed; serving degraded recommendations")
+    if mirror.is_ready("radarr"):
+        owned_keys.extend(("movie", tid) for tid in mirror.tmdb_ids("movie"))
+    else:
+        try:
+            for m in await radarr.get_all_movies():
+                tid = m.get("tmdbId")
+                if tid:
+                    owned_keys.append(("movie", tid))
+        except Exception:
+            degraded = True
+            logger.warning("Radarr library fetch failed; serving degraded recommendations")
+    if mirror.is_ready("sonarr"):
+        owned_keys.extend(("show", tid) for tid in mirror.tmdb_ids("show"))
+    else:
+        try:
+            for s in await sonarr.get_all_series():
+                tid = s.get("tmdbId")
+                if tid:
+                    owned_keys.append(("show", tid))
+        except Exception:
+            degraded = True
+            logger.warning("Sonarr library fetch failed; serving degraded recommendations")
 
     seeds = service.select_seeds(watchlist_keys, owned_keys)
     exclude = service.exclusion_set(watchlist_keys, owned_keys)
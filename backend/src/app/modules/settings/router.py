@@ -4,7 +4,9 @@ from sqlalchemy.orm import Session
 import httpx
 
 from app.database import get_db
-from app.config import get_setting
+from app.config import SettingsSnapshot, get_settings_snapshot
+from app.modules.clients import invalidate_arr_metadata
+from app.modules.library_mirror import request_library_sync
 from app.modules.settings.service import SettingsService
 from app.modules.settings.schemas import (
     SettingsUpdate,
@@ -28,6 +30,10 @@ def update_settings(update: SettingsUpdate, db: Session = Depends(get_db)):
     """Update settings."""
     service = SettingsService(db)
     service.update_settings(update)
+    # Root folders/profiles may have been reconfigured alongside the *arr settings.
+    invalidate_arr_metadata()
+    # A changed *arr URL must be re-mirrored in full; don't wait for the next tick.
+    request_library_sync()
     return service.get_settings()
 
 
@@ -47,10 +53,12 @@ async def _test_arr_connection(url: str, api_key: str, service_name: str) -> Con
 
 
 @router.post("/test", response_model=ConnectionTestResponse)
-async def test_connection(request: ConnectionTestRequest, db: Session = Depends(get_db)):
+async def test_connection(
+    request: ConnectionTestRequest, app_settings: SettingsSnapshot = Depends(get_settings_snapshot)
+):
     """Test connection to a service."""
     if request.service == "tmdb":
-        api_key = get_setting("tmdb_api_key")
+        api_key = app_settings.tmdb_api_key
         if not api_key:
             return ConnectionTestResponse(success=False, message="TMDB API key not configured")
         try:
@@ -65,15 +73,15 @@ async def test_connection(request: ConnectionTestRequest, db: Session = Depends(
             return ConnectionTestResponse(success=False, message=f"Connection failed: {str(e)}")
 
     elif request.service == "radarr":
-        url = get_setting("radarr_url")
-        api_key = get_setting("radarr_api_key")
+        url = app_settings.radarr_url
+        api_key = app_settings.radarr_api_key
         if not url or not api_key:
             return ConnectionTestResponse(success=False, message="Radarr not configured")
         return await _test_arr_connection(url, api_key, "Radarr")
 
     elif request.service == "sonarr":
-        url = get_setting("sonarr_url")
-        api_key = get_setting("sonarr_api_key")
+        url = app_settings.sonarr_url
+        api_key = app_settings.sonarr_api_key
         if not url or not api_key:
             return ConnectionTestResponse(success=False, message="Sonarr not configured")
         return await _test_arr_connection(url, api_key, "Sonarr")
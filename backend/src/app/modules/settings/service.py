@@ -1,10 +1,14 @@
 """Service for managing application settings."""
+import logging
 from typing import Optional
+from cryptography.fernet import InvalidToken
 from sqlalchemy.orm import Session
+from app.config import invalidate_settings
 from app.models import Settings
 from app.modules.settings.schemas import SettingsUpdate, SettingsResponse
 from app.modules.settings.encryption import encrypt_value, decrypt_value, mask_value
 
+logger = logging.getLogger(__name__)
 
 # Keys that should be encrypted
 ENCRYPTED_KEYS = {"tmdb_api_key", "radarr_api_key", "sonarr_api_key"}
@@ -57,6 +61,7 @@ class SettingsService:
             else:
                 self._set_value(key, value)
         self.db.commit()
+        invalidate_settings()
 
     def _delete_value(self, key: str) -> None:
         """Delete a setting by key."""
@@ -73,6 +78,19 @@ class SettingsService:
             return decrypt_value(setting.value)
         return setting.value
 
+    def get_raw_values(self) -> dict[str, str]:
+        """All decrypted values for internal use; a value that fails to decrypt is skipped."""
+        values = {}
+        for setting in self.db.query(Settings).all():
+            if not setting.encrypted:
+                values[setting.key] = setting.value
+                continue
+            try:
+                values[setting.key] = decrypt_value(setting.value)
+            except InvalidToken:
+                logger.warning("Setting %s could not be decrypted; using the .env fallback", setting.key)
+        return values
+
     def _get_masked(self, settings: dict, key: str) -> Optional[str]:
         """Get masked value for display."""
         if key not in settings:
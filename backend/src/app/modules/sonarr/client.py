@@ -4,9 +4,41 @@ import asyncio
 from app.modules.arr_base import BaseArrClient
 
 
+def _library_status(series: dict) -> str:
+    """'available' once every episode is on disk, otherwise 'added'."""
+    stats = series.get("statistics", {})
+    return "available" if stats.get("percentOfEpisodes", 0) == 100 else "added"
+
+
+def _prepare_series(
+    series: dict, quality_profile_id: int, root_folder_path: str, selected_seasons: list[int] | None
+) -> dict:
+    """Turn a lookup result into an add payload, monitoring only ``selected_seasons`` if given."""
+    if selected_seasons is not None and "seasons" in series:
+        for season in series["seasons"]:
+            season_num = season.get("seasonNumber", 0)
+            if season_num == 0:
+                season["monitored"] = False
+            else:
+                season["monitored"] = season_num in selected_seasons
+
+    series["qualityProfileId"] = quality_profile_id
+    series["rootFolderPath"] = root_folder_path
+    series["monitored"] = True
+    series["seasonFolder"] = True
+    series["addOptions"] = {"searchForMissingEpisodes": True}
+    series.pop("path", None)
+    return series
+
+
 class SonarrClient(BaseArrClient):
     """Client for Sonarr API."""
 
+    service_name = "Sonarr"
+    library_endpoint = "/series"
+    history_item_field = "seriesId"
+    queue_embeds = ("includeSeries", "includeEpisode")
+
     async def get_series_by_tvdb_id(self, tvdb_id: int) -> dict | None:
         """Get series from library by TVDB ID."""
         series_list = await self._get("/series", {"tvdbId": tvdb_id})
@@ -17,10 +49,6 @@ class SonarrClient(BaseArrClient):
         results = await self._get("/series/lookup", {"term": f"tmdb:{tmdb_id}"})
         return results[0] if results else None
 
-    async def get_quality_profiles(self) -> list:
-        """Get available quality profiles."""
-        return await self._get("/qualityprofile")
-
     async def add_series(
         self,
         tmdb_id: int,
@@ -38,34 +66,57 @@ class SonarrClient(BaseArrClient):
         if not series:
             raise ValueError(f"Series not found: {tmdb_id}")
 
-        if not root_folder_path:
-            folders = await self._get("/rootfolder")
-            if not folders:
-                raise ValueError("No root folders configured in Sonarr")
-            root_folder_path = folders[0]["path"]
-
-        if not quality_profile_id:
-            profiles = await self.get_quality_profiles()
-            if not profiles:
-                raise ValueError("No quality profiles configured in Sonarr")
-            quality_profile_id = profiles[0]["id"]
-
-        if selected_seasons is not None and "seasons" in series:
-            for season in series["seasons"]:
-                season_num = season.get("seasonNumber", 0)
-                if season_num == 0:
-                    season["monitored"] = False
-                else:
-                    season["monitored"] = season_num in selected_seasons
-
-        series["qualityProfileId"] = quality_profile_id
-        series["rootFolderPath"] = root_folder_path
-        series["monitored"] = True
-        series["seasonFolder"] = True
-        series["addOptions"] = {"searchForMissingEpisodes": True}
-        series.pop("path", None)
-
-        return await self._post("/series", series)
+        quality_profile_id, root_folder_path = await self._add_defaults(quality_profile_id, root_folder_path)
+        return await self._post(
+            "/series", _prepare_series(series, quality_profile_id, root_folder_path, selected_seasons)
+        )
+
+    async def add_series_many(
+        self,
+        items: dict[int, list[int] | None],
+        quality_profile_id: int | None = None,
+        root_folder_path: str | None = None,
+    ) -> tuple[list[int], dict[int, str]]:
+        """Add many series through ``/series/import``. Returns (added ids, {id: error}).
+
+        ``items`` maps tmdb id -> selected seasons (None for all). Existing series are
+        found in one library snapshot, by tmdbId before any lookup and otherwise by the
+        lookup's tvdbId; lookups run with bounded concurrency and the adds go out in chunks.
+        """
+        quality_profile_id, root_folder_path = await self._add_defaults(quality_profile_id, root_folder_path)
+        self.invalidate_library()  # dedupe against a fresh listing, not one up to ARR_LIBRARY_TTL old
+        library = await self.get_library()
+        by_tmdb = {s["tmdbId"]: s for s in library if s.get("tmdbId")}
+        by_tvdb = {s["tvdbId"]: s for s in library if s.get("tvdbId")}
+
+        failed: dict[int, str] = {}
+        wanted = []
+        for tmdb_id in items:
+            if tmdb_id in by_tmdb:
+                title = by_tmdb[tmdb_id].get("title", tmdb_id)
+                failed[tmdb_id] = f"Series already in Sonarr library: {title}"
+            else:
+                wanted.append(tmdb_id)
+
+        prepared = []
+        for tmdb_id, series in (await self._lookup_many(self.lookup_series, wanted)).items():
+            if isinstance(series, Exception):
+                failed[tmdb_id] = str(series)
+                continue
+            existing = series and by_tvdb.get(series.get("tvdbId"))
+            if existing:
+                failed[tmdb_id] = f"Series already in Sonarr library: {existing.get('title', tmdb_id)}"
+            elif not series:
+                failed[tmdb_id] = f"Series not found: {tmdb_id}"
+            else:
+                prepared.append((
+                    tmdb_id,
+                    _prepare_series(series, quality_profile_id, root_folder_path, items[tmdb_id]),
+                ))
+
+        added, import_failed = await self._import("/series/import", "/series", prepared)
+        failed.update(import_failed)
+        return added, failed
 
     async def get_status(self, tmdb_id: int) -> str:
         """Get series status: 'available', 'added', or 'not_found'."""
@@ -83,22 +134,35 @@ class SonarrClient(BaseArrClient):
         return "added"
 
     async def get_all_series(self) -> list[dict]:
-        """Get all series in library."""
-        return await self._get("/series")
+        """Get all series in library (TTL snapshot; do not mutate)."""
+        return await self.get_library()
 
     async def get_batch_status(self, tmdb_ids: list[int]) -> dict[int, str | None]:
-        """Get status for multiple series efficiently."""
+        """Get status for multiple series efficiently.
+
+        Sonarr v4 series records carry ``tmdbId``, so ids are resolved from the library
+        snapshot alone. ``lookup_series`` (a ~1s proxy to Sonarr's metadata service) is
+        only used for unresolved ids, and only when some library series lack a ``tmdbId``
+        (older Sonarr or unmatched series); otherwise an unresolved id is simply absent.
+        """
         all_series = await self.get_all_series()
 
-        tvdb_to_status = {}
+        tmdb_to_status: dict[int, str] = {}
+        tvdb_to_status: dict[int, str] = {}
+        missing_tmdb_ids = False
         for series in all_series:
-            tvdb_id = series.get("tvdbId")
-            if tvdb_id:
-                stats = series.get("statistics", {})
-                if stats.get("percentOfEpisodes", 0) == 100:
-                    tvdb_to_status[tvdb_id] = "available"
-                else:
-                    tvdb_to_status[tvdb_id] = "added"
+            status = _library_status(series)
+            if series.get("tmdbId"):
+                tmdb_to_status[series["tmdbId"]] = status
+            else:
+                missing_tmdb_ids = True
+            if series.get("tvdbId"):
+                tvdb_to_status[series["tvdbId"]] = status
+
+        statuses: dict[int, str | None] = {tid: tmdb_to_status.get(tid) for tid in tmdb_ids}
+        unresolved = [tid for tid, status in statuses.items() if status is None]
+        if not missing_tmdb_ids or not unresolved:
+            return statuses
 
         async def lookup_single(tmdb_id: int) -> tuple[int, str | None]:
             series = await self.lookup_series(tmdb_id)
@@ -108,22 +172,13 @@ class SonarrClient(BaseArrClient):
                     return (tmdb_id, tvdb_to_status[tvdb_id])
             return (tmdb_id, None)
 
-        lookups = await asyncio.gather(*[lookup_single(tid) for tid in tmdb_ids])
-        return dict(lookups)
-
-    async def get_queue(self) -> dict:
-        """Get current download queue from Sonarr."""
-        return await self._get("/queue", {
-            "page": 1,
-            "pageSize": 50,
-            "includeSeries": True,
-            "includeEpisode": True,
-        })
+        lookups = await asyncio.gather(*[lookup_single(tid) for tid in unresolved])
+        statuses.update(lookups)
+        return statuses
 
     async def get_recent(self, limit: int = 20) -> list:
         """Get recently added shows from Sonarr."""
-        shows = await self._get("/series")
-        shows.sort(key=lambda s: s.get("added", ""), reverse=True)
+        shows = sorted(await self.get_library(), key=lambda s: s.get("added", ""), reverse=True)
         return shows[:limit]
 
     async def get_series_details(self, tmdb_id: int) -> dict | None:
@@ -1,8 +1,11 @@
 """Sonarr API routes."""
+import asyncio
+
 from fastapi import APIRouter, Depends, HTTPException, Path, Query
 from httpx import HTTPStatusError, TimeoutException
 
 from app.modules.clients import get_sonarr_client
+from app.modules.library_mirror import LibraryMirror, get_library_mirror, lookup_quietly
 from app.schemas import AddMediaRequest, AddMediaResponse, LibraryStatusResponse, BatchStatusRequest, BatchStatusResponse
 from .client import SonarrClient
 
@@ -14,8 +17,29 @@ router = APIRouter(prefix="/api/sonarr", tags=["sonarr"])
 async def get_series_status(
     tmdb_id: int = Path(gt=0, description="TMDB series ID"),
     client: SonarrClient = Depends(get_sonarr_client),
+    mirror: LibraryMirror = Depends(get_library_mirror),
 ):
-    """Check if series is in Sonarr library."""
+    """Check if series is in Sonarr library (from the local mirror once it has synced)."""
+    if mirror.is_ready("sonarr"):
+        row = mirror.get("show", tmdb_id)
+        if row is not None:
+            return LibraryStatusResponse(
+                tmdb_id=tmdb_id, media_type="show", status=row.status, title=row.title
+            )
+        # Not matched by tmdbId: a lookup gives the title, and a tvdbId for unmatched series.
+        title = mirror.watchlist_title("show", tmdb_id)
+        if title is None or mirror.has_unmatched("show"):
+            series = await lookup_quietly(client.lookup_series, tmdb_id)
+            if series:
+                title = title or series.get("title")
+                if series.get("tvdbId"):
+                    row = mirror.get_by_tvdb_id(series["tvdbId"])
+        return LibraryStatusResponse(
+            tmdb_id=tmdb_id,
+            media_type="show",
+            status=row.status if row else "not_found",
+            title=row.title if row else title,
+        )
     status = await client.get_status(tmdb_id)
     series = await client.lookup_series(tmdb_id)
     return LibraryStatusResponse(
@@ -28,7 +52,9 @@ async def get_series_status(
 
 @router.post("/add", response_model=AddMediaResponse)
 async def add_series(
-    data: AddMediaRequest, client: SonarrClient = Depends(get_sonarr_client)
+    data: AddMediaRequest,
+    client: SonarrClient = Depends(get_sonarr_client),
+    mirror: LibraryMirror = Depends(get_library_mirror),
 ):
     """Add series to Sonarr."""
     try:
@@ -36,6 +62,7 @@ async def add_series(
             tmdb_id=data.tmdb_id,
             quality_profile_id=data.quality_profile_id,
         )
+        mirror.record_added("sonarr", result)
         return AddMediaResponse(
             success=True,
             message=f"Added {result.get('title', 'series')} to Sonarr",
@@ -51,11 +78,37 @@ async def add_series(
         )
 
 
+async def _match_by_tvdb_id(
+    client: SonarrClient, mirror: LibraryMirror, tmdb_ids: list[int]
+) -> dict[int, str]:
+    """Statuses of mirrored series without a tmdbId, matched through a lookup's tvdbId.
+
+    Same fallback as ``SonarrClient.get_batch_status``, only used while the mirror
+    holds such series.
+    """
+    found = await asyncio.gather(*[lookup_quietly(client.lookup_series, tid) for tid in tmdb_ids])
+    tvdb_ids = {
+        tmdb_id: series["tvdbId"]
+        for tmdb_id, series in zip(tmdb_ids, found)
+        if series and series.get("tvdbId")
+    }
+    by_tvdb = mirror.statuses_by_tvdb_id(list(tvdb_ids.values()))
+    return {tmdb_id: by_tvdb[tvdb] for tmdb_id, tvdb in tvdb_ids.items() if tvdb in by_tvdb}
+
+
 @router.post("/status/batch", response_model=BatchStatusResponse)
 async def get_batch_status(
-    data: BatchStatusRequest, client: SonarrClient = Depends(get_sonarr_client)
+    data: BatchStatusRequest,
+    client: SonarrClient = Depends(get_sonarr_client),
+    mirror: LibraryMirror = Depends(get_library_mirror),
 ):
     """Get library status for multiple series at once."""
+    if mirror.is_ready("sonarr"):
+        statuses = mirror.statuses("show", data.tmdb_ids)
+        unresolved = [tmdb_id for tmdb_id, status in statuses.items() if status is None]
+        if unresolved and mirror.has_unmatched("show"):
+            statuses.update(await _match_by_tvdb_id(client, mirror, unresolved))
+        return BatchStatusResponse(statuses=statuses)
     try:
         statuses = await client.get_batch_status(data.tmdb_ids)
         return BatchStatusResponse(statuses=statuses)
@@ -94,15 +147,21 @@ async def get_sonarr_quality_profiles(client: SonarrClient = Depends(get_sonarr_
 
 
 @router.get("/queue")
-async def get_sonarr_queue(client: SonarrClient = Depends(get_sonarr_client)):
-    """Get current download queue from Sonarr."""
-    return await client.get_queue()
+async def get_sonarr_queue(
+    slim: bool = Query(False, description="Omit the embedded series/episode records"),
+    client: SonarrClient = Depends(get_sonarr_client),
+):
+    """Get the full download queue from Sonarr (all pages)."""
+    return await client.get_queue(slim=slim)
 
 
 @router.get("/recent")
 async def get_sonarr_recent(
     limit: int = Query(20, le=100),
-    client: SonarrClient = Depends(get_sonarr_client)
+    client: SonarrClient = Depends(get_sonarr_client),
+    mirror: LibraryMirror = Depends(get_library_mirror),
 ):
     """Get recently added shows from Sonarr."""
+    if mirror.is_ready("sonarr"):
+        return mirror.recent("show", limit)
     return await client.get_recent(limit)
@@ -0,0 +1,299 @@
+"""Durable background jobs for sending watchlist batches to Radarr/Sonarr.
+
+``POST /api/watchlist/jobs`` stores the batch in ``process_jobs`` /
+``process_job_items`` and returns at once; a pool of ``JOB_WORKERS`` workers
+(started from the app lifespan by ``run_job_workers``) claims queued jobs oldest
+first, with at most ``JOB_UPSTREAM_CONCURRENCY`` jobs per *arr at a time, and
+runs their pending items through ``WatchlistService.process_batch`` in chunks of
+``JOB_CHUNK_SIZE``, committing each item's outcome as its chunk finishes.
+
+Because progress is in SQLite, a restart loses at most the chunk in flight: jobs
+left ``running`` are re-queued when the workers start and only their still
+``pending`` items are processed again.
+"""
+import asyncio
+import json
+import logging
+from collections.abc import AsyncIterator
+from contextlib import suppress
+from datetime import UTC, datetime
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session, selectinload
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models import ProcessJob, ProcessJobItem
+
+from .service import WatchlistService
+
+logger = logging.getLogger(__name__)
+
+# Items handed to process_batch at once (each chunk's results are committed together).
+JOB_CHUNK_SIZE = 25
+# Seconds idle workers wait before looking for queued jobs again without a wake-up.
+JOB_POLL_INTERVAL = 30.0
+# Seconds between progress checks for GET /api/watchlist/jobs/{id}/stream.
+JOB_STREAM_INTERVAL = 1.0
+# Seconds a worker backs off after failing to claim a job (e.g. "database is locked").
+JOB_CLAIM_RETRY_DELAY = 5.0
+
+# Set by request_job_processing() to wake idle workers, on the loop the workers run in.
+_jobs_requested: asyncio.Event | None = None
+_jobs_loop: asyncio.AbstractEventLoop | None = None
+
+
+def _utcnow_naive() -> datetime:
+    return datetime.now(UTC).replace(tzinfo=None)
+
+
+def create_job(db: Session, tmdb_ids: list[int], media_type: str) -> ProcessJob:
+    """Queue a batch (duplicate ids collapsed) and wake the workers. Commits."""
+    job = ProcessJob(
+        media_type=media_type,
+        items=[ProcessJobItem(tmdb_id=tmdb_id, position=i) for i, tmdb_id in enumerate(dict.fromkeys(tmdb_ids))],
+    )
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    request_job_processing()
+    return job
+
+
+def get_job(db: Session, job_id: int) -> ProcessJob | None:
+    return db.execute(
+        select(ProcessJob).where(ProcessJob.id == job_id).options(selectinload(ProcessJob.items))
+    ).scalar_one_or_none()
+
+
+def job_progress(job: ProcessJob) -> dict:
+    """Job state with per-item outcomes, as served by the jobs API."""
+    counts = {"pending": 0, "added": 0, "failed": 0}
+    for item in job.items:
+        counts[item.status] = counts.get(item.status, 0) + 1
+    return {
+        "id": job.id,
+        "media_type": job.media_type,
+        "status": job.status,
+        "total": len(job.items),
+        "pending": counts["pending"],
+        "processed": counts["added"],
+        "failed": counts["failed"],
+        "created_at": job.created_at,
+        "finished_at": job.finished_at,
+        "items": [{"tmdb_id": i.tmdb_id, "status": i.status, "error": i.error} for i in job.items],
+    }
+
+
+async def stream_job(
+    job_id: int, session_factory=SessionLocal, interval: float = JOB_STREAM_INTERVAL
+) -> AsyncIterator[str]:
+    """SSE body: a ``progress`` event whenever the job changes, ending once it is done."""
+    last = None
+    while True:
+        db = session_factory()
+        try:
+            job = get_job(db, job_id)
+            progress = job_progress(job) if job is not None else None
+        finally:
+            db.close()
+        if progress is None:
+            return
+        data = json.dumps(progress, default=str, separators=(",", ":"))
+        if data != last:
+            last = data
+            yield f"event: progress\ndata: {data}\n\n"
+        if progress["status"] == "done":
+            return
+        await asyncio.sleep(interval)
+
+
+def requeue_interrupted_jobs(db: Session) -> int:
+    """Put jobs left ``running`` by a previous process back in the queue. Commits."""
+    result = db.execute(
+        update(ProcessJob).where(ProcessJob.status == "running").values(status="queued", started_at=None)
+    )
+    db.commit()
+    return result.rowcount
+
+
+def claim_next_job(db: Session, media_types: list[str]) -> int | None:
+    """Mark the oldest queued job for one of ``media_types`` running; returns its id. Commits."""
+    if not media_types:
+        return None
+    job = db.execute(
+        select(ProcessJob)
+        .where(ProcessJob.status == "queued", ProcessJob.media_type.in_(media_types))
+        .order_by(ProcessJob.id)
+        .limit(1)
+    ).scalar_one_or_none()
+    if job is None:
+        return None
+    job.status = "running"
+    job.started_at = _utcnow_naive()
+    db.commit()
+    return job.id
+
+
+async def run_job(job_id: int, session_factory=SessionLocal) -> None:
+    """Process a claimed job's pending items chunk by chunk, then mark it done."""
+    db = session_factory()
+    try:
+        job = get_job(db, job_id)
+        if job is None:
+            return
+        service = WatchlistService(db)
+        while True:
+            pending = [item for item in job.items if item.status == "pending"][:JOB_CHUNK_SIZE]
+            if not pending:
+                break
+            try:
+                _processed, failed = await service.process_batch([i.tmdb_id for i in pending], job.media_type)
+            except Exception as exc:  # noqa: BLE001 - a failed chunk must not strand its items
+                logger.warning("Job %s chunk failed: %s", job_id, exc)
+                failed = [{"tmdb_id": i.tmdb_id, "error": str(exc)} for i in pending]
+            errors = {f["tmdb_id"]: f["error"] for f in failed}
+            for item in pending:
+                if item.tmdb_id in errors:
+                    item.status, item.error = "failed", errors[item.tmdb_id]
+                else:
+                    item.status = "added"
+            db.commit()
+        job.status = "done"
+        job.finished_at = _utcnow_naive()
+        db.commit()
+    except Exception as exc:
+        logger.exception("Watchlist job %s failed", job_id)
+        db.rollback()
+        _fail_job(job_id, session_factory, f"Job failed: {exc}")
+    finally:
+        db.close()
+
+
+def _fail_job(job_id: int, session_factory, error: str) -> None:
+    """Mark a job's still-pending items failed and the job done, in a fresh session.
+
+    Used when ``run_job`` itself breaks (not a chunk), so the job never stays
+    ``running`` and ``stream_job`` / the frontend stop following it.
+    """
+    db = session_factory()
+    try:
+        job = get_job(db, job_id)
+        if job is None:
+            return
+        for item in job.items:
+            if item.status == "pending":
+                item.status, item.error = "failed", error
+        job.status = "done"
+        job.finished_at = _utcnow_naive()
+        db.commit()
+    except Exception:
+        logger.exception("Could not mark watchlist job %s failed", job_id)
+    finally:
+        db.close()
+
+
+def _requeue_job(job_id: int, session_factory) -> None:
+    """Put a claimed job back in the queue, in a fresh session."""
+    db = session_factory()
+    try:
+        db.execute(update(ProcessJob).where(ProcessJob.id == job_id).values(status="queued", started_at=None))
+        db.commit()
+    except Exception:
+        logger.exception("Could not re-queue watchlist job %s", job_id)
+    finally:
+        db.close()
+
+
+class _UpstreamSlots:
+    """Running-job counts per media type, capped at ``limit`` each."""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.running = {"movie": 0, "show": 0}
+
+    def free(self) -> list[str]:
+        return [media_type for media_type, count in self.running.items() if count < self.limit]
+
+
+async def _worker(slots: _UpstreamSlots, claim_lock: asyncio.Lock, session_factory) -> None:
+    while True:
+        claim_failed = False
+        async with claim_lock:
+            # Cleared before looking, so a wake-up sent while we look is not lost.
+            _jobs_requested.clear()
+            job_id = None
+            db = session_factory()
+            try:
+                job_id = claim_next_job(db, slots.free())
+                media_type = db.get(ProcessJob, job_id).media_type if job_id is not None else None
+            except Exception:
+                # Keep the worker alive; a dead worker would silently shrink the pool.
+                logger.exception("Claiming a watchlist job failed; retrying in %.0fs", JOB_CLAIM_RETRY_DELAY)
+                if job_id is not None:
+                    _requeue_job(job_id, session_factory)
+                job_id, claim_failed = None, True
+            finally:
+                db.close()
+            if job_id is not None:
+                slots.running[media_type] += 1
+        if claim_failed:
+            await asyncio.sleep(JOB_CLAIM_RETRY_DELAY)
+            continue
+        if job_id is None:
+            with suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(_jobs_requested.wait(), JOB_POLL_INTERVAL)
+            continue
+        try:
+            await run_job(job_id, session_factory)
+        except Exception:
+            logger.exception("Watchlist job %s failed", job_id)
+        finally:
+            slots.running[media_type] -= 1
+            # A slot opened up: let idle workers look at the queue again.
+            request_job_processing()
+
+
+def request_job_processing() -> None:
+    """Wake idle workers (a job was queued or a per-*arr slot freed up).
+
+    Safe to call from any thread: sync routes run in the threadpool, and an
+    ``asyncio.Event`` may only be set from its own loop.
+    """
+    event, loop = _jobs_requested, _jobs_loop
+    if event is None or loop is None or loop.is_closed():
+        return
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if running is loop:
+        event.set()
+    else:
+        loop.call_soon_threadsafe(event.set)
+
+
+async def run_job_workers(
+    workers: int | None = None, upstream_concurrency: int | None = None, session_factory=SessionLocal
+) -> None:
+    """Background pool started from the app lifespan; runs until cancelled at shutdown."""
+    global _jobs_requested, _jobs_loop
+    workers = settings.job_workers if workers is None else workers
+    limit = settings.job_upstream_concurrency if upstream_concurrency is None else upstream_concurrency
+    _jobs_requested = asyncio.Event()
+    _jobs_loop = asyncio.get_running_loop()
+
+    resumed = 0
+    db = session_factory()
+    try:
+        resumed = requeue_interrupted_jobs(db)
+    except Exception:
+        logger.exception("Could not re-queue interrupted watchlist jobs")
+    finally:
+        db.close()
+    if resumed:
+        logger.info("Resuming %d interrupted watchlist jobs", resumed)
+
+    slots = _UpstreamSlots(limit)
+    claim_lock = asyncio.Lock()
+    await asyncio.gather(*[_worker(slots, claim_lock, session_factory) for _ in range(max(workers, 1))])
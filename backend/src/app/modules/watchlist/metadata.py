@@ -0,0 +1,116 @@
+"""Denormalized TMDB metadata on watchlist rows.
+
+Title/poster/overview/release date/season count are copied onto the ``Watchlist``
+row when an item is added, so listing the watchlist is a single SQL query with no
+TMDB calls in steady state. ``run_metadata_refresher`` keeps the copies current
+in the background; rows that were never enriched are filled on first read.
+"""
+import asyncio
+import logging
+from datetime import UTC, datetime, timedelta
+
+from app.database import SessionLocal
+from app.models import Watchlist
+from app.modules.clients import get_tmdb_client
+from app.modules.discovery.tmdb_client import TMDBAPIError, TMDBClient
+
+logger = logging.getLogger(__name__)
+
+# Max concurrent TMDB detail lookups while enriching rows.
+ENRICH_CONCURRENCY = 8
+# Background refresher cadence, staleness threshold and rows per pass.
+REFRESH_INTERVAL = 3600
+METADATA_MAX_AGE = timedelta(hours=24)
+REFRESH_BATCH = 200
+
+
+def _utcnow_naive() -> datetime:
+    return datetime.now(UTC).replace(tzinfo=None)
+
+
+def tmdb_media_type(media_type: str) -> str:
+    """Watchlist media_type -> TMDB path segment ("show" -> "tv")."""
+    return "tv" if media_type == "show" else media_type
+
+
+def metadata_from_details(media_type: str, details: dict | None) -> dict:
+    """Map a TMDB detail payload onto the Watchlist metadata columns (None -> all NULL)."""
+    details = details or {}
+    return {
+        "title": details.get("title") or details.get("name"),
+        "overview": details.get("overview"),
+        "poster_path": details.get("poster_path"),
+        "release_date": details.get("release_date") or details.get("first_air_date"),
+        "vote_average": details.get("vote_average"),
+        "total_seasons": details.get("number_of_seasons") if tmdb_media_type(media_type) == "tv" else None,
+    }
+
+
+def apply_metadata(item: Watchlist, details: dict | None, now: datetime | None = None) -> None:
+    """Copy TMDB metadata onto a row and stamp it fresh (caller commits)."""
+    for column, value in metadata_from_details(item.media_type, details).items():
+        setattr(item, column, value)
+    item.metadata_updated_at = now or _utcnow_naive()
+
+
+async def fetch_metadata(
+    items: list[Watchlist], tmdb: TMDBClient
+) -> tuple[list[tuple[Watchlist, dict | None]], set[int]]:
+    """Look up TMDB details for ``items`` with bounded concurrency.
+
+    Returns ``(resolved, failed_ids)``: ``resolved`` pairs each row with its details, or
+    with None on a genuine 404 (stored as a placeholder); ``failed_ids`` holds the row ids
+    whose lookup failed for any other reason and should be retried later.
+    """
+    keys = [(item.tmdb_id, tmdb_media_type(item.media_type)) for item in items]
+    fetched: dict[tuple[int, str], tuple[dict | None, Exception | None]] = {}
+    async for key, details, error in tmdb.get_details_many(keys, concurrency=ENRICH_CONCURRENCY):
+        fetched[key] = (details, error)
+
+    resolved: list[tuple[Watchlist, dict | None]] = []
+    failed: set[int] = set()
+    for item, key in zip(items, keys):
+        details, error = fetched[key]
+        if error is None or (isinstance(error, TMDBAPIError) and error.status_code == 404):
+            resolved.append((item, details))
+        else:
+            failed.add(item.id)
+    return resolved, failed
+
+
+async def refresh_stale_metadata(db, tmdb: TMDBClient, limit: int = REFRESH_BATCH) -> int:
+    """Refresh up to ``limit`` rows that were never enriched or are older than METADATA_MAX_AGE.
+
+    Returns the number of rows updated. Failed lookups leave the row untouched.
+    """
+    cutoff = _utcnow_naive() - METADATA_MAX_AGE
+    stale = (
+        db.query(Watchlist)
+        .filter((Watchlist.metadata_updated_at.is_(None)) | (Watchlist.metadata_updated_at < cutoff))
+        .order_by(Watchlist.metadata_updated_at)
+        .limit(limit)
+        .all()
+    )
+    if not stale:
+        return 0
+    resolved, _failed = await fetch_metadata(stale, tmdb)
+    now = _utcnow_naive()
+    for item, details in resolved:
+        apply_metadata(item, details, now)
+    db.commit()
+    return len(resolved)
+
+
+async def run_metadata_refresher(interval: float = REFRESH_INTERVAL) -> None:
+    """Background loop started from the app lifespan; runs until cancelled at shutdown."""
+    while True:
+        db = SessionLocal()
+        try:
+            updated = await refresh_stale_metadata(db, get_tmdb_client())
+            if updated:
+                logger.info("Refreshed TMDB metadata for %d watchlist rows", updated)
+        except Exception:
+            logger.exception("Watchlist metadata refresh failed")
+        finally:
+            db.close()
+        await asyncio.sleep(interval)
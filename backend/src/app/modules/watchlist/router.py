@@ -1,17 +1,27 @@
 """Watchlist API routes."""
-import asyncio
 import json
+import logging
 from typing import Literal
-from fastapi import APIRouter, Depends, HTTPException, Response
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
 
+from app.config import SettingsSnapshot, get_settings_snapshot
 from app.database import get_db
 from app.schemas import WatchlistAdd, WatchlistItem, WatchlistResponse
-from app.modules.discovery.tmdb_client import TMDBClient, TMDBClientError, TMDBAPIError
 from app.modules.clients import get_tmdb_client
-from .service import WatchlistService
-from .schemas import BatchProcessRequest, BatchProcessResponse, BatchDeleteRequest
+from .jobs import create_job, get_job, job_progress, stream_job
+from .metadata import fetch_metadata
+from .service import WatchlistService, encode_cursor
+from .schemas import (
+    BatchProcessRequest,
+    BatchProcessResponse,
+    BatchDeleteRequest,
+    ProcessJobResponse,
+    TagFacet,
+    TagFacetsResponse,
+)
 
 
 class UpdateSeasonsRequest(BaseModel):
@@ -23,6 +33,8 @@ class UpdateDetailsRequest(BaseModel):
     notes: str | None = None
     tags: list[str] | None = None
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(prefix="/api/watchlist", tags=["watchlist"])
 
 
@@ -41,79 +53,93 @@ def _parse_seasons(raw: str | None) -> list[int] | None:
         return None
 
 
-def _parse_tags(raw: str | None) -> list[str]:
-    """Parse JSON-encoded tags string, returning [] on null/garbage."""
-    if not raw:
-        return []
-    try:
-        result = json.loads(raw)
-        return result if isinstance(result, list) else []
-    except json.JSONDecodeError:
-        return []
+def _build_watchlist_item(item, degraded: bool = False) -> WatchlistItem:
+    """Build the API item from a watchlist row and its denormalized TMDB metadata."""
+    return WatchlistItem(
+        id=item.id,
+        tmdb_id=item.tmdb_id,
+        media_type=item.media_type,
+        title=item.title or f"TMDB:{item.tmdb_id}",
+        overview=item.overview,
+        poster_path=item.poster_path,
+        release_date=item.release_date,
+        vote_average=item.vote_average,
+        added_at=item.added_at,
+        notes=item.notes,
+        status=item.status,
+        selected_seasons=_parse_seasons(item.selected_seasons),
+        total_seasons=item.total_seasons,
+        priority=item.priority,
+        tags=item.tag_list,
+        degraded=degraded,
+    )
 
 
-async def _enrich_watchlist_item(item, tmdb: TMDBClient) -> WatchlistItem:
-    """Enrich a watchlist DB row with TMDB metadata."""
-    selected_seasons = _parse_seasons(item.selected_seasons)
+async def _fill_missing_metadata(service: WatchlistService, items: list) -> set[int]:
+    """Fetch and store TMDB metadata for rows never enriched. Returns ids whose lookup failed."""
+    missing = [item for item in items if item.metadata_updated_at is None]
+    if not missing:
+        return set()
+    resolved, failed = await fetch_metadata(missing, get_tmdb_client())
+    if resolved:
+        service.store_metadata(resolved)
+    return failed
 
-    try:
-        tmdb_type = "tv" if item.media_type == "show" else item.media_type
-        details = await tmdb.get_details(item.tmdb_id, tmdb_type)
-
-        total_seasons = None
-        if item.media_type == "show":
-            total_seasons = details.get("number_of_seasons")
-
-        return WatchlistItem(
-            id=item.id,
-            tmdb_id=item.tmdb_id,
-            media_type=item.media_type,
-            title=details.get("title") or details.get("name") or f"TMDB:{item.tmdb_id}",
-            overview=details.get("overview"),
-            poster_path=details.get("poster_path"),
-            release_date=details.get("release_date") or details.get("first_air_date"),
-            vote_average=details.get("vote_average"),
-            added_at=item.added_at,
-            notes=item.notes,
-            status=item.status,
-            selected_seasons=selected_seasons,
-            total_seasons=total_seasons,
-            priority=item.priority,
-            tags=_parse_tags(item.tags),
-        )
-    except TMDBAPIError as e:
-        if e.status_code != 404:
-            raise
-        return WatchlistItem(
-            id=item.id,
-            tmdb_id=item.tmdb_id,
-            media_type=item.media_type,
-            title=f"TMDB:{item.tmdb_id}",
-            added_at=item.added_at,
-            notes=item.notes,
-            status=item.status,
-            selected_seasons=selected_seasons,
-            total_seasons=None,
-            priority=item.priority,
-            tags=_parse_tags(item.tags),
-        )
 
+async def _enrich_watchlist_item(service: WatchlistService, item) -> WatchlistItem:
+    """Single-row variant: enrich if needed; a TMDB outage surfaces as 502."""
+    if await _fill_missing_metadata(service, [item]):
+        raise HTTPException(status_code=502, detail="TMDB unavailable")
+    return _build_watchlist_item(item)
 
-@router.get("", response_model=WatchlistResponse)
-async def get_watchlist(service: WatchlistService = Depends(get_service)):
-    """Get all watchlist items with enriched metadata from TMDB."""
-    items = service.get_all()
-
-    if not items:
-        return WatchlistResponse(items=[], total=0)
 
-    tmdb = get_tmdb_client()
+@router.get("", response_model=WatchlistResponse)
+async def get_watchlist(
+    limit: int | None = Query(None, ge=1, le=200),
+    cursor: str | None = Query(None),
+    sort: Literal["added", "title", "rating", "release", "priority"] = Query("added"),
+    dir: Literal["asc", "desc"] = Query("desc"),
+    media_type: Literal["movie", "show"] | None = Query(None),
+    status: Literal["pending", "added", "downloading"] | None = Query(None),
+    priority: int | None = Query(None, ge=-1, le=1),
+    tag: str | None = Query(None),
+    service: WatchlistService = Depends(get_service),
+):
+    """Get a filtered, sorted page of the watchlist with its stored TMDB metadata.
+
+    Filtering, sorting and keyset pagination run in SQL; ``total`` counts every matching
+    row and ``next_cursor`` fetches the following page. Without ``limit`` the whole
+    filtered list is returned. Only the returned rows are enriched: rows never enriched
+    are fetched with bounded concurrency and stored, and a row whose lookup fails (other
+    than a 404) is served as a placeholder marked ``degraded``.
+    """
     try:
-        enriched_items = await asyncio.gather(*[_enrich_watchlist_item(item, tmdb) for item in items])
-    except TMDBClientError:
-        raise HTTPException(status_code=502, detail="TMDB unavailable")
+        items, total, has_more = service.list_page(
+            limit=limit, cursor=cursor, sort=sort, direction=dir,
+            media_type=media_type, status=status, priority=priority, tag=tag,
+        )
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
 
-    return WatchlistResponse(items=list(enriched_items), total=len(enriched_items))
+    if not items:
+        return WatchlistResponse(items=[], total=total)
+
+    failed: set[int] = set()
+    if any(item.metadata_updated_at is None for item in items):
+        failed = await _fill_missing_metadata(service, items)
+        service.reload(items)
+
+    degraded: list[str] = []
+    if failed:
+        logger.warning("TMDB enrichment failed for %d watchlist rows; serving placeholders", len(failed))
+        degraded.append("tmdb")
+    enriched = [_build_watchlist_item(item, degraded=item.id in failed) for item in items]
+    return WatchlistResponse(
+        items=enriched,
+        total=total,
+        next_cursor=encode_cursor(sort, items[-1]) if has_more else None,
+        degraded=degraded,
+    )
 
 
 @router.post("", response_model=WatchlistItem, status_code=201)
@@ -131,23 +157,61 @@ async def add_to_watchlist(
     if not created:
         response.status_code = 200
 
-    tmdb = get_tmdb_client()
-    try:
-        return await _enrich_watchlist_item(item, tmdb)
-    except TMDBClientError:
-        raise HTTPException(status_code=502, detail="TMDB unavailable")
+    return await _enrich_watchlist_item(service, item)
 
 
 # Batch endpoints must come BEFORE parameterized endpoints
 @router.post("/process", response_model=BatchProcessResponse)
 async def process_watchlist_items(
-    request: BatchProcessRequest, service: WatchlistService = Depends(get_service)
+    request: BatchProcessRequest,
+    service: WatchlistService = Depends(get_service),
+    app_settings: SettingsSnapshot = Depends(get_settings_snapshot),
 ):
     """Process watchlist items by sending to Radarr/Sonarr."""
-    processed, failed = await service.process_batch(request.ids, request.media_type)
+    processed, failed = await service.process_batch(request.ids, request.media_type, app_settings)
     return BatchProcessResponse(processed=processed, failed=failed)
 
 
+@router.post("/jobs", response_model=ProcessJobResponse, status_code=202)
+def create_process_job(request: BatchProcessRequest, db: Session = Depends(get_db)):
+    """Queue items for Radarr/Sonarr and return the job at once; poll or stream its progress."""
+    job = create_job(db, request.ids, request.media_type)
+    return job_progress(get_job(db, job.id))
+
+
+@router.get("/jobs/{job_id}", response_model=ProcessJobResponse)
+def get_process_job(job_id: int, db: Session = Depends(get_db)):
+    """Current state of a processing job, with per-item outcomes."""
+    job = get_job(db, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job_progress(job)
+
+
+@router.get("/jobs/{job_id}/stream")
+def stream_process_job(job_id: int, db: Session = Depends(get_db)):
+    """Server-Sent Events: a ``progress`` event each time the job changes, until it is done."""
+    if get_job(db, job_id) is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return StreamingResponse(
+        stream_job(job_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/tags", response_model=TagFacetsResponse)
+async def get_watchlist_tag_facets(
+    media_type: Literal["movie", "show"] | None = Query(None),
+    status: Literal["pending", "added", "downloading"] | None = Query(None),
+    priority: int | None = Query(None, ge=-1, le=1),
+    service: WatchlistService = Depends(get_service),
+):
+    """Tag facet counts for the (optionally filtered) watchlist, from one aggregate query."""
+    counts = service.tag_counts(media_type=media_type, status=status, priority=priority)
+    return TagFacetsResponse(tags=[TagFacet(tag=tag, count=n) for tag, n in counts])
+
+
 @router.delete("/batch")
 async def delete_watchlist_items(
     request: BatchDeleteRequest, service: WatchlistService = Depends(get_service)
@@ -179,11 +243,7 @@ async def update_watchlist_details(item_id: int, data: UpdateDetailsRequest,
     item = service.update_details(item_id, fields)
     if not item:
         raise HTTPException(status_code=404, detail="Item not found")
-    tmdb = get_tmdb_client()
-    try:
-        return await _enrich_watchlist_item(item, tmdb)
-    except TMDBClientError:
-        raise HTTPException(status_code=502, detail="TMDB unavailable")
+    return await _enrich_watchlist_item(service, item)
 
 
 # Parameterized endpoint must come AFTER specific endpoints
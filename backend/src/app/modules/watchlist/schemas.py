@@ -1,4 +1,5 @@
 """Watchlist batch operation schemas."""
+from datetime import datetime
 from typing import Literal
 from pydantic import BaseModel
 
@@ -17,6 +18,29 @@ class BatchProcessResponse(BaseModel):
     failed: list[dict]  # Failed items with error messages
 
 
+class ProcessJobItem(BaseModel):
+    """One title in a processing job."""
+
+    tmdb_id: int
+    status: Literal["pending", "added", "failed"]
+    error: str | None = None
+
+
+class ProcessJobResponse(BaseModel):
+    """A queued/running/finished processing job with per-item progress."""
+
+    id: int
+    media_type: Literal["movie", "show"]
+    status: Literal["queued", "running", "done"]
+    total: int
+    pending: int
+    processed: int
+    failed: int
+    created_at: datetime
+    finished_at: datetime | None = None
+    items: list[ProcessJobItem]
+
+
 class BatchDeleteItem(BaseModel):
     """A single (tmdb_id, media_type) pair to delete."""
 
@@ -28,3 +52,16 @@ class BatchDeleteRequest(BaseModel):
     """Request to delete multiple watchlist items."""
 
     items: list[BatchDeleteItem]
+
+
+class TagFacet(BaseModel):
+    """A tag and how many watchlist items carry it."""
+
+    tag: str
+    count: int
+
+
+class TagFacetsResponse(BaseModel):
+    """Tag facet counts, most used first."""
+
+    tags: list[TagFacet]
@@ -1,12 +1,54 @@
 """Watchlist business logic."""
 import asyncio
+import base64
+import binascii
 import json
-from sqlalchemy import tuple_
-from sqlalchemy.orm import Session
+from datetime import datetime
+from sqlalchemy import and_, case, delete, func, inspect, or_, select, tuple_, update
+from sqlalchemy.orm import Session, selectinload
 
-from app.models import Watchlist
-from app.config import get_setting
+from app.models import Watchlist, WatchlistTag
+from app.config import SettingsSnapshot, get_settings_snapshot
 from app.modules.clients import get_radarr_client, get_sonarr_client
+from app.modules.library_mirror import request_library_sync
+from .metadata import apply_metadata
+
+
+# Batches with at least this many new titles use the *arr bulk import endpoints.
+BULK_MIN_ITEMS = 10
+
+# Sort key -> column. Keyset pages order by (column IS NULL, column, id), so rows
+# missing the value sort last in both directions, matching the frontend.
+SORT_COLUMNS = {
+    "added": Watchlist.added_at,
+    "title": Watchlist.title,
+    "rating": Watchlist.vote_average,
+    "release": Watchlist.release_date,
+    "priority": Watchlist.priority,
+}
+
+
+def encode_cursor(sort: str, item: Watchlist) -> str:
+    """Opaque keyset cursor pointing just past ``item`` in ``sort`` order."""
+    value = getattr(item, SORT_COLUMNS[sort].key)
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    raw = json.dumps([value is None, value, item.id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(sort: str, cursor: str) -> tuple[bool, object, int]:
+    """Parse an opaque page cursor; raises ValueError if it is malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        is_null, value, item_id = json.loads(raw)
+        if not isinstance(item_id, int):
+            raise TypeError(item_id)
+    except (binascii.Error, ValueError, TypeError) as exc:
+        raise ValueError("Invalid cursor") from exc
+    if sort == "added" and value is not None:
+        value = datetime.fromisoformat(value)
+    return bool(is_null), value, item_id
 
 
 class WatchlistService:
@@ -72,6 +114,92 @@ class WatchlistService:
         """Get all watchlist items."""
         return self.db.query(Watchlist).order_by(Watchlist.added_at.desc()).all()
 
+    def list_page(
+        self,
+        *,
+        limit: int | None = None,
+        cursor: str | None = None,
+        sort: str = "added",
+        direction: str = "desc",
+        media_type: str | None = None,
+        status: str | None = None,
+        priority: int | None = None,
+        tag: str | None = None,
+    ) -> tuple[list[Watchlist], int, bool]:
+        """Filtered, sorted keyset page of the watchlist, all pushed down into SQL.
+
+        Returns ``(items, total, has_more)`` where ``total`` counts every row matching the
+        filters; pass ``encode_cursor(sort, items[-1])`` back as ``cursor`` for the next
+        page. ``limit=None`` returns the whole filtered list. Raises ValueError for a
+        malformed ``cursor``.
+        """
+        query = self._filtered(self.db.query(Watchlist), media_type, status, priority, tag)
+        total = query.count()
+
+        column = SORT_COLUMNS[sort]
+        if sort == "title":
+            column = column.collate("NOCASE")
+        is_null = case((SORT_COLUMNS[sort].is_(None), 1), else_=0)
+        ascending = direction == "asc"
+        order = (lambda c: c.asc()) if ascending else (lambda c: c.desc())
+
+        if cursor is not None:
+            after_null, after_value, after_id = _decode_cursor(sort, cursor)
+            id_after = Watchlist.id > after_id if ascending else Watchlist.id < after_id
+            if after_null:
+                query = query.filter(SORT_COLUMNS[sort].is_(None), id_after)
+            else:
+                value_after = column > after_value if ascending else column < after_value
+                query = query.filter(or_(
+                    SORT_COLUMNS[sort].is_(None),
+                    value_after,
+                    and_(column == after_value, id_after),
+                ))
+
+        query = query.order_by(is_null.asc(), order(column), order(Watchlist.id))
+        query = query.options(selectinload(Watchlist.tag_links))
+        if limit is None:
+            return query.all(), total, False
+        rows = query.limit(limit + 1).all()
+        return rows[:limit], total, len(rows) > limit
+
+    @staticmethod
+    def _filtered(query, media_type=None, status=None, priority=None, tag=None):
+        if media_type is not None:
+            query = query.filter(Watchlist.media_type == media_type)
+        if status is not None:
+            query = query.filter(Watchlist.status == status)
+        if priority is not None:
+            query = query.filter(Watchlist.priority == priority)
+        if tag is not None:
+            query = query.filter(
+                Watchlist.id.in_(select(WatchlistTag.watchlist_id).where(WatchlistTag.tag == tag))
+            )
+        return query
+
+    def tag_counts(
+        self, media_type: str | None = None, status: str | None = None, priority: int | None = None
+    ) -> list[tuple[str, int]]:
+        """``(tag, item count)`` facets, most used first, from one aggregate query."""
+        count = func.count(WatchlistTag.watchlist_id)
+        query = self.db.query(WatchlistTag.tag, count)
+        if media_type is not None or status is not None or priority is not None:
+            query = self._filtered(query.join(Watchlist), media_type, status, priority)
+        rows = query.group_by(WatchlistTag.tag).order_by(count.desc(), WatchlistTag.tag).all()
+        return [(tag, n) for tag, n in rows]
+
+    def reload(self, items: list[Watchlist]) -> None:
+        """Refresh rows expired by a commit, with their tags, in two queries instead of two per row."""
+        if items:
+            # Primary keys from the identity map: reading ``item.id`` would refresh each row.
+            ids = [inspect(item).identity[0] for item in items]
+            (
+                self.db.query(Watchlist)
+                .options(selectinload(Watchlist.tag_links))
+                .filter(Watchlist.id.in_(ids))
+                .all()
+            )
+
     def get_by_id(self, item_id: int) -> Watchlist | None:
         """Get watchlist item by ID."""
         return self.db.query(Watchlist).filter(Watchlist.id == item_id).first()
@@ -84,6 +212,22 @@ class WatchlistService:
             .first()
         )
 
+    def get_many_by_tmdb_ids(self, tmdb_ids: list[int], media_type: str) -> list[Watchlist]:
+        """Watchlist items for ``tmdb_ids`` scoped to media_type, in one query."""
+        if not tmdb_ids:
+            return []
+        return list(
+            self.db.scalars(
+                select(Watchlist).where(Watchlist.tmdb_id.in_(tmdb_ids), Watchlist.media_type == media_type)
+            )
+        )
+
+    def store_metadata(self, resolved: list[tuple[Watchlist, dict | None]]) -> None:
+        """Write fetched TMDB metadata onto rows (None details -> placeholder) in one commit."""
+        for item, details in resolved:
+            apply_metadata(item, details)
+        self.db.commit()
+
     def update_seasons(self, tmdb_id: int, media_type: str, selected_seasons: list[int] | None) -> Watchlist | None:
         """Update selected seasons for a watchlist item."""
         item = self.get_by_tmdb_id(tmdb_id, media_type)
@@ -105,8 +249,8 @@ class WatchlistService:
         if "notes" in fields:
             item.notes = fields["notes"]
         if "tags" in fields:
-            tags = fields["tags"]
-            item.tags = json.dumps(tags) if tags else None   # [] or None -> NULL
+            tags = list(dict.fromkeys(t.strip() for t in fields["tags"] or [] if t and t.strip()))
+            item.tag_links = [WatchlistTag(tag=t, position=i) for i, t in enumerate(tags)]
         self.db.commit()
         self.db.refresh(item)
         return item
@@ -122,65 +266,129 @@ class WatchlistService:
 
     def delete_batch(self, items: list[tuple[int, str]]) -> int:
         """Delete multiple watchlist items by (tmdb_id, media_type). Returns count deleted."""
-        deleted = (
-            self.db.query(Watchlist)
-            .filter(tuple_(Watchlist.tmdb_id, Watchlist.media_type).in_(items))
-            .delete(synchronize_session=False)
+        matched = tuple_(Watchlist.tmdb_id, Watchlist.media_type).in_(items)
+        # Bulk deletes bypass the ORM cascade (and SQLite foreign keys are off), so drop tags first.
+        self.db.execute(
+            delete(WatchlistTag).where(WatchlistTag.watchlist_id.in_(select(Watchlist.id).where(matched)))
         )
+        deleted = self.db.query(Watchlist).filter(matched).delete(synchronize_session=False)
         self.db.commit()
         return deleted
 
+    def advance_status(
+        self, tmdb_id: int, media_type: str, status: str, from_statuses: tuple[str, ...]
+    ) -> int:
+        """Move matching items currently in ``from_statuses`` to ``status``. Returns count changed."""
+        updated = (
+            self.db.query(Watchlist)
+            .filter(
+                Watchlist.tmdb_id == tmdb_id,
+                Watchlist.media_type == media_type,
+                Watchlist.status.in_(from_statuses),
+            )
+            .update({Watchlist.status: status}, synchronize_session=False)
+        )
+        self.db.commit()
+        return updated
+
     async def process_batch(
-        self, tmdb_ids: list[int], media_type: str
+        self, tmdb_ids: list[int], media_type: str, app_settings: SettingsSnapshot | None = None
     ) -> tuple[list[int], list[dict]]:
-        """Process watchlist items by sending to Radarr/Sonarr concurrently."""
+        """Process watchlist items by sending to Radarr/Sonarr.
+
+        Small batches add title by title (concurrently). From ``BULK_MIN_ITEMS`` new
+        titles on, adds go through the *arr's bulk import endpoint instead: lookups
+        with bounded concurrency, one library listing for the duplicate check, and a
+        POST per chunk. Root folder and quality profile come from ``app_settings``
+        (the current settings snapshot when omitted).
+        """
         processed = []
         failed = []
 
-        # Create clients once, cache settings outside loop
+        # Create clients once, read settings outside loop
+        if app_settings is None:
+            app_settings = get_settings_snapshot()
         if media_type == "movie":
             client = await get_radarr_client()
-            root_folder = get_setting("radarr_root_folder")
-            quality_profile_id = get_setting("radarr_quality_profile_id")
+            root_folder = app_settings.radarr_root_folder
+            quality_profile_id = app_settings.radarr_quality_profile_id
         else:
             client = await get_sonarr_client()
-            root_folder = get_setting("sonarr_root_folder")
-            quality_profile_id = get_setting("sonarr_quality_profile_id")
+            root_folder = app_settings.sonarr_root_folder
+            quality_profile_id = app_settings.sonarr_quality_profile_id
         try:
             quality_profile_id = int(quality_profile_id) if quality_profile_id else None
         except (TypeError, ValueError):
             quality_profile_id = None
 
+        # Read season selections for every show in one query, before any coroutine
+        # starts (the session is shared and must not be used concurrently).
+        seasons: dict[int, list[int] | None] = {}
+        season_updates: set[int] = set()
+        if media_type != "movie":
+            rows = {item.tmdb_id: item for item in self.get_many_by_tmdb_ids(tmdb_ids, media_type)}
+            for tmdb_id in tmdb_ids:
+                item = rows.get(tmdb_id)
+                selected_seasons = None
+                if item and item.selected_seasons:
+                    parsed = json.loads(item.selected_seasons)
+                    selected_seasons = parsed if isinstance(parsed, list) else None
+                seasons[tmdb_id] = selected_seasons
+                if item and item.is_season_update:
+                    season_updates.add(tmdb_id)
+
+        new_ids = [tid for tid in tmdb_ids if tid not in season_updates]
+        bulk_ids = new_ids if len(new_ids) >= BULK_MIN_ITEMS else []
+        in_bulk = set(bulk_ids)
+
         async def process_one(tmdb_id: int) -> tuple[int | None, dict | None]:
             try:
                 if media_type == "movie":
                     await client.add_movie(tmdb_id, quality_profile_id=quality_profile_id, root_folder_path=root_folder)
+                elif tmdb_id in season_updates:
+                    await client.update_season_monitoring(tmdb_id, seasons[tmdb_id])
                 else:
-                    item = self.get_by_tmdb_id(tmdb_id, media_type)
-                    selected_seasons = None
-                    if item and item.selected_seasons:
-                        parsed = json.loads(item.selected_seasons)
-                        selected_seasons = parsed if isinstance(parsed, list) else None
-
-                    if item and item.is_season_update:
-                        await client.update_season_monitoring(tmdb_id, selected_seasons)
-                    else:
-                        await client.add_series(tmdb_id, quality_profile_id=quality_profile_id, root_folder_path=root_folder, selected_seasons=selected_seasons)
+                    await client.add_series(tmdb_id, quality_profile_id=quality_profile_id, root_folder_path=root_folder, selected_seasons=seasons[tmdb_id])
 
                 return (tmdb_id, None)
             except Exception as e:
                 return (None, {"tmdb_id": tmdb_id, "error": str(e)})
 
-        results = await asyncio.gather(*[process_one(tid) for tid in tmdb_ids])
+        async def process_bulk() -> list[tuple[int | None, dict | None]]:
+            if not bulk_ids:
+                return []
+            try:
+                if media_type == "movie":
+                    added, errors = await client.add_movies(
+                        bulk_ids, quality_profile_id=quality_profile_id, root_folder_path=root_folder
+                    )
+                else:
+                    added, errors = await client.add_series_many(
+                        {tid: seasons[tid] for tid in bulk_ids},
+                        quality_profile_id=quality_profile_id,
+                        root_folder_path=root_folder,
+                    )
+            except Exception as e:  # noqa: BLE001 - reported per item, as in process_single
+                return [(None, {"tmdb_id": tid, "error": str(e)}) for tid in bulk_ids]
+            return [(tid, None) for tid in added] + [
+                (None, {"tmdb_id": tid, "error": error}) for tid, error in errors.items()
+            ]
 
-        for success_id, failure in results:
+        single = [process_one(tid) for tid in tmdb_ids if tid not in in_bulk]
+        bulk_results, *single_results = await asyncio.gather(process_bulk(), *single)
+
+        for success_id, failure in [*bulk_results, *single_results]:
             if success_id is not None:
                 processed.append(success_id)
-                item = self.get_by_tmdb_id(success_id, media_type)
-                if item:
-                    item.status = "added"
-                    self.db.commit()
             else:
                 failed.append(failure)
 
+        if processed:
+            self.db.execute(
+                update(Watchlist)
+                .where(Watchlist.tmdb_id.in_(processed), Watchlist.media_type == media_type)
+                .values(status="added")
+            )
+            self.db.commit()
+            request_library_sync()
         return processed, failed
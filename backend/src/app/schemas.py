@@ -55,13 +55,16 @@ class WatchlistItem(MediaBase):
     total_seasons: int | None = None  # For display: "X of Y seasons"
     priority: int = 0  # 1=High, 0=Normal, -1=Low
     tags: list[str] = []
+    degraded: bool = False  # True when TMDB metadata could not be fetched for this row
 
 
 class WatchlistResponse(BaseModel):
     """Watchlist list response."""
 
     items: list[WatchlistItem]
-    total: int
+    total: int  # rows matching the filters, across all pages
+    next_cursor: str | None = None  # pass back as ?cursor= for the next page; None on the last
+    degraded: list[str] = []  # upstreams that failed for some rows, e.g. ["tmdb"]
 
 
 # === Sonarr/Radarr Schemas ===
@@ -5,3 +5,50 @@ from pathlib import Path
 # Add src directory to Python path
 src_path = Path(__file__).parent.parent / "src"
 sys.path.insert(0, str(src_path))
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def fresh_settings_snapshot():
+    """Tests write the settings table directly; start each one from a fresh DB settings snapshot."""
+    from app.config import invalidate_settings
+
+    invalidate_settings()
+    yield
+    invalidate_settings()
+
+
+@pytest.fixture(autouse=True)
+def isolated_db():
+    """Serve ``get_db`` from a fresh in-memory database so routes never touch ./data.
+
+    Tests that need their own session factory override ``get_db`` again in their fixtures.
+    """
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from sqlalchemy.pool import StaticPool
+
+    from app.database import Base, get_db
+    from app.main import app
+
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    def override_get_db():
+        session = session_factory()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    yield
+    if app.dependency_overrides.get(get_db) is override_get_db:
+        del app.dependency_overrides[get_db]
+    engine.dispose()
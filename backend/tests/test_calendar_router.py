@@ -1,5 +1,6 @@
 """Tests for the calendar aggregating endpoint."""
 import types
+from datetime import datetime
 
 import pytest
 import httpx
@@ -14,6 +15,12 @@ from app.modules.radarr.client import RadarrClient
 from app.modules.sonarr.client import SonarrClient
 
 
+def _row(**fields):
+    """Fake watchlist row; metadata_updated_at=None means never enriched (TMDB fallback)."""
+    fields.setdefault("metadata_updated_at", None)
+    return types.SimpleNamespace(**fields)
+
+
 class FakeWatchlistService:
     """Minimal stand-in exposing get_all()."""
 
@@ -104,7 +111,7 @@ def test_watchlist_movie_resolved_via_tmdb(client, mock_radarr, mock_sonarr, wat
     mock_radarr.get_calendar.return_value = []
     mock_sonarr.get_calendar.return_value = []
     watchlist_rows.append(
-        types.SimpleNamespace(tmdb_id=99, media_type="movie", status="pending")
+        _row(tmdb_id=99, media_type="movie", status="pending")
     )
 
     with patch(
@@ -134,7 +141,7 @@ def test_sonarr_down_serves_partial_with_degraded(
     ]
     mock_sonarr.get_calendar.side_effect = httpx.ConnectError("boom")
     watchlist_rows.append(
-        types.SimpleNamespace(tmdb_id=99, media_type="movie", status="pending")
+        _row(tmdb_id=99, media_type="movie", status="pending")
     )
 
     with patch(
@@ -179,10 +186,10 @@ def test_watchlist_added_status_excluded(
     mock_radarr.get_calendar.return_value = []
     mock_sonarr.get_calendar.return_value = []
     watchlist_rows.append(
-        types.SimpleNamespace(tmdb_id=55, media_type="movie", status="added")
+        _row(tmdb_id=55, media_type="movie", status="added")
     )
     watchlist_rows.append(
-        types.SimpleNamespace(tmdb_id=99, media_type="movie", status="pending")
+        _row(tmdb_id=99, media_type="movie", status="pending")
     )
 
     with patch(
@@ -197,3 +204,30 @@ def test_watchlist_added_status_excluded(
     assert len(items) == 1
     assert items[0]["source"] == "watchlist"
     assert items[0]["tmdb_id"] == 99
+
+
+def test_watchlist_movie_uses_stored_metadata_without_tmdb(
+    client, mock_radarr, mock_sonarr, watchlist_rows
+):
+    """A row with denormalized metadata is placed on the agenda with no TMDB call."""
+    mock_radarr.get_calendar.return_value = []
+    mock_sonarr.get_calendar.return_value = []
+    watchlist_rows.append(
+        _row(
+            tmdb_id=99,
+            media_type="movie",
+            status="pending",
+            title="Stored Film",
+            release_date="2026-06-09",
+            metadata_updated_at=datetime(2026, 6, 1),
+        )
+    )
+
+    with patch(
+        "app.modules.clients.tmdb_client.get_details", new_callable=AsyncMock
+    ) as get_details:
+        response = client.get(f"/api/calendar{WINDOW}")
+
+    get_details.assert_not_called()
+    items = response.json()["items"]
+    assert [(i["title"], i["date"]) for i in items] == [("Stored Film", "2026-06-09")]
@@ -0,0 +1,224 @@
+"""Tests for the per-upstream circuit breaker."""
+from unittest.mock import AsyncMock
+
+import httpx
+import pytest
+import respx
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.modules.circuit import CircuitBreaker, CircuitOpenError
+from app.modules.discovery.tmdb_client import TMDBClient, TMDBNetworkError
+from app.modules.library_mirror import LibraryMirror, get_library_mirror
+from app.modules.radarr.client import RadarrClient
+from app.modules.radarr.router import get_radarr_client
+from app.modules.sonarr.client import SonarrClient
+from app.modules.sonarr.router import get_sonarr_client
+from app.modules.watchlist.router import get_service
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _breaker(clock=None):
+    return CircuitBreaker("Sonarr", failure_rate=0.5, window=4, min_calls=4, reset_timeout=30.0,
+                          clock=clock or FakeClock())
+
+
+def _succeed(breaker):
+    breaker.record_success(breaker.before_call())
+
+
+def _fail(breaker):
+    breaker.record_failure(breaker.before_call())
+
+
+def test_opens_once_failure_rate_reached_over_min_calls():
+    breaker = _breaker()
+    _succeed(breaker)
+    _fail(breaker)
+    _succeed(breaker)
+    assert breaker.state == "closed"  # below min_calls
+
+    _fail(breaker)
+    assert breaker.state == "open"  # 2 of 4 failed
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+
+def test_successes_keep_it_closed():
+    breaker = _breaker()
+    for _ in range(3):
+        _succeed(breaker)
+    _fail(breaker)
+    assert breaker.state == "closed"
+
+
+def test_half_open_allows_one_trial_then_closes_on_success():
+    clock = FakeClock()
+    breaker = _breaker(clock)
+    for _ in range(4):
+        _fail(breaker)
+    assert breaker.is_open
+
+    clock.now = 30.0
+    assert breaker.state == "half_open"
+    trial = breaker.before_call()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()  # the trial is in flight
+
+    breaker.record_success(trial)
+    assert breaker.state == "closed"
+    breaker.before_call()
+
+
+def test_failed_trial_reopens():
+    clock = FakeClock()
+    breaker = _breaker(clock)
+    for _ in range(4):
+        _fail(breaker)
+    clock.now = 30.0
+    _fail(breaker)
+
+    assert breaker.state == "open"
+    clock.now = 59.0
+    assert breaker.is_open
+    clock.now = 60.0
+    assert breaker.state == "half_open"
+
+
+def test_released_trial_frees_the_slot():
+    clock = FakeClock()
+    breaker = _breaker(clock)
+    for _ in range(4):
+        _fail(breaker)
+    clock.now = 30.0
+    breaker.release(breaker.before_call())
+
+    breaker.before_call()  # another caller may take the trial
+
+
+def test_call_from_before_opening_does_not_close_half_open_circuit():
+    clock = FakeClock()
+    breaker = _breaker(clock)
+    slow = breaker.before_call()  # started while closed
+    for _ in range(4):
+        _fail(breaker)
+    clock.now = 30.0
+    trial = breaker.before_call()
+
+    breaker.record_success(slow)
+    assert breaker.state == "half_open" and breaker.is_open  # still waiting on the trial
+
+    breaker.record_failure(trial)
+    assert breaker.state == "open"
+
+
+def test_late_failure_does_not_extend_open_circuit():
+    clock = FakeClock()
+    breaker = _breaker(clock)
+    late = [breaker.before_call() for _ in range(3)]
+    for _ in range(4):
+        _fail(breaker)
+    assert breaker.state == "open"
+
+    clock.now = 20.0
+    for token in late:
+        breaker.record_failure(token)
+    breaker.release(late[0])
+
+    clock.now = 30.0
+    assert breaker.state == "half_open"  # reset timer still counts from the original trip
+
+
+async def test_arr_client_stops_calling_a_dead_host():
+    client = RadarrClient(url="http://radarr:7878", api_key="k", breaker=_breaker())
+
+    with respx.mock:
+        route = respx.get("http://radarr:7878/api/v3/system/status").mock(
+            side_effect=httpx.ConnectError("refused")
+        )
+        for _ in range(4):
+            with pytest.raises(httpx.ConnectError):
+                await client._get("/system/status")
+        with pytest.raises(CircuitOpenError):
+            await client._get("/system/status")
+
+    assert route.call_count == 4
+    await client.close()
+
+
+async def test_arr_client_4xx_is_not_a_failure():
+    breaker = _breaker()
+    client = RadarrClient(url="http://radarr:7878", api_key="k", breaker=breaker)
+
+    with respx.mock:
+        respx.get("http://radarr:7878/api/v3/movie/1").mock(return_value=httpx.Response(404))
+        for _ in range(4):
+            with pytest.raises(httpx.HTTPStatusError):
+                await client._get("/movie/1")
+
+    assert breaker.state == "closed"
+    await client.close()
+
+
+async def test_tmdb_open_circuit_raises_network_error_without_request():
+    breaker = _breaker()
+    for _ in range(4):
+        _fail(breaker)
+    tmdb = TMDBClient(api_key="k", base_url="https://tmdb.test/3", breaker=breaker)
+
+    with respx.mock(assert_all_called=False):
+        route = respx.get("https://tmdb.test/3/movie/603").mock(return_value=httpx.Response(200, json={}))
+        with pytest.raises(TMDBNetworkError):
+            await tmdb._request("/movie/603", {})
+
+    assert not route.called
+    await tmdb.close()
+
+
+@pytest.fixture
+def dead_sonarr():
+    """A real Sonarr client whose circuit is already open; any request would fail the test."""
+    breaker = _breaker()
+    for _ in range(4):
+        _fail(breaker)
+    return SonarrClient(url="http://sonarr:8989", api_key="k", breaker=breaker)
+
+
+@pytest.fixture
+def api(dead_sonarr):
+    radarr = AsyncMock(spec=RadarrClient)
+    radarr.get_calendar.return_value = []
+    radarr.get_recent.return_value = [{"title": "Movie"}]
+    mirror = AsyncMock(spec=LibraryMirror)
+    mirror.is_ready = lambda source: False
+    app.dependency_overrides[get_radarr_client] = lambda: radarr
+    app.dependency_overrides[get_sonarr_client] = lambda: dead_sonarr
+    app.dependency_overrides[get_service] = lambda: type("W", (), {"get_all": lambda self: []})()
+    app.dependency_overrides[get_library_mirror] = lambda: mirror
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+def test_calendar_degrades_immediately_when_circuit_open(api):
+    with respx.mock:  # no routes: any upstream call would raise
+        response = api.get("/api/calendar?start=2026-06-06&end=2026-06-13")
+
+    assert response.status_code == 200
+    assert response.json()["degraded"] == ["sonarr"]
+
+
+def test_library_activity_degrades_immediately_when_circuit_open(api):
+    with respx.mock:
+        response = api.get("/api/library/activity")
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["degraded"] == ["sonarr"]
+    assert body["movies"] == [{"title": "Movie"}]
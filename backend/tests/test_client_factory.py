@@ -1,10 +1,12 @@
 """Tests for the shared external-client factory (DB-first creds, persistent pools)."""
+import asyncio
 import os
 
 import httpx
 import pytest
 import respx
 
+import app.config as config_module
 import app.modules.clients as clients_module
 from app.modules.clients import (
     get_radarr_client,
@@ -76,8 +78,8 @@ async def test_radarr_same_instance_when_unchanged(db):
     assert first is second
 
 
-async def test_radarr_new_instance_on_credential_change_closes_old(db):
-    """Changing the saved api_key swaps in a new client and closes the old pool."""
+async def test_radarr_new_instance_on_url_change_closes_old(db):
+    """Changing the saved URL swaps in a new client and closes the old pool."""
     service = SettingsService(db)
     service.update_settings(
         SettingsUpdate(radarr_url="http://db-radarr:7878", radarr_api_key="db-radarr-key")
@@ -88,17 +90,40 @@ async def test_radarr_new_instance_on_credential_change_closes_old(db):
     await old._get_client()
     assert old._client is not None
 
-    service.update_settings(SettingsUpdate(radarr_api_key="rotated-key"))
+    service.update_settings(SettingsUpdate(radarr_url="http://new-radarr:7878"))
 
     new = await get_radarr_client()
 
     assert new is not old
-    assert new.api_key == "rotated-key"
+    assert new.url == "http://new-radarr:7878"
     assert old._client is None  # old pool was awaited closed during the swap
 
     await new.close()
 
 
+async def test_radarr_key_rotation_keeps_pool(db):
+    """A rotated api_key is applied in place: same client, same pool, new header on the wire."""
+    service = SettingsService(db)
+    service.update_settings(
+        SettingsUpdate(radarr_url="http://db-radarr:7878", radarr_api_key="db-radarr-key")
+    )
+    client = await get_radarr_client()
+    pool = await client._get_client()
+
+    service.update_settings(SettingsUpdate(radarr_api_key="rotated-key"))
+
+    with respx.mock:
+        route = respx.get("http://db-radarr:7878/api/v3/system/status").mock(
+            return_value=httpx.Response(200, json={})
+        )
+        assert await get_radarr_client() is client
+        await client._get("/system/status")
+
+    assert client._client is pool
+    assert route.calls.last.request.headers["X-Api-Key"] == "rotated-key"
+    await client.close()
+
+
 async def test_radarr_db_settings_reach_the_wire(db):
     """DB url + key are actually used by the httpx call (TG2)."""
     SettingsService(db).update_settings(
@@ -125,3 +150,80 @@ async def test_tmdb_refreshes_and_is_singleton(db):
 
     assert first is second
     assert first.api_key == "db-tmdb-key"
+
+
+async def test_unchanged_settings_skip_credential_lookup(db, monkeypatch):
+    """Between settings saves the factories only compare a version; no snapshot is read."""
+    SettingsService(db).update_settings(
+        SettingsUpdate(radarr_url="http://db-radarr:7878", radarr_api_key="db-radarr-key")
+    )
+    first = await get_radarr_client()
+    get_tmdb_client()
+
+    def fail():
+        raise AssertionError("settings snapshot read on the hot path")
+
+    monkeypatch.setattr(clients_module, "get_settings_snapshot", fail)
+
+    assert await get_radarr_client() is first
+    get_tmdb_client()
+
+
+async def test_concurrent_requests_after_change_build_one_client(db):
+    """Simultaneous callers after a URL change share a single new client."""
+    service = SettingsService(db)
+    service.update_settings(SettingsUpdate(radarr_url="http://db-radarr:7878", radarr_api_key="key-1"))
+    old = await get_radarr_client()
+
+    service.update_settings(SettingsUpdate(radarr_url="http://new-radarr:7878"))
+    clients = await asyncio.gather(*[get_radarr_client() for _ in range(10)])
+
+    assert all(c is clients[0] for c in clients)
+    assert clients[0] is not old
+    assert clients[0].url == "http://new-radarr:7878"
+
+
+async def test_retired_client_closes_pool_after_in_flight_request(db):
+    """A replaced client keeps its pool until the request using it finishes."""
+    service = SettingsService(db)
+    service.update_settings(SettingsUpdate(radarr_url="http://db-radarr:7878", radarr_api_key="key-1"))
+    old = await get_radarr_client()
+    release = asyncio.Event()
+
+    async def slow_status(request):
+        await release.wait()
+        return httpx.Response(200, json={"version": "5"})
+
+    with respx.mock:
+        respx.get("http://db-radarr:7878/api/v3/system/status").mock(side_effect=slow_status)
+        in_flight = asyncio.create_task(old._get("/system/status"))
+        await asyncio.sleep(0)
+
+        service.update_settings(SettingsUpdate(radarr_url="http://new-radarr:7878"))
+        new = await get_radarr_client()
+
+        assert new is not old
+        assert old._client is not None and not old._client.is_closed
+
+        release.set()
+        assert await in_flight == {"version": "5"}
+
+    assert old._client is None
+    await new.close()
+
+
+async def test_env_only_snapshot_is_not_remembered(db, monkeypatch):
+    """After a failed settings read the next request resolves credentials again."""
+    SettingsService(db).update_settings(
+        SettingsUpdate(radarr_url="http://db-radarr:7878", radarr_api_key="db-radarr-key")
+    )
+    real_load = config_module._load_db_settings
+    monkeypatch.setattr(config_module, "_load_db_settings", lambda: None)
+    fallback = await get_radarr_client()
+    assert fallback.url != "http://db-radarr:7878"
+
+    monkeypatch.setattr(config_module, "_load_db_settings", real_load)
+    client = await get_radarr_client()
+
+    assert client.url == "http://db-radarr:7878"
+    assert client.api_key == "db-radarr-key"
@@ -1,13 +1,14 @@
-"""Tests for config get_setting: DB precedence, error fallback, session cleanup."""
+"""Tests for config get_setting: DB precedence, error fallback, session cleanup, snapshot cache."""
 import logging
 import os
 
 import pytest
 from cryptography.fernet import InvalidToken
+from pydantic import ValidationError
 from sqlalchemy.exc import SQLAlchemyError
 
-from app.config import get_setting, settings
-from app.database import get_db, init_db
+from app.config import get_setting, get_settings_snapshot, settings, settings_version
+from app.database import count_queries, engine, get_db, init_db
 from app.models import Settings
 from app.modules.settings.schemas import SettingsUpdate
 from app.modules.settings.service import SettingsService
@@ -43,12 +44,14 @@ def test_get_setting_db_value_wins_over_env(db, monkeypatch):
     assert get_setting("radarr_url") == "http://db-radarr:7878"
 
 
-def test_get_setting_db_error_falls_back_to_env_and_logs(monkeypatch, caplog):
-    """(b) On DB error (InvalidToken) get_setting returns the env fallback and logs a warning."""
-    def boom(self, key):
+def test_get_setting_db_error_falls_back_to_env_and_logs(db, monkeypatch, caplog):
+    """(b) A value that fails to decrypt (InvalidToken) falls back to env and logs a warning."""
+    SettingsService(db).update_settings(SettingsUpdate(tmdb_api_key="db-key"))
+
+    def boom(value):
         raise InvalidToken()
 
-    monkeypatch.setattr(SettingsService, "get_raw_value", boom)
+    monkeypatch.setattr("app.modules.settings.service.decrypt_value", boom)
     monkeypatch.setattr(settings, "tmdb_api_key", "env-fallback-key")
 
     with caplog.at_level(logging.WARNING):
@@ -71,12 +74,77 @@ def test_get_setting_closes_session_on_error(monkeypatch):
 
     monkeypatch.setattr("app.database.SessionLocal", lambda: FakeSession())
 
-    def boom(self, key):
+    def boom(self):
         raise SQLAlchemyError("boom")
 
-    monkeypatch.setattr(SettingsService, "get_raw_value", boom)
+    monkeypatch.setattr(SettingsService, "get_raw_values", boom)
 
     # Should not raise; falls back to env (which may be None) and closes the fake session.
     get_setting("tmdb_api_key")
 
     assert closed["value"] is True
+
+
+def test_get_setting_decrypts_once_until_settings_change(db, monkeypatch):
+    """The DB snapshot is loaded and decrypted once, and reloaded after a settings save."""
+    service = SettingsService(db)
+    service.update_settings(SettingsUpdate(radarr_api_key="first-key"))
+
+    from app.modules.settings import service as service_module
+
+    calls = []
+    real_decrypt = service_module.decrypt_value
+
+    def counting_decrypt(value):
+        calls.append(value)
+        return real_decrypt(value)
+
+    monkeypatch.setattr(service_module, "decrypt_value", counting_decrypt)
+
+    assert get_setting("radarr_api_key") == "first-key"
+    assert get_setting("radarr_api_key") == "first-key"
+    assert len(calls) == 1
+
+    service.update_settings(SettingsUpdate(radarr_api_key="second-key"))
+
+    assert get_setting("radarr_api_key") == "second-key"
+    assert len(calls) == 2
+
+
+def test_failed_load_is_not_cached(db, monkeypatch):
+    """A DB error is retried on the next call instead of pinning the env fallback."""
+    SettingsService(db).update_settings(SettingsUpdate(radarr_url="http://db-radarr:7878"))
+    real = SettingsService.get_raw_values
+
+    def boom(self):
+        raise SQLAlchemyError("boom")
+
+    monkeypatch.setattr(SettingsService, "get_raw_values", boom)
+    monkeypatch.setattr(settings, "radarr_url", "http://env-radarr:9999")
+    assert get_setting("radarr_url") == "http://env-radarr:9999"
+
+    monkeypatch.setattr(SettingsService, "get_raw_values", real)
+    assert get_setting("radarr_url") == "http://db-radarr:7878"
+
+
+def test_snapshot_is_immutable_versioned_and_loaded_in_one_query(db):
+    """All keys come from one query; the snapshot is frozen and a save bumps the version."""
+    service = SettingsService(db)
+    service.update_settings(SettingsUpdate(radarr_url="http://db-radarr:7878", streaming_region="GB"))
+    version = settings_version()
+
+    with count_queries(engine) as queries:
+        snapshot = get_settings_snapshot()
+        assert get_settings_snapshot() is snapshot
+
+    assert queries.count == 1
+    assert snapshot.version == version
+    assert snapshot.radarr_url == "http://db-radarr:7878"
+    assert snapshot.streaming_region == "GB"
+    with pytest.raises(ValidationError):
+        snapshot.streaming_region = "US"
+
+    service.update_settings(SettingsUpdate(streaming_region="US"))
+
+    assert settings_version() > version
+    assert get_settings_snapshot().streaming_region == "US"
@@ -0,0 +1,196 @@
+"""Tests for the Radarr/Sonarr webhook receivers (recorded webhook payloads)."""
+from unittest.mock import AsyncMock
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.config import settings
+from app.database import Base, get_db
+from app.main import app
+from app.models import Watchlist
+from app.modules.clients import get_radarr_client, get_sonarr_client
+from app.modules.library_mirror import LibraryMirror, apply_library
+from app.modules.radarr.client import RadarrClient
+from app.modules.sonarr.client import SonarrClient
+
+RADARR_GRAB = {
+    "eventType": "Grab",
+    "instanceName": "Radarr",
+    "movie": {"id": 1, "title": "The Matrix", "year": 1999, "releaseDate": "1999-03-31",
+              "folderPath": "/movies/The Matrix (1999)", "tmdbId": 603, "imdbId": "tt0133093"},
+    "remoteMovie": {"tmdbId": 603, "imdbId": "tt0133093", "title": "The Matrix", "year": 1999},
+    "release": {"quality": "Bluray-1080p", "releaseTitle": "The.Matrix.1999.1080p.BluRay",
+                "indexer": "Example", "size": 9876543210},
+    "downloadClient": "qBittorrent",
+    "downloadId": "ABCDEF",
+}
+RADARR_DOWNLOAD = {
+    "eventType": "Download",
+    "instanceName": "Radarr",
+    "movie": RADARR_GRAB["movie"],
+    "movieFile": {"id": 12, "relativePath": "The Matrix (1999).mkv", "quality": "Bluray-1080p",
+                  "size": 9876543210},
+    "isUpgrade": False,
+    "downloadId": "ABCDEF",
+}
+RADARR_DELETE = {
+    "eventType": "MovieDelete",
+    "instanceName": "Radarr",
+    "movie": RADARR_GRAB["movie"],
+    "deletedFiles": True,
+}
+SONARR_SERIES_ADD = {
+    "eventType": "SeriesAdd",
+    "instanceName": "Sonarr",
+    "series": {"id": 7, "title": "Breaking Bad", "path": "/tv/Breaking Bad", "tvdbId": 81189,
+               "tvMazeId": 169, "imdbId": "tt0903747", "type": "standard", "year": 2008},
+}
+SONARR_GRAB = {
+    "eventType": "Grab",
+    "instanceName": "Sonarr",
+    "series": SONARR_SERIES_ADD["series"],
+    "episodes": [{"id": 100, "episodeNumber": 1, "seasonNumber": 1, "title": "Pilot"}],
+    "release": {"quality": "HDTV-720p", "releaseTitle": "Breaking.Bad.S01E01.720p.HDTV"},
+}
+SONARR_TEST = {"eventType": "Test", "instanceName": "Sonarr", "series": {"id": 1, "title": "Test Title"}}
+
+MOVIE_RECORD = {"id": 1, "tmdbId": 603, "title": "The Matrix", "hasFile": True, "added": "2026-01-01T00:00:00Z"}
+SERIES_RECORD = {"id": 7, "tmdbId": 1396, "tvdbId": 81189, "title": "Breaking Bad",
+                 "added": "2026-01-01T00:00:00Z",
+                 "statistics": {"percentOfEpisodes": 0, "episodeFileCount": 0}}
+
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine)
+    yield sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture
+def api(session_factory):
+    def override_get_db():
+        session = session_factory()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    radarr = AsyncMock(spec=RadarrClient)
+    sonarr = AsyncMock(spec=SonarrClient)
+    radarr.invalidate_library = lambda: None
+    sonarr.invalidate_library = lambda: None
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_radarr_client] = lambda: radarr
+    app.dependency_overrides[get_sonarr_client] = lambda: sonarr
+    yield TestClient(app), radarr, sonarr
+    app.dependency_overrides.clear()
+
+
+def _add_watchlist(session_factory, tmdb_id, media_type, status="pending"):
+    db = session_factory()
+    db.add(Watchlist(tmdb_id=tmdb_id, media_type=media_type, status=status))
+    db.commit()
+    db.close()
+
+
+def _watchlist_status(session_factory, tmdb_id, media_type):
+    db = session_factory()
+    item = db.query(Watchlist).filter_by(tmdb_id=tmdb_id, media_type=media_type).one()
+    db.close()
+    return item.status
+
+
+def test_radarr_grab_marks_watchlist_downloading(api, session_factory):
+    client, radarr, _ = api
+    _add_watchlist(session_factory, 603, "movie")
+
+    body = client.post("/api/hooks/radarr", json=RADARR_GRAB).json()
+
+    assert body["watchlist_updated"] == 1
+    assert _watchlist_status(session_factory, 603, "movie") == "downloading"
+    radarr.get_library_item.assert_not_called()
+
+
+def test_radarr_download_refreshes_mirror_and_marks_added(api, session_factory):
+    client, radarr, _ = api
+    db = session_factory()
+    apply_library(db, "radarr", [dict(MOVIE_RECORD, hasFile=False)])
+    db.close()
+    _add_watchlist(session_factory, 603, "movie", status="downloading")
+    radarr.get_library_item.return_value = MOVIE_RECORD
+
+    body = client.post("/api/hooks/radarr", json=RADARR_DOWNLOAD).json()
+
+    assert body["mirrored"] is True
+    radarr.get_library_item.assert_awaited_once_with(1)
+    assert _watchlist_status(session_factory, 603, "movie") == "added"
+    db = session_factory()
+    assert LibraryMirror(db).statuses("movie", [603]) == {603: "available"}
+    db.close()
+
+
+def test_radarr_delete_removes_mirror_row(api, session_factory):
+    client, _, _ = api
+    db = session_factory()
+    apply_library(db, "radarr", [MOVIE_RECORD])
+    db.close()
+    _add_watchlist(session_factory, 603, "movie", status="added")
+
+    client.post("/api/hooks/radarr", json=RADARR_DELETE)
+
+    db = session_factory()
+    assert LibraryMirror(db).statuses("movie", [603]) == {603: None}
+    db.close()
+    assert _watchlist_status(session_factory, 603, "movie") == "added"  # never moved back
+
+
+def test_sonarr_payload_without_tmdb_id_resolves_through_mirror(api, session_factory):
+    client, _, sonarr = api
+    _add_watchlist(session_factory, 1396, "show")
+    sonarr.get_library_item.return_value = SERIES_RECORD
+
+    assert client.post("/api/hooks/sonarr", json=SONARR_SERIES_ADD).json()["tmdb_id"] == 1396
+    assert _watchlist_status(session_factory, 1396, "show") == "added"
+
+    body = client.post("/api/hooks/sonarr", json=SONARR_GRAB).json()  # tvdbId only, no refetch
+    assert body["tmdb_id"] == 1396
+    assert _watchlist_status(session_factory, 1396, "show") == "downloading"
+    sonarr.get_library_item.assert_awaited_once()
+
+
+def test_refetch_failure_is_acknowledged(api, session_factory):
+    client, radarr, _ = api
+    _add_watchlist(session_factory, 603, "movie", status="downloading")
+    radarr.get_library_item.side_effect = httpx.ConnectError("refused")
+
+    response = client.post("/api/hooks/radarr", json=RADARR_DOWNLOAD)
+
+    assert response.status_code == 200
+    assert response.json()["mirrored"] is False
+    assert _watchlist_status(session_factory, 603, "movie") == "added"
+
+
+def test_test_event_is_a_no_op(api):
+    client, _, sonarr = api
+    body = client.post("/api/hooks/sonarr", json=SONARR_TEST).json()
+    assert body == {"event": "Test", "tmdb_id": None, "mirrored": False, "watchlist_updated": 0}
+    sonarr.get_library_item.assert_not_called()
+
+
+def test_token_required_when_configured(api, monkeypatch):
+    client, _, _ = api
+    monkeypatch.setattr(settings, "webhook_token", "s3cret")
+
+    assert client.post("/api/hooks/sonarr", json=SONARR_TEST).status_code == 401
+    assert client.post("/api/hooks/sonarr?token=wrong", json=SONARR_TEST).status_code == 401
+    assert client.post("/api/hooks/sonarr?token=s3cret", json=SONARR_TEST).status_code == 200
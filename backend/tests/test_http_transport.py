@@ -0,0 +1,92 @@
+"""Tests for the shared outbound HTTP transport and startup prewarm."""
+import logging
+
+import httpx
+import pytest
+import respx
+
+import app.modules.clients as clients_module
+from app.config import SettingsSnapshot, settings
+from app.modules import http_transport
+from app.modules.clients import prewarm_clients
+from app.modules.http_transport import build_client
+
+
+@pytest.fixture(autouse=True)
+def reset_client_cache():
+    yield
+    clients_module._radarr_client = None
+    clients_module._sonarr_client = None
+
+
+async def test_build_client_uses_configured_limits(monkeypatch):
+    monkeypatch.setattr(settings, "http_max_connections", 7)
+    monkeypatch.setattr(settings, "http_max_keepalive_connections", 3)
+    monkeypatch.setattr(settings, "http_keepalive_expiry", 12.0)
+
+    client = build_client(5.0)
+    pool = client._transport._pool
+
+    assert pool._max_connections == 7
+    assert pool._max_keepalive_connections == 3
+    assert pool._keepalive_expiry == 12.0
+    assert client.timeout.connect == 5.0
+    await client.aclose()
+
+
+async def test_http2_falls_back_without_h2(monkeypatch, caplog):
+    monkeypatch.setattr(http_transport, "http2_available", lambda: False)
+    monkeypatch.setattr(http_transport, "_http2_warned", False)
+
+    with caplog.at_level(logging.WARNING):
+        client = build_client(5.0, http2=True)
+
+    assert client._transport._pool._http2 is False
+    assert any("h2" in rec.getMessage() for rec in caplog.records)
+    await client.aclose()
+
+
+async def test_prewarm_opens_connections_to_configured_upstreams(monkeypatch):
+    monkeypatch.setattr(
+        clients_module,
+        "get_settings_snapshot",
+        lambda: SettingsSnapshot(
+            tmdb_api_key="tmdb-key", radarr_url="http://radarr:7878", radarr_api_key="radarr-key"
+        ),
+    )
+    monkeypatch.setattr(clients_module, "settings_version", lambda: -2)
+
+    with respx.mock:
+        tmdb = respx.get(f"{settings.tmdb_base_url}/configuration").mock(
+            return_value=httpx.Response(200, json={})
+        )
+        radarr = respx.get("http://radarr:7878/api/v3/system/status").mock(
+            return_value=httpx.Response(200, json={})
+        )
+        sonarr = respx.get(url__regex=r".*/api/v3/system/status").mock(
+            return_value=httpx.Response(200, json={})
+        )
+        await prewarm_clients(connections=2, timeout=1.0)
+
+    assert tmdb.call_count == 2
+    assert radarr.call_count == 2
+    assert not sonarr.called  # no Sonarr key configured
+    await clients_module._radarr_client.close()
+
+
+async def test_prewarm_failure_does_not_raise(monkeypatch, caplog):
+    monkeypatch.setattr(
+        clients_module,
+        "get_settings_snapshot",
+        lambda: SettingsSnapshot(radarr_url="http://radarr:7878", radarr_api_key="radarr-key"),
+    )
+    monkeypatch.setattr(clients_module, "settings_version", lambda: -2)
+
+    with respx.mock, caplog.at_level(logging.INFO):
+        respx.get("http://radarr:7878/api/v3/system/status").mock(
+            side_effect=httpx.ConnectError("refused")
+        )
+        await prewarm_clients(connections=1, timeout=1.0)
+
+    assert any("Radarr connection prewarm failed" in rec.getMessage() for rec in caplog.records)
+    await clients_module._radarr_client.close()
@@ -0,0 +1,341 @@
+"""Tests for the local Radarr/Sonarr library mirror and the routes that read it."""
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.database import Base, _migrate_library_status, get_db
+from app.main import app
+from app.models import LibraryStatus, LibrarySyncState, Watchlist
+from app.modules.clients import get_radarr_client, get_sonarr_client
+from app.modules.library_mirror import (
+    MAX_INCREMENTAL_ITEMS,
+    LibraryMirror,
+    apply_library,
+    record_added,
+    sync_source,
+)
+from app.modules.radarr.client import RadarrClient
+from app.modules.sonarr.client import SonarrClient
+
+MOVIES = [
+    {"id": 1, "tmdbId": 603, "title": "The Matrix", "hasFile": True, "added": "2026-01-01T00:00:00Z",
+     "sizeOnDisk": 100, "images": [{"coverType": "poster", "remoteUrl": "http://img/603.jpg"}]},
+    {"id": 2, "tmdbId": 604, "title": "Reloaded", "hasFile": False, "added": "2026-01-03T00:00:00Z"},
+    {"id": 3, "tmdbId": 605, "title": "Revolutions", "hasFile": True, "added": "2026-01-02T00:00:00Z"},
+]
+SERIES = [
+    {"id": 7, "tmdbId": 1396, "tvdbId": 81189, "title": "Breaking Bad", "added": "2026-01-01T00:00:00Z",
+     "statistics": {"percentOfEpisodes": 100, "episodeFileCount": 62, "sizeOnDisk": 5}},
+]
+
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine)
+    yield sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture
+def db(session_factory):
+    session = session_factory()
+    yield session
+    session.close()
+
+
+# --- sync ---
+
+
+def test_apply_library_writes_only_changes(db):
+    assert apply_library(db, "radarr", MOVIES) == {"inserted": 3, "updated": 0, "deleted": 0, "unchanged": 0}
+
+    changed = [dict(MOVIES[0]), dict(MOVIES[1], hasFile=True)]  # 3 removed, 2 downloaded
+    assert apply_library(db, "radarr", changed) == {"inserted": 0, "updated": 1, "deleted": 1, "unchanged": 1}
+
+    rows = {r.arr_id: r for r in db.query(LibraryStatus).all()}
+    assert set(rows) == {1, 2}
+    assert rows[2].status == "available"
+    assert rows[1].poster_url == "http://img/603.jpg"
+    assert db.get(LibrarySyncState, "radarr").item_count == 2
+
+
+def test_sources_do_not_clobber_each_other(db):
+    apply_library(db, "radarr", MOVIES)
+    apply_library(db, "sonarr", SERIES)
+    apply_library(db, "sonarr", [])
+    assert db.query(LibraryStatus).filter_by(media_type="movie").count() == 3
+    assert db.query(LibraryStatus).filter_by(media_type="show").count() == 0
+
+
+async def test_failed_sync_keeps_mirror_and_records_error(session_factory):
+    client = _radarr(MOVIES)
+    assert (await sync_source("radarr", client, session_factory))["inserted"] == 3
+
+    client.get_history_since.side_effect = httpx.ConnectError("refused")
+    assert await sync_source("radarr", client, session_factory) is None
+
+    db = session_factory()
+    state = db.get(LibrarySyncState, "radarr")
+    assert "ConnectError" in state.last_error
+    assert state.last_synced_at is not None
+    assert LibraryMirror(db).is_ready("radarr")
+    assert db.query(LibraryStatus).count() == 3
+    db.close()
+
+
+def _radarr(library):
+    client = AsyncMock(spec=RadarrClient)
+    client.url = "http://radarr:7878"
+    client.history_item_field = "movieId"
+    client.invalidate_library = lambda: None
+    client.get_library.return_value = library
+    return client
+
+
+async def test_incremental_sync_refetches_only_touched_titles(session_factory):
+    client = _radarr(MOVIES)
+    await sync_source("radarr", client, session_factory)
+    client.get_library.reset_mock()
+
+    client.get_history_since.return_value = [
+        {"movieId": 2, "eventType": "downloadFolderImported", "date": "2030-01-01T10:00:00Z"},
+        {"movieId": 2, "eventType": "grabbed", "date": "2030-01-01T09:00:00Z"},
+        {"movieId": 3, "eventType": "movieFileDeleted", "date": "2030-01-01T11:00:00Z"},
+    ]
+    client.get_library_item.side_effect = lambda arr_id: (
+        dict(MOVIES[1], hasFile=True) if arr_id == 2 else None  # 3 was removed from Radarr
+    )
+
+    counts = await sync_source("radarr", client, session_factory)
+
+    assert counts == {"inserted": 0, "updated": 1, "deleted": 1, "unchanged": 0}
+    client.get_library.assert_not_called()
+    assert sorted(c.args[0] for c in client.get_library_item.await_args_list) == [2, 3]
+    db = session_factory()
+    assert LibraryMirror(db).statuses("movie", [604, 605]) == {604: "available", 605: None}
+    assert db.get(LibrarySyncState, "radarr").watermark == datetime(2030, 1, 1, 11, 0)
+    db.close()
+
+
+async def test_quiet_incremental_sync_makes_one_history_call(session_factory):
+    client = _radarr(MOVIES)
+    await sync_source("radarr", client, session_factory)
+    client.get_history_since.return_value = []
+
+    counts = await sync_source("radarr", client, session_factory)
+
+    assert counts["inserted"] == counts["updated"] == counts["deleted"] == 0
+    assert client.get_library.await_count == 1
+    client.get_library_item.assert_not_called()
+
+
+@pytest.mark.parametrize("field,age", [
+    ("last_full_sync_at", timedelta(days=1)),  # slow full-resync cadence elapsed
+    ("last_synced_at", timedelta(days=4)),     # polling gap: history may be pruned
+])
+async def test_full_resync_on_cadence_or_gap(session_factory, field, age):
+    client = _radarr(MOVIES)
+    await sync_source("radarr", client, session_factory)
+    db = session_factory()
+    state = db.get(LibrarySyncState, "radarr")
+    setattr(state, field, getattr(state, field) - age)
+    db.commit()
+    db.close()
+
+    await sync_source("radarr", client, session_factory)
+
+    assert client.get_library.await_count == 2
+    client.get_history_since.assert_not_called()
+
+
+async def test_changed_instance_url_forces_full_resync(session_factory):
+    client = _radarr(MOVIES)
+    await sync_source("radarr", client, session_factory)
+    client.url = "http://new-radarr:7878"
+    client.get_library.return_value = [MOVIES[0]]
+
+    counts = await sync_source("radarr", client, session_factory)
+
+    assert counts["deleted"] == 2
+    assert client.get_library.await_count == 2
+    client.get_history_since.assert_not_called()
+    db = session_factory()
+    assert db.get(LibrarySyncState, "radarr").instance_url == "http://new-radarr:7878"
+    db.close()
+
+
+async def test_too_many_changes_falls_back_to_full_listing(session_factory):
+    client = _radarr(MOVIES)
+    await sync_source("radarr", client, session_factory)
+    client.get_history_since.return_value = [
+        {"movieId": i, "date": "2030-01-01T00:00:00Z"} for i in range(1, MAX_INCREMENTAL_ITEMS + 2)
+    ]
+
+    await sync_source("radarr", client, session_factory)
+
+    assert client.get_library.await_count == 2
+    client.get_library_item.assert_not_called()
+
+
+def test_record_added_upserts_immediately(db):
+    record_added(db, "radarr", {"id": 9, "tmdbId": 700, "title": "New", "hasFile": False})
+    assert LibraryMirror(db).statuses("movie", [700]) == {700: "added"}
+
+
+# --- reads ---
+
+
+def test_mirror_not_ready_until_synced(db):
+    mirror = LibraryMirror(db)
+    assert mirror.is_ready("radarr") is False
+    apply_library(db, "radarr", MOVIES)
+    assert mirror.is_ready("radarr") is True
+    assert mirror.is_ready("sonarr") is False
+
+
+def test_mirror_unreadable_is_not_ready():
+    engine = create_engine("sqlite:///:memory:")  # no tables
+    db = sessionmaker(bind=engine)()
+    assert LibraryMirror(db).is_ready("radarr") is False
+    db.close()
+
+
+def test_mirror_reads(db):
+    apply_library(db, "radarr", MOVIES)
+    apply_library(db, "sonarr", SERIES)
+    mirror = LibraryMirror(db)
+
+    assert mirror.statuses("movie", [603, 604, 999]) == {603: "available", 604: "added", 999: None}
+    assert mirror.statuses("show", [1396]) == {1396: "available"}
+    assert sorted(mirror.tmdb_ids("movie")) == [603, 604, 605]
+    recent = mirror.recent("movie", 10)
+    assert [m["tmdbId"] for m in recent] == [605, 603]  # has-file only, newest first
+    assert recent[1]["images"] == [{"coverType": "poster", "remoteUrl": "http://img/603.jpg"}]
+
+
+# --- routes ---
+
+
+@pytest.fixture
+def api(session_factory):
+    def override_get_db():
+        session = session_factory()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    radarr = AsyncMock(spec=RadarrClient)
+    sonarr = AsyncMock(spec=SonarrClient)
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_radarr_client] = lambda: radarr
+    app.dependency_overrides[get_sonarr_client] = lambda: sonarr
+    yield TestClient(app), radarr, sonarr
+    app.dependency_overrides.clear()
+
+
+def test_routes_serve_from_mirror_without_calling_arr(api, session_factory):
+    client, radarr, sonarr = api
+    db = session_factory()
+    apply_library(db, "radarr", MOVIES)
+    apply_library(db, "sonarr", SERIES)
+    db.close()
+
+    batch = client.post("/api/radarr/status/batch", json={"tmdb_ids": [603, 999]}).json()
+    single = client.get("/api/sonarr/status/1396").json()
+    activity = client.get("/api/library/activity").json()
+
+    assert batch["statuses"] == {"603": "available", "999": None}
+    assert single["status"] == "available" and single["title"] == "Breaking Bad"
+    assert [m["title"] for m in activity["movies"]] == ["Revolutions", "The Matrix"]
+    assert activity["degraded"] == []
+    radarr.get_batch_status.assert_not_called()
+    sonarr.get_status.assert_not_called()
+    radarr.get_recent.assert_not_called()
+
+
+def test_routes_fall_back_to_live_before_first_sync(api):
+    client, radarr, _ = api
+    radarr.get_batch_status.return_value = {603: "added"}
+
+    batch = client.post("/api/radarr/status/batch", json={"tmdb_ids": [603]}).json()
+
+    assert batch["statuses"] == {"603": "added"}
+    radarr.get_batch_status.assert_awaited_once()
+
+
+def test_mirror_status_keeps_title_for_titles_not_in_library(api, session_factory):
+    client, radarr, _ = api
+    db = session_factory()
+    apply_library(db, "radarr", MOVIES)
+    db.add(Watchlist(tmdb_id=700, media_type="movie", title="On The Watchlist"))
+    db.commit()
+    db.close()
+    radarr.lookup_movie.return_value = {"title": "Looked Up"}
+
+    looked_up = client.get("/api/radarr/status/999").json()
+    from_watchlist = client.get("/api/radarr/status/700").json()
+    radarr.lookup_movie.side_effect = httpx.ConnectError("down")
+    unreachable = client.get("/api/radarr/status/998").json()
+
+    assert looked_up["status"] == "not_found" and looked_up["title"] == "Looked Up"
+    assert from_watchlist["status"] == "not_found" and from_watchlist["title"] == "On The Watchlist"
+    assert unreachable["status"] == "not_found" and unreachable["title"] is None
+    assert radarr.lookup_movie.await_count == 2  # not for the watchlist title
+    radarr.get_status.assert_not_called()
+
+
+def test_mirror_matches_series_without_tmdb_id_by_lookup(api, session_factory):
+    client, _, sonarr = api
+    unmatched = {"id": 8, "tvdbId": 121361, "title": "Game of Thrones",
+                 "added": "2026-01-02T00:00:00Z", "statistics": {"percentOfEpisodes": 50}}
+    db = session_factory()
+    apply_library(db, "sonarr", [*SERIES, unmatched])
+    db.close()
+    lookups = {1399: {"tvdbId": 121361, "title": "GoT"}}
+    sonarr.lookup_series.side_effect = lookups.get
+
+    single = client.get("/api/sonarr/status/1399").json()
+    batch = client.post("/api/sonarr/status/batch", json={"tmdb_ids": [1396, 1399, 5]}).json()
+
+    assert single["status"] == "added" and single["title"] == "Game of Thrones"
+    assert batch["statuses"] == {"1396": "available", "1399": "added", "5": None}
+    sonarr.get_batch_status.assert_not_called()
+
+
+def test_add_records_into_mirror(api, session_factory):
+    client, radarr, _ = api
+    radarr.add_movie.return_value = {"id": 11, "tmdbId": 800, "title": "Added", "hasFile": False}
+
+    assert client.post("/api/radarr/add", json={"tmdb_id": 800}).status_code == 200
+
+    db = session_factory()
+    assert LibraryMirror(db).statuses("movie", [800]) == {800: "added"}
+    db.close()
+
+
+# --- migration ---
+
+
+def test_migration_rebuilds_legacy_library_status():
+    engine = create_engine("sqlite:///:memory:", poolclass=StaticPool)
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE library_status (id INTEGER PRIMARY KEY, tmdb_id INTEGER)"))
+
+    _migrate_library_status(engine)
+    Base.metadata.create_all(bind=engine)
+    _migrate_library_status(engine)  # second run is a no-op
+
+    columns = {c["name"] for c in inspect(engine).get_columns("library_status")}
+    assert {"arr_id", "fingerprint", "poster_url"} <= columns
@@ -0,0 +1,116 @@
+"""Tests for the shared download-queue poller behind /api/library/queue/stream."""
+import asyncio
+import json
+
+from app.modules.library.queue_stream import MAX_PENDING_EVENTS, QueueBroadcaster
+
+
+def _parse(message: str) -> tuple[str, dict]:
+    event_line, data_line = message.strip().split("\n")
+    return event_line.removeprefix("event: "), json.loads(data_line.removeprefix("data: "))
+
+
+class FakeQueues:
+    """Scripted fetcher: returns the next queued result each poll (repeating the last)."""
+
+    def __init__(self, *results):
+        self.results = list(results)
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        return self.results.pop(0) if len(self.results) > 1 else self.results[0]
+
+
+MOVIE = {"id": 1, "status": "downloading", "sizeleft": 100, "timeleft": "00:10:00"}
+SHOW = {"id": 5, "status": "queued", "sizeleft": 40}
+
+
+async def test_first_poll_sends_snapshot_then_only_changes():
+    fetch = FakeQueues(
+        {"movies": [MOVIE], "shows": [SHOW]},
+        {"movies": [dict(MOVIE, sizeleft=50, timeleft="00:05:00")], "shows": [SHOW]},
+        {"movies": [], "shows": [SHOW]},
+    )
+    broadcaster = QueueBroadcaster(fetch=fetch, interval=3600)
+    queue = broadcaster.subscribe()
+    broadcaster._task.cancel()  # drive polls by hand
+
+    await broadcaster.poll_once()
+    event, data = _parse(queue.get_nowait())
+    assert event == "snapshot"
+    assert data == {"movies": [MOVIE], "shows": [SHOW], "degraded": []}
+
+    await broadcaster.poll_once()
+    event, data = _parse(queue.get_nowait())
+    assert event == "changes"
+    assert data["upserted"] == {"movies": [dict(MOVIE, sizeleft=50, timeleft="00:05:00")]}
+    assert data["removed"] == {}
+
+    await broadcaster.poll_once()
+    assert _parse(queue.get_nowait())[1]["removed"] == {"movies": [1]}
+
+    await broadcaster.poll_once()  # nothing changed: nothing sent
+    assert queue.empty()
+    broadcaster.unsubscribe(queue)
+
+
+async def test_failed_source_keeps_records_and_is_degraded():
+    fetch = FakeQueues({"movies": [MOVIE], "shows": [SHOW]}, {"movies": None, "shows": [SHOW]})
+    broadcaster = QueueBroadcaster(fetch=fetch, interval=3600)
+    queue = broadcaster.subscribe()
+    broadcaster._task.cancel()
+
+    await broadcaster.poll_once()
+    queue.get_nowait()
+    await broadcaster.poll_once()
+
+    event, data = _parse(queue.get_nowait())
+    assert event == "changes" and data["degraded"] == ["radarr"]
+    assert data["removed"] == {}
+    assert broadcaster.snapshot()["movies"] == [MOVIE]
+    broadcaster.unsubscribe(queue)
+
+
+async def test_subscribers_share_one_poller():
+    fetch = FakeQueues({"movies": [MOVIE], "shows": []})
+    broadcaster = QueueBroadcaster(fetch=fetch, interval=3600)
+
+    first = broadcaster.subscribe()
+    await asyncio.sleep(0)  # first poll
+    second = broadcaster.subscribe()  # joins late: gets the current snapshot immediately
+    third = broadcaster.subscribe()
+    await asyncio.sleep(0)
+
+    assert fetch.calls == 1
+    for queue in (first, second, third):
+        assert _parse(queue.get_nowait())[0] == "snapshot"
+
+    for queue in (first, second, third):
+        broadcaster.unsubscribe(queue)
+    assert broadcaster.subscriber_count == 0
+    assert broadcaster._task is None
+
+
+async def test_slow_subscriber_is_resynced_with_snapshot():
+    broadcaster = QueueBroadcaster(fetch=FakeQueues({"movies": [], "shows": []}), interval=3600)
+    queue = broadcaster.subscribe()
+    broadcaster._task.cancel()
+
+    for i in range(MAX_PENDING_EVENTS + 1):
+        broadcaster._publish(f"event: changes\ndata: {i}\n\n")
+
+    assert queue.qsize() == 1
+    assert _parse(queue.get_nowait())[0] == "snapshot"
+    broadcaster.unsubscribe(queue)
+
+
+async def test_stream_sends_keepalive_and_unsubscribes_on_close():
+    broadcaster = QueueBroadcaster(fetch=FakeQueues({"movies": [], "shows": []}), interval=3600)
+    stream = broadcaster.stream(keepalive=0.01)
+
+    assert (await anext(stream)).startswith("event: snapshot")
+    assert await anext(stream) == ": keepalive\n\n"
+    await stream.aclose()
+
+    assert broadcaster.subscriber_count == 0
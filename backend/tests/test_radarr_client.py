@@ -1,7 +1,14 @@
 """Tests for Radarr client."""
+import asyncio
+import json
+from datetime import datetime
+
+import httpx
 import pytest
+import respx
 from unittest.mock import AsyncMock, patch
 
+from app.modules.arr_base import QUEUE_PAGE_SIZE
 from app.modules.radarr.client import RadarrClient
 
 
@@ -125,3 +132,224 @@ async def test_lookup_movie_not_found(client):
         result = await client.lookup_movie(999)
 
     assert result is None
+
+
+# --- library snapshot ---
+
+LIBRARY = [
+    {"tmdbId": 1, "hasFile": True, "added": "2026-01-02"},
+    {"tmdbId": 2, "hasFile": False, "added": "2026-01-03"},
+]
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.mark.asyncio
+async def test_library_readers_share_one_snapshot(client):
+    with patch.object(client, "_get", new_callable=AsyncMock, return_value=LIBRARY) as mock_get:
+        statuses = await client.get_batch_status([1, 2, 3])
+        recent = await client.get_recent()
+        movies = await client.get_all_movies()
+
+    assert mock_get.await_count == 1
+    assert statuses == {1: "available", 2: "added", 3: None}
+    assert [m["tmdbId"] for m in recent] == [1]
+    assert movies is LIBRARY and [m["tmdbId"] for m in LIBRARY] == [1, 2]  # not sorted in place
+
+
+@pytest.mark.asyncio
+async def test_library_snapshot_expires_after_ttl():
+    clock = FakeClock()
+    client = RadarrClient(url="http://localhost:7878", api_key="k", library_ttl=60, clock=clock)
+    with patch.object(client, "_get", new_callable=AsyncMock, return_value=LIBRARY) as mock_get:
+        await client.get_all_movies()
+        clock.now = 59
+        await client.get_all_movies()
+        clock.now = 61
+        await client.get_all_movies()
+
+    assert mock_get.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_concurrent_library_reads_coalesce(client):
+    async def slow_get(endpoint, params=None):
+        await asyncio.sleep(0.01)
+        return LIBRARY
+
+    with patch.object(client, "_get", side_effect=slow_get) as mock_get:
+        results = await asyncio.gather(*[client.get_all_movies() for _ in range(5)])
+
+    assert mock_get.call_count == 1
+    assert all(r == LIBRARY for r in results)
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_write_invalidates_library_snapshot(client):
+    route = respx.get("http://localhost:7878/api/v3/movie").mock(
+        side_effect=[httpx.Response(200, json=[]), httpx.Response(200, json=LIBRARY)]
+    )
+    respx.post("http://localhost:7878/api/v3/movie").mock(return_value=httpx.Response(201, json={"id": 9}))
+
+    assert await client.get_all_movies() == []
+    await client._post("/movie", {"tmdbId": 2})
+    assert await client.get_all_movies() == LIBRARY
+    assert route.call_count == 2
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_fetch_racing_a_write_is_not_kept(client):
+    gate = asyncio.Event()
+
+    async def gated_get(endpoint, params=None):
+        await gate.wait()
+        return LIBRARY
+
+    with patch.object(client, "_get", side_effect=gated_get) as mock_get:
+        pending = asyncio.ensure_future(client.get_all_movies())
+        await asyncio.sleep(0)
+        client.invalidate_library()  # e.g. an add finished while the listing was in flight
+        gate.set()
+        assert await pending == LIBRARY
+        await client.get_all_movies()
+
+    assert mock_get.call_count == 2
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_history_since_and_single_item_fetch(client):
+    history = respx.get("http://localhost:7878/api/v3/history/since").mock(
+        return_value=httpx.Response(200, json=[{"movieId": 1}])
+    )
+    respx.get("http://localhost:7878/api/v3/movie/1").mock(return_value=httpx.Response(200, json={"id": 1}))
+    respx.get("http://localhost:7878/api/v3/movie/2").mock(return_value=httpx.Response(404))
+
+    assert await client.get_history_since(datetime(2026, 1, 2, 3, 4, 5)) == [{"movieId": 1}]
+    assert history.calls[0].request.url.params["date"] == "2026-01-02T03:04:05Z"
+    assert await client.get_library_item(1) == {"id": 1}
+    assert await client.get_library_item(2) is None
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_get_queue_fetches_every_page_concurrently(client):
+    total = QUEUE_PAGE_SIZE * 2 + 5
+    calls = []
+
+    async def paged_get(endpoint, params=None):
+        calls.append(params)
+        start = (params["page"] - 1) * QUEUE_PAGE_SIZE
+        ids = range(start, min(start + QUEUE_PAGE_SIZE, total))
+        # Page 3 repeats the last record of page 2, as when an item completes mid-fetch.
+        if params["page"] == 3:
+            ids = [start - 1, *ids]
+        return {"totalRecords": total, "records": [{"id": i} for i in ids]}
+
+    with patch.object(client, "_get", side_effect=paged_get):
+        queue = await client.get_queue()
+
+    assert sorted(p["page"] for p in calls) == [1, 2, 3]
+    assert all(p["includeMovie"] is True for p in calls)
+    assert queue["totalRecords"] == total
+    assert [r["id"] for r in queue["records"]] == list(range(total))
+
+
+@pytest.mark.asyncio
+async def test_get_queue_slim_omits_embedded_movie(client):
+    with patch.object(client, "_get", new_callable=AsyncMock) as mock_get:
+        mock_get.return_value = {"totalRecords": 1, "records": [{"id": 1}]}
+        queue = await client.get_queue(slim=True)
+
+    assert mock_get.await_count == 1
+    assert "includeMovie" not in mock_get.await_args.args[1]
+    assert queue == {"totalRecords": 1, "records": [{"id": 1}]}
+
+
+@pytest.mark.asyncio
+async def test_adds_share_cached_root_folders_and_profiles():
+    clock = FakeClock()
+    client = RadarrClient(url="http://localhost:7878", api_key="k", metadata_ttl=60, clock=clock)
+    responses = {"/rootfolder": [{"path": "/movies"}], "/qualityprofile": [{"id": 4, "name": "HD"}]}
+    calls = []
+
+    async def fake_get(endpoint, params=None):
+        calls.append(endpoint)
+        if endpoint == "/movie":
+            return []
+        if endpoint == "/movie/lookup":
+            return [{"tmdbId": params["term"].split(":")[1], "title": "T"}]
+        return responses[endpoint]
+
+    with patch.object(client, "_get", side_effect=fake_get), \
+            patch.object(client, "_post", new_callable=AsyncMock) as mock_post:
+        await asyncio.gather(*[client.add_movie(tmdb_id=i) for i in range(5)])
+        assert calls.count("/rootfolder") == calls.count("/qualityprofile") == 1
+        assert mock_post.await_args.args[1]["qualityProfileId"] == 4
+
+        client.invalidate_metadata()
+        await client.add_movie(tmdb_id=9)
+        clock.now = 61
+        await client.add_movie(tmdb_id=10)
+
+    assert calls.count("/rootfolder") == 3
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_add_movies_bulk_imports_in_chunks(client, monkeypatch):
+    monkeypatch.setattr("app.modules.arr_base.IMPORT_CHUNK_SIZE", 2)
+    base = "http://localhost:7878/api/v3"
+    respx.get(f"{base}/rootfolder").mock(return_value=httpx.Response(200, json=[{"path": "/movies"}]))
+    respx.get(f"{base}/qualityprofile").mock(return_value=httpx.Response(200, json=[{"id": 1}]))
+    listing = respx.get(f"{base}/movie").mock(
+        return_value=httpx.Response(200, json=[{"id": 1, "tmdbId": 10, "title": "Owned"}])
+    )
+
+    def lookup(request):
+        tmdb_id = int(request.url.params["term"].split(":")[1])
+        return httpx.Response(200, json=[] if tmdb_id == 13 else [{"tmdbId": tmdb_id, "title": str(tmdb_id)}])
+
+    lookups = respx.get(f"{base}/movie/lookup").mock(side_effect=lookup)
+    imports = respx.post(f"{base}/movie/import").mock(return_value=httpx.Response(200, json=[]))
+
+    added, failed = await client.add_movies([10, 11, 12, 13, 14])
+
+    assert sorted(added) == [11, 12, 14]
+    assert failed == {10: "Movie already in Radarr library: Owned", 13: "Movie not found: 13"}
+    assert listing.call_count == 1 and lookups.call_count == 4
+    assert imports.call_count == 2  # [11, 12] then [14]
+    payload = json.loads(imports.calls[0].request.content)
+    assert [m["tmdbId"] for m in payload] == [11, 12]
+    assert payload[0]["addOptions"] == {"searchForMovie": True}
+    await client.close()
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_add_movies_rejected_chunk_retries_title_by_title(client):
+    base = "http://localhost:7878/api/v3"
+    respx.get(f"{base}/rootfolder").mock(return_value=httpx.Response(200, json=[{"path": "/movies"}]))
+    respx.get(f"{base}/qualityprofile").mock(return_value=httpx.Response(200, json=[{"id": 1}]))
+    respx.get(f"{base}/movie").mock(return_value=httpx.Response(200, json=[]))
+    respx.get(f"{base}/movie/lookup").mock(
+        side_effect=lambda r: httpx.Response(200, json=[{"tmdbId": int(r.url.params["term"][5:])}])
+    )
+    respx.post(f"{base}/movie/import").mock(return_value=httpx.Response(400, json=[]))
+    respx.post(f"{base}/movie").mock(
+        side_effect=lambda r: httpx.Response(400 if json.loads(r.content)["tmdbId"] == 2 else 201, json={})
+    )
+
+    added, failed = await client.add_movies([1, 2, 3])
+
+    assert added == [1, 3]
+    assert list(failed) == [2] and failed[2].startswith("Radarr add failed")
+    await client.close()
@@ -0,0 +1,191 @@
+"""Tests for the shared token-bucket limiter and TMDB 429 backoff."""
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+import respx
+
+from app.modules.discovery.tmdb_client import TMDBAPIError, TMDBClient
+from app.modules.ratelimit import TokenBucket, backoff_delay, retry_after_seconds
+
+BASE = "https://api.test.com/3"
+
+
+class FakeClock:
+    """Monotonic clock advanced only by FakeClock.sleep."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps: list[float] = []
+
+    def __call__(self):
+        return self.now
+
+    async def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+# --- TokenBucket ---
+
+
+async def test_burst_passes_without_waiting():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=10, burst=5, clock=clock, sleep=clock.sleep)
+
+    for _ in range(5):
+        await bucket.acquire()
+
+    assert clock.sleeps == []
+
+
+async def test_callers_beyond_burst_are_queued_fifo():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=10, burst=1, clock=clock, sleep=clock.sleep)
+
+    delays = [bucket.reserve() for _ in range(4)]
+
+    assert delays == pytest.approx([0.0, 0.1, 0.2, 0.3])
+
+
+async def test_tokens_refill_over_time():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=10, burst=2, clock=clock, sleep=clock.sleep)
+    bucket.reserve()
+    bucket.reserve()
+
+    clock.now += 1.0  # refills to burst, not beyond
+
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == pytest.approx(0.1)
+
+
+def test_penalize_pushes_back_next_acquisition():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=10, burst=10, clock=clock, sleep=clock.sleep)
+
+    bucket.penalize(2.0)
+
+    assert bucket.reserve() == pytest.approx(2.0)
+
+
+def test_concurrent_penalties_do_not_add_up():
+    """40 simultaneous 429s with Retry-After: 1 block the bucket for ~1s, not ~40s."""
+    clock = FakeClock()
+    bucket = TokenBucket(rate=40, burst=40, clock=clock, sleep=clock.sleep)
+
+    for _ in range(40):
+        bucket.penalize(1.0)
+
+    assert bucket.reserve() == pytest.approx(1.0)
+
+
+def test_penalty_extends_to_latest_deadline():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=10, burst=10, clock=clock, sleep=clock.sleep)
+
+    bucket.penalize(3.0)
+    clock.now += 1.0
+    bucket.penalize(1.0)  # ends earlier than the first: no change
+
+    assert bucket.reserve() == pytest.approx(2.0)
+
+
+def test_rate_must_be_positive():
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0)
+
+
+# --- header / backoff helpers ---
+
+
+def test_retry_after_parses_seconds_and_http_date():
+    assert retry_after_seconds("3") == 3.0
+    assert retry_after_seconds("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0  # in the past
+    assert retry_after_seconds(None) is None
+    assert retry_after_seconds("soon") is None
+
+
+def test_backoff_delay_is_jittered_and_capped():
+    for attempt in range(10):
+        delay = backoff_delay(attempt, base=0.5, cap=4.0)
+        assert 0 <= delay <= min(4.0, 0.5 * 2 ** attempt)
+
+
+# --- TMDBClient 429 handling ---
+
+
+@respx.mock
+async def test_429_is_retried_honoring_retry_after():
+    tmdb = TMDBClient(api_key="k", base_url=BASE)
+    route = respx.get(f"{BASE}/movie/1").mock(
+        side_effect=[
+            httpx.Response(429, headers={"Retry-After": "2"}),
+            httpx.Response(200, json={"id": 1}),
+        ]
+    )
+
+    with patch("asyncio.sleep", new_callable=AsyncMock) as sleep:
+        assert await tmdb.get_details(1, "movie") == {"id": 1}
+
+    assert route.call_count == 2
+    sleep.assert_awaited_once_with(2.0)
+    await tmdb.close()
+
+
+@respx.mock
+async def test_429_penalizes_shared_limiter():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=10, burst=10, clock=clock, sleep=clock.sleep)
+    tmdb = TMDBClient(api_key="k", base_url=BASE, rate_limiter=bucket)
+    respx.get(f"{BASE}/movie/1").mock(
+        side_effect=[httpx.Response(429, headers={"Retry-After": "1"}), httpx.Response(200, json={})]
+    )
+
+    with patch("asyncio.sleep", new_callable=AsyncMock) as sleep:
+        await tmdb.get_details(1, "movie")
+
+    # The retry waited out the penalty on the shared bucket once, with no extra sleep.
+    assert clock.sleeps == [pytest.approx(1.0)]
+    sleep.assert_not_awaited()
+    await tmdb.close()
+
+
+@respx.mock
+async def test_429_gives_up_after_max_retries():
+    tmdb = TMDBClient(api_key="k", base_url=BASE, max_retries=2, backoff_base=0)
+    route = respx.get(f"{BASE}/movie/1").mock(return_value=httpx.Response(429))
+
+    with pytest.raises(TMDBAPIError) as exc:
+        await tmdb.get_details(1, "movie")
+
+    assert exc.value.status_code == 429
+    assert route.call_count == 3
+    await tmdb.close()
+
+
+@respx.mock
+async def test_429_with_excessive_retry_after_fails_fast():
+    tmdb = TMDBClient(api_key="k", base_url=BASE)
+    route = respx.get(f"{BASE}/movie/1").mock(
+        return_value=httpx.Response(429, headers={"Retry-After": "3600"})
+    )
+
+    with pytest.raises(TMDBAPIError):
+        await tmdb.get_details(1, "movie")
+
+    assert route.call_count == 1
+    await tmdb.close()
+
+
+@respx.mock
+async def test_other_errors_are_not_retried():
+    tmdb = TMDBClient(api_key="k", base_url=BASE, backoff_base=0)
+    route = respx.get(f"{BASE}/movie/1").mock(return_value=httpx.Response(500))
+
+    with pytest.raises(TMDBAPIError):
+        await tmdb.get_details(1, "movie")
+
+    assert route.call_count == 1
+    await tmdb.close()
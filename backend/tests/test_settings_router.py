@@ -1,6 +1,7 @@
 """Tests for Settings API router."""
 import os
 import pytest
+from unittest.mock import patch
 from fastapi.testclient import TestClient
 from app.main import app
 from app.database import init_db
@@ -47,3 +48,11 @@ def test_test_connection_invalid_service():
         json={"service": "invalid"}
     )
     assert response.status_code == 422
+
+
+def test_update_settings_drops_cached_arr_metadata():
+    """PUT /api/settings should drop cached *arr root folders/profiles."""
+    with patch("app.modules.settings.router.invalidate_arr_metadata") as invalidate:
+        response = client.put("/api/settings", json={"radarr_root_folder": "/movies"})
+    assert response.status_code == 200
+    invalidate.assert_called_once()
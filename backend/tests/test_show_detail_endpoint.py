@@ -3,12 +3,14 @@ import pytest
 from fastapi.testclient import TestClient
 from unittest.mock import AsyncMock, patch
 
+from app.config import SettingsSnapshot, get_settings_snapshot
 from app.main import app
 
 
 @pytest.fixture
 def client():
-    return TestClient(app)
+    yield TestClient(app)
+    app.dependency_overrides.clear()
 
 
 class TestGetShowDetail:
@@ -52,13 +54,11 @@ class TestGetShowDetail:
             },
         }
 
+        app.dependency_overrides[get_settings_snapshot] = lambda: SettingsSnapshot(streaming_region="US")
         with patch(
             "app.modules.clients.tmdb_client.get_show_detail",
             new_callable=AsyncMock,
-        ) as mock, patch(
-            "app.modules.discovery.router.get_setting",
-            return_value="US",
-        ):
+        ) as mock:
             mock.return_value = mock_response
             response = client.get("/api/discover/shows/1396")
 
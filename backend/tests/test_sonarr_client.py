@@ -171,3 +171,93 @@ async def test_lookup_series_not_found(client):
         result = await client.lookup_series(999)
 
     assert result is None
+
+
+@pytest.mark.asyncio
+async def test_series_library_snapshot_shared_and_dropped_on_write(client):
+    library = [{"tvdbId": 5, "added": "2026-01-01", "statistics": {"percentOfEpisodes": 100}}]
+    with patch.object(client, "_get", new_callable=AsyncMock, return_value=library) as mock_get:
+        await client.get_all_series()
+        assert await client.get_recent() == library
+        client.invalidate_library()
+        await client.get_all_series()
+
+    assert [c.args[0] for c in mock_get.await_args_list] == ["/series", "/series"]
+
+
+@pytest.mark.asyncio
+async def test_batch_status_resolves_by_tmdb_id_without_lookups(client):
+    library = [
+        {"tmdbId": 1396, "tvdbId": 81189, "statistics": {"percentOfEpisodes": 100}},
+        {"tmdbId": 1399, "tvdbId": 121361, "statistics": {"percentOfEpisodes": 40}},
+    ]
+    with patch.object(client, "_get", new_callable=AsyncMock, return_value=library) as mock_get:
+        statuses = await client.get_batch_status([1396, 1399, 42])
+
+    assert statuses == {1396: "available", 1399: "added", 42: None}
+    mock_get.assert_awaited_once_with("/series")
+
+
+@pytest.mark.asyncio
+async def test_batch_status_falls_back_to_lookup_for_series_without_tmdb_id(client):
+    library = [
+        {"tmdbId": 1396, "tvdbId": 81189, "statistics": {"percentOfEpisodes": 100}},
+        {"tvdbId": 555, "statistics": {"percentOfEpisodes": 10}},  # unmatched in Sonarr
+    ]
+    client.lookup_series = AsyncMock(side_effect=lambda tid: {"tvdbId": 555} if tid == 77 else None)
+    with patch.object(client, "_get", new_callable=AsyncMock, return_value=library):
+        statuses = await client.get_batch_status([1396, 77, 42])
+
+    assert statuses == {1396: "available", 77: "added", 42: None}
+    assert sorted(c.args[0] for c in client.lookup_series.await_args_list) == [42, 77]
+
+
+@pytest.mark.asyncio
+async def test_add_series_many_dedupes_against_one_listing(client):
+    library = [{"id": 1, "tvdbId": 500, "title": "Owned"}]  # no tmdbId: matched via lookup tvdbId
+
+    async def fake_get(endpoint, params=None):
+        if endpoint == "/rootfolder":
+            return [{"path": "/tv"}]
+        if endpoint == "/qualityprofile":
+            return [{"id": 3}]
+        if endpoint == "/series":
+            return library
+        tmdb_id = int(params["term"].split(":")[1])
+        return [{"tvdbId": 500 if tmdb_id == 1 else tmdb_id, "title": str(tmdb_id),
+                 "seasons": [{"seasonNumber": 0}, {"seasonNumber": 1}, {"seasonNumber": 2}]}]
+
+    with patch.object(client, "_get", side_effect=fake_get) as mock_get, \
+            patch.object(client, "_post", new_callable=AsyncMock) as mock_post:
+        added, failed = await client.add_series_many({1: None, 2: [2], 3: None})
+
+    assert added == [2, 3]
+    assert failed == {1: "Series already in Sonarr library: Owned"}
+    assert [c.args[0] for c in mock_get.call_args_list].count("/series") == 1
+    endpoint, payload = mock_post.await_args.args
+    assert endpoint == "/series/import"
+    assert [s["monitored"] for s in payload[0]["seasons"]] == [False, False, True]
+    assert payload[1]["qualityProfileId"] == 3 and payload[1]["rootFolderPath"] == "/tv"
+
+
+async def test_add_series_many_skips_lookup_for_series_owned_by_tmdb_id(client):
+    library = [{"id": 1, "tmdbId": 1, "tvdbId": 500, "title": "Owned"}]
+
+    async def fake_get(endpoint, params=None):
+        if endpoint == "/rootfolder":
+            return [{"path": "/tv"}]
+        if endpoint == "/qualityprofile":
+            return [{"id": 3}]
+        if endpoint == "/series":
+            return library
+        tmdb_id = int(params["term"].split(":")[1])
+        return [{"tvdbId": tmdb_id, "title": str(tmdb_id), "seasons": []}]
+
+    with patch.object(client, "_get", side_effect=fake_get) as mock_get, \
+            patch.object(client, "_post", new_callable=AsyncMock):
+        added, failed = await client.add_series_many({1: None, 2: None})
+
+    assert added == [2]
+    assert failed == {1: "Series already in Sonarr library: Owned"}
+    lookups = [c.args[1]["term"] for c in mock_get.call_args_list if c.args[0] == "/series/lookup"]
+    assert lookups == ["tmdb:2"]
@@ -0,0 +1,339 @@
+"""Tests for the TMDB response caches (in-process LRU + media_cache read-through)."""
+import asyncio
+from datetime import timedelta
+
+import httpx
+import pytest
+import respx
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.database import Base, _migrate_media_cache
+from app.models import MediaCache
+from app.modules.discovery.cache import (
+    MEMORY_TTLS,
+    MemoryResponseCache,
+    PersistentResponseCache,
+    cache_key,
+    classify_endpoint,
+)
+from app.modules.discovery.tmdb_client import TMDBAPIError, TMDBClient
+
+BASE = "https://api.test.com/3"
+
+
+def _make_engine():
+    return create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+
+
+@pytest.fixture
+def session_factory():
+    engine = _make_engine()
+    Base.metadata.create_all(bind=engine)
+    yield sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture
+def cache(session_factory):
+    return PersistentResponseCache(session_factory)
+
+
+@pytest.fixture
+def tmdb(cache):
+    return TMDBClient(api_key="k", base_url=BASE, cache=cache)
+
+
+# --- classification / keys ---
+
+
+@pytest.mark.parametrize(
+    "endpoint,params,expected",
+    [
+        ("/trending/movie/week", {"page": 1}, "trending"),
+        ("/genre/tv/list", None, "genres"),
+        ("/movie/603", None, "details"),
+        ("/tv/1396", None, "details"),
+        ("/movie/603/credits", None, "credits"),
+        ("/movie/603/watch/providers", None, "providers"),
+        ("/movie/603", {"append_to_response": "credits,videos"}, "details"),
+        ("/movie/603", {"append_to_response": "credits,videos,recommendations,watch/providers"}, "providers"),
+        ("/person/31", {"append_to_response": "combined_credits"}, "details"),
+        ("/search/multi", {"query": "x"}, "browse"),
+        ("/discover/movie", {"page": 1}, "browse"),
+        ("/movie/603/recommendations", None, "browse"),
+        ("/tv/1396/similar", None, "browse"),
+        ("/configuration", None, None),
+    ],
+)
+def test_classify_endpoint(endpoint, params, expected):
+    assert classify_endpoint(endpoint, params) == expected
+
+
+def test_cache_key_strips_api_key_and_sorts_params():
+    a = cache_key("/trending/movie/week", {"page": 2, "api_key": "secret", "language": "en"})
+    b = cache_key("/trending/movie/week", {"language": "en", "page": 2})
+    assert a == b
+    assert "secret" not in a
+    assert cache_key("/movie/603") == "/movie/603"
+
+
+# --- PersistentResponseCache ---
+
+
+def test_set_then_get_round_trips(cache):
+    cache.set("/movie/603", "details", {"id": 603, "title": "The Matrix"})
+    assert cache.get("/movie/603") == {"id": 603, "title": "The Matrix"}
+
+
+def test_set_overwrites_existing_key(cache):
+    cache.set("/movie/603", "details", {"v": 1})
+    cache.set("/movie/603", "details", {"v": 2})
+    assert cache.get("/movie/603") == {"v": 2}
+
+
+def test_expired_entry_is_a_miss_and_purged(cache, session_factory):
+    cache.set("/movie/603", "details", {"id": 603})
+    db = session_factory()
+    row = db.query(MediaCache).one()
+    row.expires_at = row.cached_at - timedelta(seconds=1)
+    db.commit()
+    db.close()
+
+    assert cache.get("/movie/603") is None
+    assert cache.purge_expired() == 1
+
+
+def test_db_error_degrades_to_miss():
+    engine = _make_engine()  # no tables created
+    broken = PersistentResponseCache(sessionmaker(bind=engine))
+    assert broken.get("/movie/603") is None
+    broken.set("/movie/603", "details", {"id": 603})  # must not raise
+
+
+# --- TMDBClient read-through ---
+
+
+@respx.mock
+async def test_detail_served_from_cache_after_first_fetch(tmdb):
+    route = respx.get(f"{BASE}/movie/603").mock(
+        return_value=httpx.Response(200, json={"id": 603, "title": "The Matrix"})
+    )
+
+    first = await tmdb.get_details(603, "movie")
+    second = await tmdb.get_details(603, "movie")
+
+    assert first == second == {"id": 603, "title": "The Matrix"}
+    assert route.call_count == 1
+    await tmdb.close()
+
+
+@respx.mock
+async def test_cache_survives_new_client_instance(cache):
+    route = respx.get(f"{BASE}/genre/movie/list").mock(
+        return_value=httpx.Response(200, json={"genres": []})
+    )
+
+    await TMDBClient(api_key="a", base_url=BASE, cache=cache).get_movie_genres()
+    await TMDBClient(api_key="b", base_url=BASE, cache=cache).get_movie_genres()
+
+    assert route.call_count == 1
+
+
+@respx.mock
+async def test_browse_endpoint_is_never_persisted(tmdb):
+    route = respx.get(f"{BASE}/search/multi").mock(
+        return_value=httpx.Response(200, json={"results": [], "page": 1})
+    )
+
+    await tmdb.search("matrix")
+    await tmdb.search("matrix")
+
+    assert route.call_count == 2
+    await tmdb.close()
+
+
+@respx.mock
+async def test_errors_are_not_cached(tmdb):
+    route = respx.get(f"{BASE}/movie/1").mock(
+        side_effect=[httpx.Response(404, text="nope"), httpx.Response(200, json={"id": 1})]
+    )
+
+    with pytest.raises(TMDBAPIError):
+        await tmdb.get_details(1, "movie")
+    assert await tmdb.get_details(1, "movie") == {"id": 1}
+    assert route.call_count == 2
+    await tmdb.close()
+
+
+# --- legacy table migration ---
+
+
+def test_migration_rebuilds_legacy_media_cache():
+    engine = _make_engine()
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE media_cache (id INTEGER PRIMARY KEY, tmdb_id INTEGER)"))
+
+    _migrate_media_cache(engine)
+    Base.metadata.create_all(bind=engine)
+    _migrate_media_cache(engine)  # second run is a no-op
+
+    columns = {c["name"] for c in inspect(engine).get_columns("media_cache")}
+    assert {"cache_key", "payload", "expires_at"} <= columns
+    assert "tmdb_id" not in columns
+
+
+# --- MemoryResponseCache ---
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_memory_cache_evicts_lru_by_bytes():
+    mem = MemoryResponseCache(max_bytes=70)  # each payload is 31 bytes
+    mem.set("a", "details", {"blob": "x" * 20})
+    mem.set("b", "details", {"blob": "y" * 20})
+    assert mem.get("a") is not None  # touch a -> b becomes LRU
+    mem.set("c", "details", {"blob": "z" * 20})
+
+    assert mem.get("b") is None
+    assert mem.get("a") is not None
+    assert mem.get("c") is not None
+    stats = mem.stats()
+    assert stats["evictions"] == 1
+    assert stats["bytes"] <= 70
+
+
+def test_memory_cache_skips_oversized_payload():
+    mem = MemoryResponseCache(max_bytes=10)
+    mem.set("big", "details", {"blob": "x" * 100})
+    assert mem.stats()["entries"] == 0
+
+
+def test_memory_cache_ttl_per_class():
+    clock = FakeClock()
+    mem = MemoryResponseCache(max_bytes=1000, clock=clock)
+    mem.set("/search/multi?query=x", "browse", {"r": 1})
+    mem.set("/movie/1", "details", {"r": 2})
+    clock.now = MEMORY_TTLS["browse"] + 1
+
+    assert mem.get("/search/multi?query=x") is None
+    assert mem.get("/movie/1") == {"r": 2}
+    assert mem.stats()["expirations"] == 1
+
+
+def test_memory_cache_hits_are_mutation_safe():
+    mem = MemoryResponseCache(max_bytes=1000)
+    mem.set("/movie/1", "details", {"id": 1})
+    first = mem.get("/movie/1")
+    first["watch_providers"] = {}
+    assert mem.get("/movie/1") == {"id": 1}
+    assert mem.stats()["hits"] == 2
+    assert mem.stats()["misses"] == 0
+
+
+@respx.mock
+async def test_memory_layer_answers_before_persistent(cache):
+    mem = MemoryResponseCache(max_bytes=10_000)
+    tmdb = TMDBClient(api_key="k", base_url=BASE, cache=cache, memory_cache=mem)
+    route = respx.get(f"{BASE}/search/multi").mock(
+        return_value=httpx.Response(200, json={"results": [], "page": 1})
+    )
+
+    await tmdb.search("matrix")
+    await tmdb.search("matrix")
+
+    assert route.call_count == 1
+    assert mem.stats()["hits"] == 1
+    assert cache.get(cache_key("/search/multi", {"query": "matrix", "page": 1})) is None
+    await tmdb.close()
+
+
+@respx.mock
+async def test_memory_key_ignores_api_key_rotation():
+    mem = MemoryResponseCache(max_bytes=10_000)
+    tmdb = TMDBClient(api_key="old", base_url=BASE, memory_cache=mem)
+    route = respx.get(f"{BASE}/trending/movie/week").mock(
+        return_value=httpx.Response(200, json={"results": []})
+    )
+
+    await tmdb.get_trending_movies()
+    tmdb.api_key = "new"
+    await tmdb.get_trending_movies()
+
+    assert route.call_count == 1
+    await tmdb.close()
+
+
+def test_cache_stats_endpoint_reports_counters():
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+
+    response = TestClient(app).get("/api/discover/cache/stats")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["enabled"] is True
+    assert {"hits", "misses", "evictions", "bytes", "max_bytes"} <= data.keys()
+
+
+# --- single-flight coalescing ---
+
+
+@respx.mock
+async def test_concurrent_identical_calls_share_one_request():
+    tmdb = TMDBClient(api_key="k", base_url=BASE)
+    route = respx.get(f"{BASE}/movie/603").mock(
+        return_value=httpx.Response(200, json={"id": 603, "watch/providers": {"results": {}}})
+    )
+
+    results = await asyncio.gather(*[tmdb.get_details(603, "movie") for _ in range(10)])
+
+    assert route.call_count == 1
+    assert all(r["id"] == 603 for r in results)
+    # Each caller owns its copy: the detail routes pop keys in place.
+    results[0].pop("watch/providers")
+    assert "watch/providers" in results[1]
+    assert tmdb._inflight == {}
+    await tmdb.close()
+
+
+@respx.mock
+async def test_single_flight_propagates_errors_to_every_waiter():
+    tmdb = TMDBClient(api_key="k", base_url=BASE)
+    route = respx.get(f"{BASE}/trending/movie/week").mock(return_value=httpx.Response(500, text="boom"))
+
+    results = await asyncio.gather(
+        *[tmdb.get_trending_movies() for _ in range(3)], return_exceptions=True
+    )
+
+    assert route.call_count == 1
+    assert all(isinstance(r, TMDBAPIError) for r in results)
+    assert tmdb._inflight == {}
+    await tmdb.close()
+
+
+@respx.mock
+async def test_sequential_uncached_calls_are_not_coalesced():
+    tmdb = TMDBClient(api_key="k", base_url=BASE)
+    route = respx.get(f"{BASE}/search/multi").mock(
+        return_value=httpx.Response(200, json={"results": []})
+    )
+
+    await tmdb.search("x")
+    await tmdb.search("x")
+
+    assert route.call_count == 2
+    await tmdb.close()
+
@@ -1,4 +1,6 @@
 """Tests for TMDB client."""
+import asyncio
+
 import pytest
 from unittest.mock import AsyncMock, patch, MagicMock
 import httpx
@@ -308,3 +310,38 @@ async def test_get_show_detail_appends_watch_providers(tmdb_client):
     args, kwargs = mock_get.call_args
     params = kwargs.get("params", args[1] if len(args) > 1 else {})
     assert "watch/providers" in params["append_to_response"]
+
+
+# --- bulk detail fetcher ---
+
+
+async def test_get_details_many_bounds_concurrency_and_reports_failures():
+    tmdb = TMDBClient(api_key="k", base_url="https://api.test.com/3")
+    in_flight = 0
+    peak = 0
+
+    async def fake_get_details(tmdb_id, media_type):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0)
+        in_flight -= 1
+        if tmdb_id % 10 == 0:
+            raise TMDBAPIError("boom", status_code=500)
+        return {"id": tmdb_id}
+
+    tmdb.get_details = fake_get_details
+    keys = [(i, "movie") for i in range(1, 51)] + [(1, "movie")]  # duplicate fetched once
+
+    results = [r async for r in tmdb.get_details_many(keys, concurrency=4)]
+
+    assert peak <= 4
+    assert len(results) == 50
+    failed = {key for key, details, error in results if error is not None}
+    assert failed == {(i, "movie") for i in range(10, 51, 10)}
+    assert all(details == {"id": key[0]} for key, details, error in results if error is None)
+
+
+async def test_get_details_many_empty():
+    tmdb = TMDBClient(api_key="k", base_url="https://api.test.com/3")
+    assert [r async for r in tmdb.get_details_many([])] == []
@@ -6,6 +6,7 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
+from app.config import SettingsSnapshot, get_settings_snapshot
 from app.models import Watchlist  # noqa: F401
 from app.database import Base, get_db
 from app.main import app as fastapi_app
@@ -207,10 +208,9 @@ def test_batch_process_handles_errors(mock_add_movie, client):
 
 
 @patch("app.modules.radarr.client.RadarrClient.add_movie")
-@patch("app.modules.watchlist.service.get_setting")
-def test_batch_process_movie_quality_profile(mock_get_setting, mock_add_movie, client):
+def test_batch_process_movie_quality_profile(mock_add_movie, client):
     """Saved radarr quality profile id flows as int into add_movie."""
-    mock_get_setting.side_effect = lambda k: {"radarr_quality_profile_id": "4"}.get(k)
+    fastapi_app.dependency_overrides[get_settings_snapshot] = lambda: SettingsSnapshot(radarr_quality_profile_id="4")
     mock_add_movie.return_value = {"id": 1, "title": "Test"}
 
     client.post("/api/watchlist", json={"tmdb_id": 700, "media_type": "movie"})
@@ -223,10 +223,9 @@ def test_batch_process_movie_quality_profile(mock_get_setting, mock_add_movie, c
 
 
 @patch("app.modules.sonarr.client.SonarrClient.add_series")
-@patch("app.modules.watchlist.service.get_setting")
-def test_batch_process_show_quality_profile(mock_get_setting, mock_add_series, client):
+def test_batch_process_show_quality_profile(mock_add_series, client):
     """Saved sonarr quality profile id flows as int into add_series."""
-    mock_get_setting.side_effect = lambda k: {"sonarr_quality_profile_id": "7"}.get(k)
+    fastapi_app.dependency_overrides[get_settings_snapshot] = lambda: SettingsSnapshot(sonarr_quality_profile_id="7")
     mock_add_series.return_value = {"id": 1, "title": "Test"}
 
     client.post("/api/watchlist", json={"tmdb_id": 701, "media_type": "show"})
@@ -239,10 +238,9 @@ def test_batch_process_show_quality_profile(mock_get_setting, mock_add_series, c
 
 
 @patch("app.modules.radarr.client.RadarrClient.add_movie")
-@patch("app.modules.watchlist.service.get_setting")
-def test_batch_process_no_quality_profile(mock_get_setting, mock_add_movie, client):
+def test_batch_process_no_quality_profile(mock_add_movie, client):
     """No saved quality profile id -> None passed to add_movie."""
-    mock_get_setting.side_effect = lambda k: None
+    fastapi_app.dependency_overrides[get_settings_snapshot] = lambda: SettingsSnapshot()
     mock_add_movie.return_value = {"id": 1, "title": "Test"}
 
     client.post("/api/watchlist", json={"tmdb_id": 702, "media_type": "movie"})
@@ -294,7 +292,7 @@ async def test_batch_process_season_update(db):
         mock_instance = mock_get_client.return_value
         mock_instance.update_season_monitoring = AsyncMock(return_value={"id": 1})
 
-        with patch("app.modules.watchlist.service.get_setting", return_value=None):
+        with patch("app.modules.watchlist.service.get_settings_snapshot", return_value=SettingsSnapshot()):
             processed, failed = await service.process_batch([1396], "tv")
 
     assert 1396 in processed
@@ -319,7 +317,7 @@ async def test_batch_process_new_series(db):
         mock_instance = mock_get_client.return_value
         mock_instance.add_series = AsyncMock(return_value={"id": 1, "title": "Test"})
 
-        with patch("app.modules.watchlist.service.get_setting", return_value="/tv"):
+        with patch("app.modules.watchlist.service.get_settings_snapshot", return_value=SettingsSnapshot(sonarr_root_folder="/tv")):
             processed, failed = await service.process_batch([1234], "tv")
 
     assert 1234 in processed
@@ -344,7 +342,7 @@ async def test_batch_process_season_update_all_seasons_none(db):
         mock_instance = mock_get_client.return_value
         mock_instance.update_season_monitoring = AsyncMock(return_value={"id": 1})
 
-        with patch("app.modules.watchlist.service.get_setting", return_value=None):
+        with patch("app.modules.watchlist.service.get_settings_snapshot", return_value=SettingsSnapshot()):
             processed, failed = await service.process_batch([1396], "tv")
 
     assert 1396 in processed
@@ -392,3 +390,54 @@ async def test_update_season_monitoring_none_skips_malformed_season():
     assert seasons[0]["monitored"] is False
     assert seasons[1]["monitored"] is False
     assert seasons[2]["monitored"] is True
+
+
+@pytest.mark.asyncio
+async def test_large_batch_uses_bulk_import(db):
+    """Batches of BULK_MIN_ITEMS+ new titles go through the bulk import path."""
+    from app.modules.watchlist.service import BULK_MIN_ITEMS
+
+    ids = list(range(1, BULK_MIN_ITEMS + 2))
+    for tmdb_id in ids:
+        db.add(Watchlist(tmdb_id=tmdb_id, media_type="movie"))
+    db.commit()
+
+    with patch("app.modules.watchlist.service.get_radarr_client", new_callable=AsyncMock) as mock_get_client:
+        mock_instance = mock_get_client.return_value
+        mock_instance.add_movies = AsyncMock(return_value=(ids[1:], {ids[0]: "Movie not found: 1"}))
+        mock_instance.add_movie = AsyncMock()
+
+        with patch("app.modules.watchlist.service.get_settings_snapshot", return_value=SettingsSnapshot()):
+            processed, failed = await WatchlistService(db).process_batch(ids, "movie")
+
+    assert sorted(processed) == ids[1:]
+    assert failed == [{"tmdb_id": 1, "error": "Movie not found: 1"}]
+    mock_instance.add_movies.assert_awaited_once()
+    mock_instance.add_movie.assert_not_called()
+    assert db.query(Watchlist).filter_by(status="added").count() == len(ids) - 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("count", [2, 40])
+async def test_batch_process_issues_constant_sql_statements(db, count):
+    """Rows are read with one IN query and updated with one bulk UPDATE, whatever the batch size."""
+    from app.database import count_queries
+
+    ids = list(range(1, count + 1))
+    for tmdb_id in ids:
+        db.add(Watchlist(tmdb_id=tmdb_id, media_type="tv", selected_seasons="[1]", is_season_update=True))
+    db.commit()
+
+    with patch("app.modules.watchlist.service.get_sonarr_client", new_callable=AsyncMock) as mock_get_client:
+        mock_get_client.return_value.update_season_monitoring = AsyncMock(return_value={"id": 1})
+
+        with (
+            patch("app.modules.watchlist.service.get_settings_snapshot", return_value=SettingsSnapshot()),
+            count_queries(db.get_bind()) as queries,
+        ):
+            processed, failed = await WatchlistService(db).process_batch(ids, "tv")
+
+    assert sorted(processed) == ids
+    assert failed == []
+    assert queries.count == 2, queries.statements
+    assert db.query(Watchlist).filter_by(status="added").count() == count
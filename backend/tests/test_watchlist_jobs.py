@@ -0,0 +1,327 @@
+"""Tests for durable watchlist processing jobs."""
+import asyncio
+import threading
+import time
+from contextlib import suppress
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.database import Base, get_db
+from app.main import app
+from app.models import ProcessJob
+from app.modules.watchlist import jobs
+from app.modules.watchlist.jobs import (
+    claim_next_job,
+    create_job,
+    get_job,
+    requeue_interrupted_jobs,
+    run_job,
+    run_job_workers,
+    stream_job,
+)
+
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine)
+    yield sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture
+def api(session_factory):
+    def override_get_db():
+        session = session_factory()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+def _create(session_factory, ids, media_type="movie"):
+    db = session_factory()
+    try:
+        return create_job(db, ids, media_type).id
+    finally:
+        db.close()
+
+
+def _item_statuses(session_factory, job_id):
+    db = session_factory()
+    try:
+        job = get_job(db, job_id)
+        return job.status, {item.tmdb_id: item.status for item in job.items}
+    finally:
+        db.close()
+
+
+def test_create_job_returns_202_with_pending_items(api):
+    response = api.post("/api/watchlist/jobs", json={"ids": [603, 550, 603], "media_type": "movie"})
+
+    assert response.status_code == 202
+    body = response.json()
+    assert body["status"] == "queued"
+    assert body["total"] == 2
+    assert body["pending"] == 2
+    assert [item["tmdb_id"] for item in body["items"]] == [603, 550]
+
+    fetched = api.get(f"/api/watchlist/jobs/{body['id']}")
+    assert fetched.status_code == 200
+    assert fetched.json()["id"] == body["id"]
+
+
+def test_unknown_job_is_404(api):
+    assert api.get("/api/watchlist/jobs/999").status_code == 404
+    assert api.get("/api/watchlist/jobs/999/stream").status_code == 404
+
+
+def test_run_job_records_item_outcomes(session_factory):
+    job_id = _create(session_factory, [603, 550])
+    db = session_factory()
+    claim_next_job(db, ["movie"])
+    db.close()
+
+    async def fake_process_batch(self, ids, media_type):
+        return [603], [{"tmdb_id": 550, "error": "Not found in Radarr"}]
+
+    with patch("app.modules.watchlist.service.WatchlistService.process_batch", fake_process_batch):
+        asyncio.run(run_job(job_id, session_factory))
+
+    status, items = _item_statuses(session_factory, job_id)
+    assert status == "done"
+    assert items == {603: "added", 550: "failed"}
+
+
+def test_run_job_processes_in_chunks(session_factory, monkeypatch):
+    monkeypatch.setattr(jobs, "JOB_CHUNK_SIZE", 2)
+    job_id = _create(session_factory, [1, 2, 3, 4, 5])
+    calls = []
+
+    async def fake_process_batch(self, ids, media_type):
+        calls.append(ids)
+        return ids, []
+
+    with patch("app.modules.watchlist.service.WatchlistService.process_batch", fake_process_batch):
+        asyncio.run(run_job(job_id, session_factory))
+
+    assert calls == [[1, 2], [3, 4], [5]]
+
+
+def test_interrupted_job_resumes_only_pending_items(session_factory):
+    job_id = _create(session_factory, [1, 2, 3])
+    db = session_factory()
+    claim_next_job(db, ["movie"])
+    job = get_job(db, job_id)
+    job.items[0].status = "added"
+    db.commit()
+
+    assert requeue_interrupted_jobs(db) == 1
+    assert db.get(ProcessJob, job_id).status == "queued"
+    db.close()
+
+    calls = []
+
+    async def fake_process_batch(self, ids, media_type):
+        calls.append(ids)
+        return ids, []
+
+    with patch("app.modules.watchlist.service.WatchlistService.process_batch", fake_process_batch):
+        asyncio.run(run_job(job_id, session_factory))
+
+    assert calls == [[2, 3]]
+    assert _item_statuses(session_factory, job_id) == ("done", {1: "added", 2: "added", 3: "added"})
+
+
+def test_claim_takes_oldest_job_for_free_upstreams(session_factory):
+    first_movie = _create(session_factory, [1], "movie")
+    show = _create(session_factory, [2], "show")
+    second_movie = _create(session_factory, [3], "movie")
+
+    db = session_factory()
+    try:
+        assert claim_next_job(db, ["show"]) == show
+        assert claim_next_job(db, ["movie", "show"]) == first_movie
+        assert claim_next_job(db, []) is None
+        assert claim_next_job(db, ["movie"]) == second_movie
+        assert claim_next_job(db, ["movie", "show"]) is None
+    finally:
+        db.close()
+
+
+def test_workers_limit_jobs_per_upstream(session_factory):
+    for tmdb_id in (1, 2, 3):
+        _create(session_factory, [tmdb_id], "movie")
+    running = 0
+    peak = 0
+
+    async def fake_process_batch(self, ids, media_type):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return ids, []
+
+    async def scenario():
+        task = asyncio.create_task(run_job_workers(3, 1, session_factory))
+        for _ in range(200):
+            await asyncio.sleep(0.01)
+            db = session_factory()
+            try:
+                if all(job.status == "done" for job in db.query(ProcessJob)):
+                    break
+            finally:
+                db.close()
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    with patch("app.modules.watchlist.service.WatchlistService.process_batch", fake_process_batch):
+        asyncio.run(scenario())
+
+    db = session_factory()
+    assert all(job.status == "done" for job in db.query(ProcessJob))
+    db.close()
+    assert peak == 1
+
+
+def test_stream_emits_progress_until_done(session_factory):
+    job_id = _create(session_factory, [603])
+
+    async def scenario():
+        events = []
+        async for message in stream_job(job_id, session_factory, interval=0.01):
+            events.append(message)
+            if len(events) == 1:
+                db = session_factory()
+                job = get_job(db, job_id)
+                job.items[0].status = "added"
+                job.status = "done"
+                db.commit()
+                db.close()
+        return events
+
+    events = asyncio.run(scenario())
+
+    assert len(events) == 2
+    assert all(event.startswith("event: progress\n") for event in events)
+    assert '"status":"done"' in events[-1]
+
+
+def test_job_queued_over_http_wakes_a_waiting_worker(api, session_factory):
+    """The sync route runs in a worker thread; its wake-up must still reach the workers' loop."""
+    loop = asyncio.new_event_loop()
+    started = threading.Event()
+    holder = {}
+
+    async def fake_process_batch(self, ids, media_type):
+        return ids, []
+
+    async def serve():
+        holder["task"] = asyncio.current_task()
+        started.set()
+        with suppress(asyncio.CancelledError):
+            await run_job_workers(1, 1, session_factory)
+
+    thread = threading.Thread(target=lambda: loop.run_until_complete(serve()), daemon=True)
+    with patch("app.modules.watchlist.service.WatchlistService.process_batch", fake_process_batch):
+        thread.start()
+        started.wait(1)
+        time.sleep(0.05)  # let the worker find the queue empty and start waiting
+
+        job_id = api.post("/api/watchlist/jobs", json={"ids": [603], "media_type": "movie"}).json()["id"]
+
+        deadline = time.monotonic() + 2  # far below JOB_POLL_INTERVAL
+        while time.monotonic() < deadline and _item_statuses(session_factory, job_id)[0] != "done":
+            time.sleep(0.01)
+        status = _item_statuses(session_factory, job_id)[0]
+
+        loop.call_soon_threadsafe(holder["task"].cancel)
+        thread.join(2)
+    if not thread.is_alive():
+        loop.close()
+
+    assert status == "done"
+
+
+def test_commit_failure_does_not_leave_job_running(session_factory):
+    job_id = _create(session_factory, [1, 2])
+    db = session_factory()
+    claim_next_job(db, ["movie"])
+    db.close()
+    opened = []
+
+    def flaky_factory():
+        session = session_factory()
+        if not opened:
+            def locked():
+                raise OperationalError("COMMIT", {}, Exception("database is locked"))
+
+            session.commit = locked
+        opened.append(session)
+        return session
+
+    async def fake_process_batch(self, ids, media_type):
+        return ids, []
+
+    async def scenario():
+        await run_job(job_id, flaky_factory)
+        return [message async for message in stream_job(job_id, session_factory, interval=0.01)]
+
+    with patch("app.modules.watchlist.service.WatchlistService.process_batch", fake_process_batch):
+        events = asyncio.run(scenario())
+
+    assert _item_statuses(session_factory, job_id) == ("done", {1: "failed", 2: "failed"})
+    assert '"status":"done"' in events[-1]
+    db = session_factory()
+    assert "database is locked" in get_job(db, job_id).items[0].error
+    db.close()
+
+
+def test_worker_survives_claim_errors(session_factory, monkeypatch):
+    monkeypatch.setattr(jobs, "JOB_CLAIM_RETRY_DELAY", 0.01)
+    job_id = _create(session_factory, [603])
+    real_claim = jobs.claim_next_job
+    attempts = []
+
+    def flaky_claim(db, media_types):
+        attempts.append(media_types)
+        if len(attempts) == 1:
+            raise OperationalError("UPDATE", {}, Exception("database is locked"))
+        return real_claim(db, media_types)
+
+    monkeypatch.setattr(jobs, "claim_next_job", flaky_claim)
+
+    async def fake_process_batch(self, ids, media_type):
+        return ids, []
+
+    async def scenario():
+        task = asyncio.create_task(run_job_workers(1, 1, session_factory))
+        for _ in range(200):
+            await asyncio.sleep(0.01)
+            if _item_statuses(session_factory, job_id)[0] == "done":
+                break
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    with patch("app.modules.watchlist.service.WatchlistService.process_batch", fake_process_batch):
+        asyncio.run(scenario())
+
+    assert len(attempts) >= 2
+    assert _item_statuses(session_factory, job_id) == ("done", {603: "added"})
@@ -0,0 +1,81 @@
+"""Tests for the denormalized watchlist metadata refresher."""
+from datetime import UTC, datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.database import Base
+from app.models import Watchlist
+from app.modules.discovery.tmdb_client import TMDBAPIError, TMDBNetworkError
+from app.modules.watchlist.metadata import METADATA_MAX_AGE, refresh_stale_metadata
+
+
+@pytest.fixture
+def db():
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+def _tmdb(results):
+    """Fake TMDB client whose get_details_many yields canned (key, details, error) triples."""
+    async def get_details_many(keys, concurrency=8):
+        for key in keys:
+            details, error = results[key]
+            yield key, details, error
+
+    tmdb = MagicMock()
+    tmdb.get_details_many = get_details_many
+    return tmdb
+
+
+async def test_refresh_fills_stale_rows_and_skips_fresh(db):
+    now = datetime.now(UTC).replace(tzinfo=None)
+    db.add_all([
+        Watchlist(tmdb_id=1, media_type="movie"),
+        Watchlist(tmdb_id=2, media_type="show", title="Old", metadata_updated_at=now - METADATA_MAX_AGE - timedelta(hours=1)),
+        Watchlist(tmdb_id=3, media_type="movie", title="Fresh", metadata_updated_at=now),
+    ])
+    db.commit()
+    tmdb = _tmdb({
+        (1, "movie"): ({"title": "One", "poster_path": "/1.jpg"}, None),
+        (2, "tv"): ({"name": "Two", "number_of_seasons": 3}, None),
+    })
+
+    assert await refresh_stale_metadata(db, tmdb) == 2
+
+    rows = {r.tmdb_id: r for r in db.query(Watchlist).all()}
+    assert rows[1].title == "One" and rows[1].poster_path == "/1.jpg"
+    assert rows[2].title == "Two" and rows[2].total_seasons == 3
+    assert rows[3].title == "Fresh"
+
+
+async def test_refresh_leaves_failed_rows_for_next_pass(db):
+    db.add_all([Watchlist(tmdb_id=1, media_type="movie"), Watchlist(tmdb_id=2, media_type="movie")])
+    db.commit()
+    tmdb = _tmdb({
+        (1, "movie"): (None, TMDBNetworkError("boom")),
+        (2, "movie"): (None, TMDBAPIError("missing", status_code=404)),
+    })
+
+    assert await refresh_stale_metadata(db, tmdb) == 1
+
+    rows = {r.tmdb_id: r for r in db.query(Watchlist).all()}
+    assert rows[1].metadata_updated_at is None
+    assert rows[2].metadata_updated_at is not None and rows[2].title is None
+
+
+async def test_refresh_noop_without_stale_rows(db):
+    tmdb = MagicMock()
+    tmdb.get_details_many = AsyncMock()
+    assert await refresh_stale_metadata(db, tmdb) == 0
+    tmdb.get_details_many.assert_not_called()
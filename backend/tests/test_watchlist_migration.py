@@ -4,7 +4,7 @@ from sqlalchemy.pool import StaticPool
 
 # Import models FIRST to register them with Base.metadata
 from app.models import Watchlist  # noqa: F401
-from app.database import Base, _migrate_watchlist_columns
+from app.database import Base, _migrate_watchlist_columns, _migrate_watchlist_tags
 
 
 def _make_engine():
@@ -90,3 +90,61 @@ def test_fresh_create_all_has_new_columns():
     columns = {c["name"] for c in inspect(engine).get_columns("watchlist")}
     assert "priority" in columns
     assert "tags" in columns
+
+
+def test_migration_backfills_metadata_from_media_cache():
+    """Legacy rows pick up title/poster/etc. from cached TMDB detail payloads."""
+    engine = _make_engine()
+    _create_legacy_table(engine)
+    Base.metadata.create_all(bind=engine)  # media_cache
+    with engine.begin() as conn:
+        conn.execute(text(
+            "INSERT INTO watchlist (tmdb_id, media_type, status) VALUES "
+            "(603, 'movie', 'pending'), (1396, 'show', 'pending'), (9, 'movie', 'pending')"
+        ))
+        conn.execute(text(
+            "INSERT INTO media_cache (cache_key, endpoint_class, payload, cached_at, expires_at) VALUES "
+            "('/movie/603', 'details', '{\"title\": \"The Matrix\", \"release_date\": \"1999-03-30\"}', "
+            "'2026-01-01 00:00:00', '2026-01-02 00:00:00'), "
+            "('/tv/1396', 'details', '{\"name\": \"Breaking Bad\", \"number_of_seasons\": 5}', "
+            "'2026-01-01 00:00:00', '2026-01-02 00:00:00')"
+        ))
+
+    _migrate_watchlist_columns(engine)
+
+    with engine.begin() as conn:
+        rows = conn.execute(text(
+            "SELECT tmdb_id, title, release_date, total_seasons, metadata_updated_at "
+            "FROM watchlist ORDER BY tmdb_id"
+        )).fetchall()
+    assert rows[0][:4] == (9, None, None, None) and rows[0][4] is None  # no cache -> refresher
+    assert rows[1][:4] == (603, "The Matrix", "1999-03-30", None)
+    assert rows[2][:4] == (1396, "Breaking Bad", None, 5)
+    assert rows[2][4] is not None
+
+
+def test_tags_migrate_from_json_column_once():
+    """Legacy JSON tags move into watchlist_tags (garbage dropped) and the column is cleared."""
+    engine = _make_engine()
+    _create_legacy_table(engine)
+    _migrate_watchlist_columns(engine)
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(text(
+            "INSERT INTO watchlist (id, tmdb_id, media_type, status, tags) VALUES "
+            "(1, 10, 'movie', 'pending', '[\"kids\", \" 4k \", \"\", 3]'), "
+            "(2, 11, 'movie', 'pending', 'not json'), "
+            "(3, 12, 'show', 'pending', '\"scalar\"'), "
+            "(4, 13, 'show', 'pending', NULL)"
+        ))
+
+    _migrate_watchlist_tags(engine)
+    _migrate_watchlist_tags(engine)  # second run is a no-op
+
+    with engine.begin() as conn:
+        tags = conn.execute(text(
+            "SELECT watchlist_id, tag, position FROM watchlist_tags ORDER BY watchlist_id, position"
+        )).fetchall()
+        leftover = conn.execute(text("SELECT COUNT(*) FROM watchlist WHERE tags IS NOT NULL")).scalar()
+    assert [tuple(t) for t in tags] == [(1, "kids", 0), (1, "4k", 1)]
+    assert leftover == 0
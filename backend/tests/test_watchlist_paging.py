@@ -0,0 +1,198 @@
+"""Tests for server-side filtering, sorting and keyset pagination of GET /api/watchlist."""
+from datetime import datetime, timedelta
+from itertools import chain
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.database import Base, count_queries, get_db
+from app.main import app as fastapi_app
+from app.models import Watchlist, WatchlistTag
+from app.modules.watchlist.service import WatchlistService
+
+NOW = datetime(2026, 6, 1)
+
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine)
+    TestSession = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    def override_get_db():
+        session = TestSession()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    fastapi_app.dependency_overrides[get_db] = override_get_db
+    yield TestSession
+    fastapi_app.dependency_overrides.clear()
+    Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture
+def client(session_factory):
+    return TestClient(fastapi_app)
+
+
+@pytest.fixture
+def mock_get_details():
+    with patch(
+        "app.modules.clients.tmdb_client.get_details",
+        new_callable=AsyncMock,
+        return_value={"title": "Fetched", "vote_average": 5.0},
+    ) as mock:
+        yield mock
+
+
+def _seed(session_factory, rows):
+    """Insert already-enriched rows; each dict overrides the defaults below."""
+    db = session_factory()
+    for i, fields in enumerate(rows):
+        values = {
+            "tmdb_id": 100 + i,
+            "media_type": "movie",
+            "added_at": NOW + timedelta(minutes=i),
+            "title": f"Title {i}",
+            "metadata_updated_at": NOW,
+        }
+        tags = fields.pop("tags", [])
+        values.update(fields)
+        db.add(Watchlist(**values, tag_links=[WatchlistTag(tag=t, position=n) for n, t in enumerate(tags)]))
+    db.commit()
+    db.close()
+
+
+def _walk(client, **params):
+    """Follow next_cursor to the end, returning every page's tmdb_ids."""
+    pages, cursor = [], None
+    while True:
+        query = dict(params, **({"cursor": cursor} if cursor else {}))
+        data = client.get("/api/watchlist", params=query).json()
+        pages.append([i["tmdb_id"] for i in data["items"]])
+        cursor = data["next_cursor"]
+        if cursor is None:
+            return pages, data["total"]
+
+
+def test_default_order_is_newest_first_unpaged(client, session_factory):
+    _seed(session_factory, [{}, {}, {}])
+    data = client.get("/api/watchlist").json()
+    assert [i["tmdb_id"] for i in data["items"]] == [102, 101, 100]
+    assert data["total"] == 3
+    assert data["next_cursor"] is None
+
+
+def test_cursor_pages_cover_every_row_once(client, session_factory):
+    # Same added_at everywhere: the id tiebreaker must keep pages stable.
+    _seed(session_factory, [{"added_at": NOW} for _ in range(7)])
+    pages, total = _walk(client, limit=3)
+    assert [len(p) for p in pages] == [3, 3, 1]
+    flat = [tmdb_id for page in pages for tmdb_id in page]
+    assert sorted(flat) == list(range(100, 107))
+    assert len(set(flat)) == 7
+    assert total == 7
+
+
+def test_sort_by_rating_puts_missing_last_in_both_directions(client, session_factory):
+    _seed(session_factory, [
+        {"vote_average": 7.0},
+        {"vote_average": None},
+        {"vote_average": 9.0},
+        {"vote_average": None},
+        {"vote_average": 3.0},
+    ])
+    desc, _ = _walk(client, sort="rating", dir="desc", limit=2)
+    asc, _ = _walk(client, sort="rating", dir="asc", limit=2)
+    assert list(chain.from_iterable(desc)) == [102, 100, 104, 103, 101]
+    assert list(chain.from_iterable(asc)) == [104, 100, 102, 101, 103]
+
+
+def test_sort_by_title_is_case_insensitive(client, session_factory):
+    _seed(session_factory, [{"title": "banana"}, {"title": "Apple"}, {"title": "cherry"}])
+    pages, _ = _walk(client, sort="title", dir="asc", limit=1)
+    assert list(chain.from_iterable(pages)) == [101, 100, 102]
+
+
+def test_filters_are_applied_in_sql_and_counted(client, session_factory):
+    _seed(session_factory, [
+        {"media_type": "show", "status": "pending", "tags": ["kids"]},
+        {"media_type": "movie", "status": "pending", "tags": ["kids", "4k"]},
+        {"media_type": "movie", "status": "added", "tags": ["4k"], "priority": 1},
+        {"media_type": "movie", "status": "pending", "tags": []},
+    ])
+
+    def ids(**params):
+        data = client.get("/api/watchlist", params=params).json()
+        return sorted(i["tmdb_id"] for i in data["items"]), data["total"]
+
+    assert ids(media_type="movie") == ([101, 102, 103], 3)
+    assert ids(status="pending", media_type="movie") == ([101, 103], 2)
+    assert ids(tag="kids") == ([100, 101], 2)
+    assert ids(tag="4k", status="added") == ([102], 1)
+    assert ids(priority=1) == ([102], 1)
+
+
+def test_tag_facets_endpoint(client, session_factory):
+    _seed(session_factory, [
+        {"media_type": "show", "tags": ["kids"]},
+        {"tags": ["kids", "4k"]},
+        {"tags": ["4k"], "status": "added"},
+        {},
+    ])
+    assert client.get("/api/watchlist/tags").json() == {
+        "tags": [{"tag": "4k", "count": 2}, {"tag": "kids", "count": 2}]
+    }
+    assert client.get("/api/watchlist/tags", params={"status": "added"}).json() == {
+        "tags": [{"tag": "4k", "count": 1}]
+    }
+
+
+def test_total_counts_all_pages(client, session_factory):
+    _seed(session_factory, [{} for _ in range(5)])
+    data = client.get("/api/watchlist", params={"limit": 2}).json()
+    assert len(data["items"]) == 2
+    assert data["total"] == 5
+    assert data["next_cursor"]
+
+
+def test_only_the_returned_page_is_enriched(client, session_factory, mock_get_details):
+    _seed(session_factory, [{"title": None, "metadata_updated_at": None} for _ in range(5)])
+    data = client.get("/api/watchlist", params={"limit": 2}).json()
+    assert mock_get_details.await_count == 2
+    assert [i["title"] for i in data["items"]] == ["Fetched", "Fetched"]
+
+
+def test_invalid_cursor_is_400(client, session_factory):
+    response = client.get("/api/watchlist", params={"limit": 2, "cursor": "not-a-cursor"})
+    assert response.status_code == 400
+
+
+def test_invalid_sort_is_422(client, session_factory):
+    assert client.get("/api/watchlist", params={"sort": "bogus"}).status_code == 422
+
+
+def test_reload_loads_tags_without_a_query_per_row(session_factory):
+    _seed(session_factory, [{"tags": ["a"]}, {"tags": ["b", "c"]}, {}])
+    db = session_factory()
+    service = WatchlistService(db)
+    items, _total, _more = service.list_page(limit=None, cursor=None, sort="added", direction="asc")
+    db.commit()  # expires the rows, as store_metadata's commit does
+
+    with count_queries(db.get_bind()) as queries:
+        service.reload(items)
+        tags = [item.tag_list for item in items]
+
+    assert tags == [["a"], ["b", "c"], []]
+    assert queries.count == 2  # the rows, then every row's tags in one IN query
+    db.close()
@@ -19,7 +19,7 @@ def mock_get_details():
     """Make watchlist enrichment deterministic: get_details succeeds by default.
 
     Yields the AsyncMock so a test can override .side_effect to drive the
-    404-placeholder or outage-502 paths. The patch is stopped after each test.
+    404-placeholder or outage-degraded paths. The patch is stopped after each test.
     """
     with patch(
         "app.modules.clients.tmdb_client.get_details",
@@ -246,8 +246,8 @@ def test_parse_seasons_list_returns_list():
 
 def test_enrich_404_yields_placeholder(client, mock_get_details):
     """A genuine TMDB 404 degrades the row to the TMDB:{id} placeholder at 200."""
-    client.post("/api/watchlist", json={"tmdb_id": 777, "media_type": "movie"})
     mock_get_details.side_effect = TMDBAPIError("missing", status_code=404)
+    client.post("/api/watchlist", json={"tmdb_id": 777, "media_type": "movie"})
 
     response = client.get("/api/watchlist")
     assert response.status_code == 200
@@ -255,13 +255,67 @@ def test_enrich_404_yields_placeholder(client, mock_get_details):
     assert item["title"] == "TMDB:777"
 
 
-def test_get_watchlist_502_on_tmdb_outage(client, mock_get_details):
-    """A TMDB outage surfaces as 502, not a list of placeholder rows."""
-    client.post("/api/watchlist", json={"tmdb_id": 778, "media_type": "movie"})
+def test_get_watchlist_degraded_on_tmdb_outage(client, mock_get_details):
+    """A TMDB outage marks the affected rows degraded instead of failing the list."""
     mock_get_details.side_effect = TMDBNetworkError("boom")
+    # POST answers 502 but keeps the row, which has no stored metadata yet.
+    client.post("/api/watchlist", json={"tmdb_id": 778, "media_type": "movie"})
 
     response = client.get("/api/watchlist")
-    assert response.status_code == 502
+    assert response.status_code == 200
+    data = response.json()
+    assert data["degraded"] == ["tmdb"]
+    assert data["items"][0]["title"] == "TMDB:778"
+    assert data["items"][0]["degraded"] is True
+
+
+def test_get_watchlist_partial_outage_keeps_healthy_rows(client, mock_get_details):
+    """Only the rows whose lookup failed are degraded; the rest are fully enriched."""
+    async def flaky(tmdb_id, media_type):
+        if tmdb_id == 2:
+            raise TMDBNetworkError("boom")
+        if tmdb_id == 3:
+            raise TMDBAPIError("missing", status_code=404)
+        return {"title": f"Title {tmdb_id}"}
+
+    mock_get_details.side_effect = flaky
+    client.post("/api/watchlist", json={"tmdb_id": 1, "media_type": "movie"})
+    client.post("/api/watchlist", json={"tmdb_id": 2, "media_type": "movie"})
+    client.post("/api/watchlist", json={"tmdb_id": 3, "media_type": "show"})
+
+    data = client.get("/api/watchlist").json()
+    by_id = {i["tmdb_id"]: i for i in data["items"]}
+    assert data["total"] == 3
+    assert data["degraded"] == ["tmdb"]
+    assert by_id[1]["title"] == "Title 1" and by_id[1]["degraded"] is False
+    assert by_id[2]["degraded"] is True
+    assert by_id[3]["title"] == "TMDB:3" and by_id[3]["degraded"] is False  # 404 is not an outage
+
+
+def test_get_watchlist_steady_state_makes_no_tmdb_calls(client, mock_get_details):
+    """Metadata stored at add time serves every later list without touching TMDB."""
+    client.post("/api/watchlist", json={"tmdb_id": 780, "media_type": "movie"})
+    client.post("/api/watchlist", json={"tmdb_id": 781, "media_type": "show"})
+    mock_get_details.reset_mock()
+
+    data = client.get("/api/watchlist").json()
+    assert data["total"] == 2
+    assert data["degraded"] == []
+    mock_get_details.assert_not_called()
+
+
+def test_get_watchlist_retries_degraded_rows_on_next_read(client, mock_get_details):
+    """A row left bare by an outage is enriched (and stored) once TMDB recovers."""
+    return_value = mock_get_details.return_value
+    mock_get_details.side_effect = TMDBNetworkError("boom")
+    client.post("/api/watchlist", json={"tmdb_id": 782, "media_type": "movie"})
+
+    mock_get_details.side_effect = None
+    mock_get_details.return_value = return_value
+    assert client.get("/api/watchlist").json()["items"][0]["degraded"] is False
+    mock_get_details.reset_mock()
+    client.get("/api/watchlist")
+    mock_get_details.assert_not_called()
 
 
 def test_add_to_watchlist_502_on_tmdb_outage(client, mock_get_details):
@@ -5,6 +5,7 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
 from app.database import Base
+from app.models import WatchlistTag
 from app.modules.watchlist.service import WatchlistService
 
 
@@ -70,7 +71,7 @@ def test_update_details_priority_only(service):
     updated = service.update_details(item.id, {"priority": 1})
     assert updated.priority == 1
     assert updated.notes == "keep me"
-    assert updated.tags is None
+    assert updated.tag_list == []
 
 
 def test_update_details_notes(service):
@@ -80,18 +81,30 @@ def test_update_details_notes(service):
     assert updated.notes == "soon"
 
 
-def test_update_details_tags_stored_as_json(service):
-    """Populated tags stored as JSON string."""
+def test_update_details_tags_stored_as_rows(service, db_session):
+    """Populated tags become watchlist_tags rows, in order, deduplicated."""
     item, _ = service.add(tmdb_id=333, media_type="movie")
-    updated = service.update_details(item.id, {"tags": ["a", "b"]})
-    assert updated.tags == '["a", "b"]'
+    updated = service.update_details(item.id, {"tags": ["a", "b", " a ", ""]})
+    assert updated.tag_list == ["a", "b"]
+    assert updated.tags is None
+    assert db_session.query(WatchlistTag).count() == 2
+
+
+def test_update_details_replaces_tags(service, db_session):
+    """Re-saving keeps shared tags and drops removed ones."""
+    item, _ = service.add(tmdb_id=334, media_type="movie")
+    service.update_details(item.id, {"tags": ["a", "b"]})
+    updated = service.update_details(item.id, {"tags": ["b", "c"]})
+    assert updated.tag_list == ["b", "c"]
+    assert db_session.query(WatchlistTag).count() == 2
 
 
 def test_update_details_empty_tags_stored_null(service):
-    """Empty tags list stored as None."""
+    """Empty tags list clears every tag row."""
     item, _ = service.add(tmdb_id=444, media_type="movie")
+    service.update_details(item.id, {"tags": ["x"]})
     updated = service.update_details(item.id, {"tags": []})
-    assert updated.tags is None
+    assert updated.tag_list == []
 
 
 def test_update_details_unknown_id_returns_none(service):
@@ -168,3 +181,21 @@ def test_readd_no_season_intent_leaves_unchanged(service):
     assert existing.status == "added"
     assert json.loads(existing.selected_seasons) == [1, 2]
     assert existing.is_season_update is False
+
+
+def test_tag_counts_and_cleanup_on_delete(service, db_session):
+    """Facets aggregate across items; removing items (single or batch) drops their tags."""
+    a, _ = service.add(tmdb_id=1, media_type="movie")
+    b, _ = service.add(tmdb_id=2, media_type="show")
+    c, _ = service.add(tmdb_id=3, media_type="movie")
+    service.update_details(a.id, {"tags": ["4k", "kids"]})
+    service.update_details(b.id, {"tags": ["kids"]})
+    service.update_details(c.id, {"tags": ["kids"]})
+
+    assert service.tag_counts() == [("kids", 3), ("4k", 1)]
+    assert service.tag_counts(media_type="show") == [("kids", 1)]
+
+    service.remove(a.id)
+    service.delete_batch([(2, "show")])
+    assert service.tag_counts() == [("kids", 1)]
+    assert db_session.query(WatchlistTag).count() == 1
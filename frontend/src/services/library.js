@@ -8,4 +8,6 @@ export const libraryService = {
   // Activity and queue
   getActivity: (limit = 20) => api.get(`/library/activity?limit=${limit}`),
   getQueue: () => api.get('/library/queue'),
+  // Live queue: a `snapshot` event, then `changes` events (see backend queue_stream.py)
+  streamQueue: () => new EventSource('/api/library/queue/stream'),
 }
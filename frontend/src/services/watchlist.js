@@ -1,7 +1,20 @@
 import api from './api'
 
 export const watchlistService = {
-  getAll: () => api.get('/watchlist'),
+  /**
+   * List watchlist items. With no params the whole list is returned.
+   * @param {{ limit?: number, cursor?: string, sort?: 'added'|'title'|'rating'|'release'|'priority',
+   *   dir?: 'asc'|'desc', media_type?: 'movie'|'show', status?: string, priority?: number, tag?: string }} params
+   * @returns {Promise<{items: WatchlistItem[], total: number, next_cursor: string|null, degraded: string[]}>}
+   */
+  getAll: (params = {}) => api.get('/watchlist', { params }),
+
+  /**
+   * Tag facet counts, most used first (optionally narrowed by the same filters as getAll).
+   * @param {{ media_type?: 'movie'|'show', status?: string, priority?: number }} params
+   * @returns {Promise<{tags: Array<{tag: string, count: number}>}>}
+   */
+  getTagFacets: (params = {}) => api.get('/watchlist/tags', { params }),
 
   add: (tmdbId, mediaType, notes = null, selectedSeasons = null, isSeasonUpdate = false) =>
     api.post('/watchlist', {
@@ -42,6 +55,20 @@ export const watchlistService = {
   processItems: (ids, mediaType) =>
     api.post('/watchlist/process', { ids, media_type: mediaType }),
 
+  /**
+   * Queue watchlist items as a background job (returns immediately)
+   * @param {number[]} ids - TMDB IDs to process
+   * @param {string} mediaType - 'movie' or 'show'
+   * @returns {Promise<ProcessJob>}
+   */
+  createJob: (ids, mediaType) =>
+    api.post('/watchlist/jobs', { ids, media_type: mediaType }),
+
+  getJob: (jobId) => api.get(`/watchlist/jobs/${jobId}`),
+
+  // Job progress: `progress` events (same shape as getJob) until the job is done
+  streamJob: (jobId) => new EventSource(`/api/watchlist/jobs/${jobId}/stream`),
+
   /**
    * Delete multiple watchlist items
    * @param {Array<{tmdb_id: number, media_type: string}>} items - Items to delete
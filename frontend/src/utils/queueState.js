@@ -0,0 +1,15 @@
+// Apply a `changes` event from /api/library/queue/stream to the combined queue
+// ({ movies, shows }): drop removed ids, replace changed records in place and
+// append new ones. Returns a new object; untouched lists keep their identity.
+export function applyQueueChanges(queue, changes) {
+  const next = { ...queue }
+  for (const key of ['movies', 'shows']) {
+    const removed = new Set(changes.removed?.[key] || [])
+    const upserted = changes.upserted?.[key] || []
+    if (!removed.size && !upserted.length) continue
+    const byId = new Map((next[key] || []).filter(r => !removed.has(r.id)).map(r => [r.id, r]))
+    for (const record of upserted) byId.set(record.id, record)
+    next[key] = [...byId.values()]
+  }
+  return next
+}
@@ -0,0 +1,24 @@
+import { describe, it, expect } from 'vitest'
+import { applyQueueChanges } from './queueState.js'
+
+describe('applyQueueChanges', () => {
+  const queue = {
+    movies: [{ id: 1, sizeleft: 100 }, { id: 2, sizeleft: 50 }],
+    shows: [{ id: 9, sizeleft: 10 }],
+  }
+
+  it('updates changed records in place and appends new ones', () => {
+    const next = applyQueueChanges(queue, { upserted: { movies: [{ id: 2, sizeleft: 0 }, { id: 3 }] } })
+    expect(next.movies).toEqual([{ id: 1, sizeleft: 100 }, { id: 2, sizeleft: 0 }, { id: 3 }])
+    expect(next.shows).toBe(queue.shows)
+  })
+  it('drops removed ids', () => {
+    const next = applyQueueChanges(queue, { removed: { movies: [1], shows: [9] } })
+    expect(next.movies).toEqual([{ id: 2, sizeleft: 50 }])
+    expect(next.shows).toEqual([])
+  })
+  it('does not mutate the input', () => {
+    applyQueueChanges(queue, { removed: { movies: [1] } })
+    expect(queue.movies).toHaveLength(2)
+  })
+})
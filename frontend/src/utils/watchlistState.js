@@ -1,5 +1,10 @@
 // Pure URL <-> Watchlist view state mapping + list transform (no Vue, no DOM).
-// URL keys: type (<-mediaType), status, sort (<-sortBy), dir (<-sortDir).
+// URL keys: type (<-mediaType), status, sort (<-sortBy), dir (<-sortDir), group (<-groupBy), tag.
+
+// Rows per GET /api/watchlist page; further pages load on demand.
+export const WATCHLIST_PAGE_SIZE = 50
+// Largest `limit` GET /api/watchlist accepts.
+export const WATCHLIST_MAX_LIMIT = 200
 
 const DEFAULTS = {
   mediaType: 'all',
@@ -7,6 +12,7 @@ const DEFAULTS = {
   sortBy: 'added',
   sortDir: 'desc',
   groupBy: 'none',
+  tag: '',
 }
 
 const MEDIA_TYPES = ['all', 'movies', 'shows']
@@ -27,6 +33,7 @@ export function parseWatchlistState(query) {
     sortBy: oneOf(q.sort, SORT_BYS, DEFAULTS.sortBy),
     sortDir: oneOf(q.dir, SORT_DIRS, DEFAULTS.sortDir),
     groupBy: oneOf(q.group, GROUP_BYS, DEFAULTS.groupBy),
+    tag: typeof q.tag === 'string' ? q.tag.trim() : DEFAULTS.tag,
   }
 }
 
@@ -38,9 +45,23 @@ export function serializeWatchlistState(state) {
   if (state.sortDir !== DEFAULTS.sortDir) out.dir = String(state.sortDir)
   const groupBy = state.groupBy ?? DEFAULTS.groupBy
   if (groupBy !== DEFAULTS.groupBy) out.group = String(groupBy)
+  if (state.tag) out.tag = String(state.tag)
   return out
 }
 
+const API_MEDIA_TYPES = { movies: 'movie', shows: 'show' }
+
+// GET /api/watchlist params for a view state: filtering, sorting and keyset
+// paging run on the server, so the page only ever holds the rows it has shown.
+export function watchlistQuery(state, { limit = WATCHLIST_PAGE_SIZE, cursor = null } = {}) {
+  const params = { limit, sort: state.sortBy, dir: state.sortDir }
+  if (API_MEDIA_TYPES[state.mediaType]) params.media_type = API_MEDIA_TYPES[state.mediaType]
+  if (state.status !== 'all') params.status = state.status
+  if (state.tag) params.tag = state.tag
+  if (cursor) params.cursor = cursor
+  return params
+}
+
 function isMissing(v) {
   return v == null || v === ''
 }
@@ -128,11 +149,30 @@ export function formatTags(arr) {
   return arr.join(', ')
 }
 
-// Filter + sort via applyWatchlistView, then bucket into priority sections
-// (High -> Normal -> Low), preserving the sort order within each and omitting
-// empty sections. Items without a `priority` fall into the Normal (0) section.
+// GET /api/watchlist/tags params: facet counts narrowed by the other active filters.
+export function tagFacetQuery(state) {
+  const params = {}
+  if (API_MEDIA_TYPES[state.mediaType]) params.media_type = API_MEDIA_TYPES[state.mediaType]
+  if (state.status !== 'all') params.status = state.status
+  return params
+}
+
+// Options for the tag filter; a selected tag with no facet (e.g. from the URL) stays listed.
+export function tagOptions(facets, selected) {
+  const options = facets.map(({ tag, count }) => ({ tag, count }))
+  if (selected && !options.some((o) => o.tag === selected)) options.unshift({ tag: selected, count: 0 })
+  return options
+}
+
+// Filter + sort via applyWatchlistView, then bucket into priority sections.
 export function groupWatchlistView(items, state) {
-  const sorted = applyWatchlistView(items, state)
+  return groupByPriority(applyWatchlistView(items, state))
+}
+
+// Bucket already-sorted items into priority sections (High -> Normal -> Low),
+// preserving their order within each and omitting empty sections. Items
+// without a `priority` fall into the Normal (0) section.
+export function groupByPriority(sorted) {
   const buckets = new Map([
     [1, []],
     [0, []],
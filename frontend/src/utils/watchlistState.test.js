@@ -4,6 +4,11 @@ import {
   serializeWatchlistState,
   applyWatchlistView,
   groupWatchlistView,
+  groupByPriority,
+  watchlistQuery,
+  tagFacetQuery,
+  tagOptions,
+  WATCHLIST_PAGE_SIZE,
   priorityLabel,
   parseTagsInput,
   formatTags,
@@ -15,6 +20,7 @@ const defaultState = {
   sortBy: 'added',
   sortDir: 'desc',
   groupBy: 'none',
+  tag: '',
 }
 
 describe('parseWatchlistState', () => {
@@ -29,7 +35,7 @@ describe('parseWatchlistState', () => {
   it('coerces a fully populated query', () => {
     expect(
       parseWatchlistState({ type: 'shows', status: 'pending', sort: 'rating', dir: 'asc' }),
-    ).toEqual({ mediaType: 'shows', status: 'pending', sortBy: 'rating', sortDir: 'asc', groupBy: 'none' })
+    ).toEqual({ mediaType: 'shows', status: 'pending', sortBy: 'rating', sortDir: 'asc', groupBy: 'none', tag: '' })
   })
 
   it('falls back to defaults for garbage values', () => {
@@ -343,3 +349,62 @@ describe('groupWatchlistView', () => {
     expect(sections[0].items.map((i) => i.id)).toEqual([4])
   })
 })
+
+describe('groupByPriority', () => {
+  it('keeps the given (server) order within each section', () => {
+    const items = [
+      { id: 1, priority: 0 },
+      { id: 2, priority: 1 },
+      { id: 3, priority: 0 },
+      { id: 4 },
+    ]
+    const sections = groupByPriority(items)
+    expect(sections.map((s) => [s.key, s.items.map((i) => i.id)])).toEqual([
+      [1, [2]],
+      [0, [1, 3, 4]],
+    ])
+  })
+})
+
+describe('watchlistQuery', () => {
+  it('sends the first page with sort and no filters for the default state', () => {
+    expect(watchlistQuery(defaultState)).toEqual({ limit: WATCHLIST_PAGE_SIZE, sort: 'added', dir: 'desc' })
+  })
+
+  it('maps view filters to API params and passes the cursor', () => {
+    const state = { ...defaultState, mediaType: 'shows', status: 'pending', sortBy: 'title', sortDir: 'asc' }
+    expect(watchlistQuery(state, { cursor: 'abc' })).toEqual({
+      limit: WATCHLIST_PAGE_SIZE, sort: 'title', dir: 'asc', media_type: 'show', status: 'pending', cursor: 'abc',
+    })
+  })
+
+  it('honours a custom limit', () => {
+    expect(watchlistQuery({ ...defaultState, mediaType: 'movies' }, { limit: 1 })).toEqual({
+      limit: 1, sort: 'added', dir: 'desc', media_type: 'movie',
+    })
+  })
+})
+
+describe('tag filter state', () => {
+  it('parses, trims and serializes tag', () => {
+    expect(parseWatchlistState({ tag: ' docu ' }).tag).toBe('docu')
+    expect(serializeWatchlistState({ ...defaultState, tag: 'docu' })).toEqual({ tag: 'docu' })
+  })
+
+  it('sends the tag to the list endpoint', () => {
+    expect(watchlistQuery({ ...defaultState, tag: 'docu' })).toMatchObject({ tag: 'docu' })
+  })
+
+  it('narrows facets by media type and status only', () => {
+    const state = { ...defaultState, mediaType: 'movies', status: 'pending', tag: 'docu' }
+    expect(tagFacetQuery(state)).toEqual({ media_type: 'movie', status: 'pending' })
+    expect(tagFacetQuery(defaultState)).toEqual({})
+  })
+
+  it('keeps a selected tag that has no facet in the options', () => {
+    const facets = [{ tag: 'a', count: 3 }]
+    expect(tagOptions(facets, 'a')).toEqual([{ tag: 'a', count: 3 }])
+    expect(tagOptions(facets, 'gone')).toEqual([{ tag: 'gone', count: 0 }, { tag: 'a', count: 3 }])
+    expect(tagOptions(facets, '')).toEqual([{ tag: 'a', count: 3 }])
+  })
+})